@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contexto compacto para os prompts do Gemini, limitado por orçamento de tokens
+
+Eventos e notícias são pontuados (audiência, clássico, proximidade no tempo)
+e entram em ordem de relevância até o orçamento acabar, em uma linha curta
+por item. O tamanho do prompt fica estável mesmo com mais fontes de dados.
+"""
+
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from competitions import league_audience
+from models import DEFAULT_TIMEZONE, Article, Match, format_audience, parse_audience
+from text_utils import fold_accents
+
+DEFAULT_TOKEN_BUDGET = 1500
+
+# (chave em sports_data, cabeçalho no prompt)
+SPORTS_SECTIONS = (
+    ('games_today', 'JOGOS DE HOJE'),
+    ('games_tomorrow', 'JOGOS DE AMANHÃ'),
+    ('recent_results', 'RESULTADOS RECENTES'),
+    ('esports_today', 'E-SPORTS HOJE'),
+    ('weekly_schedule', 'PRÓXIMOS DIAS'),
+)
+
+CLASSICS = frozenset(frozenset(pair) for pair in (
+    ('flamengo', 'fluminense'), ('flamengo', 'vasco'), ('flamengo', 'botafogo'),
+    ('fluminense', 'vasco'), ('fluminense', 'botafogo'), ('vasco', 'botafogo'),
+    ('corinthians', 'palmeiras'), ('corinthians', 'sao paulo'), ('corinthians', 'santos'),
+    ('palmeiras', 'sao paulo'), ('palmeiras', 'santos'), ('sao paulo', 'santos'),
+    ('gremio', 'internacional'), ('atletico-mg', 'cruzeiro'), ('bahia', 'vitoria'),
+    ('fortaleza', 'ceara'), ('athletico-pr', 'coritiba'),
+    ('loud', 'pain gaming'), ('loud', 'furia'),
+))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa rápida (~4 caracteres por token), suficiente para orçamento"""
+    return (len(text) + 3) // 4
+
+
+def is_classic(match: Match) -> bool:
+    return frozenset((fold_accents(match.home_team or ''), fold_accents(match.away_team or ''))) in CLASSICS
+
+
+class ContextItem(NamedTuple):
+    score: float
+    section: str
+    order: Any
+    line: str
+    tokens: int
+
+
+class PackedContext(NamedTuple):
+    sports_summary: str
+    news_summary: str
+    tokens: int
+    included: int
+    dropped: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'sports_summary': self.sports_summary, 'news_summary': self.news_summary,
+                'estimated_tokens': self.tokens, 'items_included': self.included,
+                'items_dropped': self.dropped}
+
+
+class ContextBuilder:
+    """Seleciona e codifica eventos/notícias dentro de `token_budget`"""
+
+    def __init__(self, token_budget: int = None, now: datetime = None):
+        self.token_budget = token_budget or int(os.environ.get('AI_CONTEXT_TOKENS', DEFAULT_TOKEN_BUDGET))
+        self.now = now
+
+    def _recency(self, when: Optional[datetime], now: datetime) -> float:
+        if when is None:
+            return 0.0
+        hours = abs((when - now).total_seconds()) / 3600
+        return 1.0 / (1.0 + hours / 12)
+
+    def _match_item(self, section: str, match: Match, now: datetime) -> ContextItem:
+        audience = (parse_audience(match.audience) or parse_audience(match.viewers)
+                    or league_audience(match.league))
+        classic = is_classic(match)
+        score = math.log10(max(audience, 10)) + (1.5 if classic else 0.0) + 2 * self._recency(match.kickoff, now)
+
+        # Linha compacta: horário, confronto, placar, competição, audiência, marcadores
+        fields = [match.time if section != 'weekly_schedule' else match.kickoff.strftime('%d/%m %H:%M'),
+                  f"{match.home_team} {match.score} {match.away_team}" if match.score else match.label,
+                  match.league, format_audience(audience)]
+        if classic:
+            fields.append('clássico')
+        line = '- ' + ' | '.join(fields) + '\n'
+        return ContextItem(score, section, match.kickoff, line, estimate_tokens(line))
+
+    def _news_item(self, article: Article, index: int, now: datetime) -> ContextItem:
+        score = 4.0 + 2 * self._recency(article.published, now) + 0.5 * len(article.related_sources)
+        sources = article.source
+        if article.related_sources:
+            sources += f" +{len(article.related_sources)}"
+        line = f"- {article.title} ({sources})\n"
+        return ContextItem(score, 'news', index, line, estimate_tokens(line))
+
+    def build(self, sports_data: Dict[str, Any], news_data: List[Article] = ()) -> PackedContext:
+        now = self.now or datetime.now(DEFAULT_TIMEZONE)
+        candidates: List[ContextItem] = []
+        for key, _ in SPORTS_SECTIONS:
+            candidates.extend(self._match_item(key, match, now) for match in sports_data.get(key) or ())
+        candidates.extend(self._news_item(article, i, now) for i, article in enumerate(news_data or ()))
+
+        headers = {key: f"{title}:\n" for key, title in SPORTS_SECTIONS}
+        headers['news'] = "PRINCIPAIS NOTÍCIAS:\n"
+
+        # Primeiro o melhor item de cada seção (o modelo vê todas as frentes), depois
+        # guloso por relevância; o cabeçalho entra no custo do primeiro item da seção
+        ranked = sorted(candidates, key=lambda item: -item.score)
+        best_per_section = {}
+        for item in ranked:
+            best_per_section.setdefault(item.section, item)
+        leaders = set(id(item) for item in best_per_section.values())
+        ordered = list(best_per_section.values()) + [item for item in ranked if id(item) not in leaders]
+
+        remaining = self.token_budget
+        chosen: Dict[str, List[ContextItem]] = {}
+        for item in ordered:
+            cost = item.tokens + (0 if item.section in chosen else estimate_tokens(headers[item.section]) + 1)
+            if cost > remaining:
+                continue
+            chosen.setdefault(item.section, []).append(item)
+            remaining -= cost
+
+        def render(sections) -> str:
+            blocks = []
+            for key in sections:
+                items = chosen.get(key)
+                if items:
+                    items.sort(key=lambda item: item.order)
+                    blocks.append(headers[key] + ''.join(item.line for item in items))
+            return '\n'.join(blocks)
+
+        sports_summary = render([key for key, _ in SPORTS_SECTIONS])
+        news_summary = render(['news'])
+        included = sum(len(items) for items in chosen.values())
+        return PackedContext(sports_summary, news_summary,
+                             estimate_tokens(sports_summary) + estimate_tokens(news_summary),
+                             included, len(candidates) - included)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Saída estruturada (JSON) das oportunidades de mídia geradas pelo Gemini
+
+O modelo responde um array JSON no formato de OPPORTUNITIES_SCHEMA. O
+OpportunityParser lê a resposta em uma única passada, pedaço a pedaço do
+stream: cada objeto do array vira um `Opportunity` assim que fecha. Se a
+resposta for cortada (prazo, limite de tokens), o objeto incompleto é
+reparado no `close()` em vez de descartado.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from models import Opportunity
+
+MAX_OPPORTUNITIES = 10
+
+OPPORTUNITIES_SCHEMA = {
+    'type': 'array',
+    'maxItems': MAX_OPPORTUNITIES,
+    'items': {
+        'type': 'object',
+        'properties': {
+            'rank': {'type': 'integer'},
+            'title': {'type': 'string'},
+            'justification': {'type': 'string'},
+            'recommendation': {'type': 'string'},
+        },
+        'required': ['title', 'justification', 'recommendation'],
+    },
+}
+
+_TEXT_FIELDS = ('title', 'justification', 'recommendation')
+
+
+def validate_opportunity(data: Any, rank: int) -> Optional[Opportunity]:
+    """Objeto do array -> Opportunity; None se não tiver ao menos um título"""
+    if not isinstance(data, dict):
+        return None
+    values = {}
+    for field in _TEXT_FIELDS:
+        value = data.get(field)
+        values[field] = ' '.join(str(value).split()) if value is not None else ''
+    if not values['title']:
+        return None
+    # A posição no array manda; o `rank` do modelo nem sempre é sequencial
+    return Opportunity(rank, values['title'], values['justification'], values['recommendation'])
+
+
+class OpportunityParser:
+    """Parser incremental de uma única passada para o array de oportunidades
+
+    Acompanha só o necessário para achar os limites de cada objeto (pilha de
+    containers, strings e escapes); o texto de cada objeto completo é
+    decodificado com `json.loads`. Texto fora do JSON (```json, comentários
+    do modelo) é ignorado.
+    """
+
+    def __init__(self, limit: int = MAX_OPPORTUNITIES):
+        self.limit = limit
+        self.opportunities: List[Opportunity] = []
+        self.received = 0
+        self.invalid = 0
+        self.repaired = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item: List[str] = []
+        # Vírgulas no nível do objeto atual: pontos seguros para truncar no reparo
+        self._item_commas: List[int] = []
+        self._done = False
+        # Com prazo, o close() pode vir de outra thread enquanto o stream ainda chega
+        self._lock = threading.Lock()
+
+    def _item_depth(self) -> bool:
+        # Objetos direto no array principal (ou em {"opportunities": [...]})
+        return self._stack in (['['], ['{', '['])
+
+    def feed(self, chunk: str):
+        with self._lock:
+            self.received += len(chunk)
+            if not self._done:
+                self._scan(chunk)
+
+    def _scan(self, chunk: str):
+        stack = self._stack
+        for char in chunk:
+            in_item = bool(self._item) or (char == '{' and self._item_depth())
+            if in_item:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if stack:
+                    self._in_string = True
+            elif char in '[{':
+                stack.append(char)
+            elif char in ']}':
+                if not stack:
+                    continue
+                stack.pop()
+                if char == '}' and self._item and self._item_depth():
+                    self._finish_item(''.join(self._item))
+                elif not stack:
+                    # Fim do JSON principal: o resto é texto livre
+                    self._done = True
+                    return
+            elif char == ',' and self._item and len(stack) == (2 if stack[0] == '[' else 3):
+                self._item_commas.append(len(self._item) - 1)
+
+    def _finish_item(self, text: str, repaired: bool = False):
+        self._item = []
+        self._item_commas = []
+        if len(self.opportunities) >= self.limit:
+            return
+        try:
+            data = json.loads(text)
+        except ValueError:
+            self.invalid += 1
+            return
+        opportunity = validate_opportunity(data, len(self.opportunities) + 1)
+        if opportunity is None:
+            self.invalid += 1
+            return
+        self.opportunities.append(opportunity)
+        self.repaired = self.repaired or repaired
+
+    def _repair_item(self) -> Optional[str]:
+        """Fecha o objeto cortado: primeiro inteiro, depois até o último campo completo"""
+        text = ''.join(self._item)
+        candidates = [text + ('"' if self._in_string else '')]
+        candidates.extend(text[:comma] for comma in reversed(self._item_commas))
+        for candidate in candidates:
+            candidate = candidate.rstrip().rstrip(',')
+            # Estruturas aninhadas abertas dentro do item também precisam fechar
+            depth_stack = []
+            in_string = escape = False
+            for char in candidate:
+                if in_string:
+                    if escape:
+                        escape = False
+                    elif char == '\\':
+                        escape = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char in '[{':
+                    depth_stack.append(char)
+                elif char in ']}' and depth_stack:
+                    depth_stack.pop()
+            if in_string:
+                continue
+            closers = ''.join('}' if opener == '{' else ']' for opener in reversed(depth_stack))
+            try:
+                json.loads(candidate + closers)
+            except ValueError:
+                continue
+            return candidate + closers
+        return None
+
+    def close(self) -> List[Opportunity]:
+        with self._lock:
+            if self._item:
+                repaired = self._repair_item()
+                if repaired is not None:
+                    self._finish_item(repaired, repaired=True)
+                else:
+                    self._item = []
+                    self.invalid += 1
+            self._done = True
+            return list(self.opportunities)
+
+
+def parse_opportunities(text: str) -> List[Opportunity]:
+    parser = OpportunityParser()
+    parser.feed(text)
+    return parser.close()
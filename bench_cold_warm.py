@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de latência da Cloud Function: instância fria x instância quente
+
+Mede o preparo de uma requisição (config, token, cliente Gmail, coletores)
+sem enviar nada. "Fria" roda num processo novo, incluindo os imports;
+"quente" repete o preparo no mesmo processo, como nas invocações seguintes.
+
+Uso: python3 bench_cold_warm.py [nº de invocações quentes]
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executado dentro do diretório de trabalho com token.pickle e env.yaml
+INVOCATION = """
+import time
+started = time.perf_counter()
+import main
+reporter = main.get_reporter()
+reporter.config
+reporter._authenticate()
+print(time.perf_counter() - started)
+"""
+
+
+def prepare_workdir() -> str:
+    """Token válido por 1h e env.yaml mínimos (o cliente Gmail usa a descoberta embutida)"""
+    from google.oauth2.credentials import Credentials
+
+    workdir = tempfile.mkdtemp(prefix='cold_warm_')
+    creds = Credentials(token='token-de-teste', expiry=datetime.utcnow() + timedelta(hours=1))
+    with open(os.path.join(workdir, 'token.pickle'), 'wb') as token:
+        pickle.dump(creds, token)
+    with open(os.path.join(workdir, 'env.yaml'), 'w', encoding='utf-8') as env:
+        env.write("RECIPIENTS: teste@example.com\n")
+    return workdir
+
+
+def cold_invocation(workdir: str) -> float:
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    output = subprocess.run([sys.executable, '-c', INVOCATION], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def warm_invocations(workdir: str, count: int):
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    import main
+
+    first = None
+    timings = []
+    for i in range(count + 1):
+        started = time.perf_counter()
+        reporter = main.get_reporter()
+        reporter.config
+        reporter._authenticate()
+        elapsed = time.perf_counter() - started
+        if i == 0:
+            first = elapsed
+        else:
+            timings.append(elapsed)
+    return first, timings
+
+
+def run_benchmark(warm_count: int = 50):
+    workdir = prepare_workdir()
+    cold = [cold_invocation(workdir) for _ in range(3)]
+    first, warm = warm_invocations(workdir, warm_count)
+    warm.sort()
+
+    print("📊 BENCHMARK FRIA x QUENTE (preparo da requisição, sem envio)")
+    print("=" * 60)
+    print(f"Fria (processo novo, com imports): {min(cold) * 1000:.1f} ms (melhor de {len(cold)})")
+    print(f"Primeira invocação no processo:    {first * 1000:.1f} ms")
+    print(f"Quente: p50 {warm[len(warm) // 2] * 1000:.3f} ms | máx {warm[-1] * 1000:.3f} ms "
+          f"({len(warm)} invocações)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da ingestão de feeds: throughput (itens/s) e pico de memória
+
+Uso: python3 bench_feed_ingest.py [nº de itens]
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+import pytz
+
+from feed_ingest import iter_feed_items
+
+
+def write_fixture_feed(path: str, items: int, atom: bool = False, start: datetime = None):
+    """Gera um feed local com `items` notícias, da mais nova para a mais antiga"""
+    start = start or datetime(2025, 6, 9, 12, 0, tzinfo=pytz.utc)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        if atom:
+            file.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                       '<feed xmlns="http://www.w3.org/2005/Atom"><title>Fixture</title>\n')
+        else:
+            file.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                       '<rss version="2.0"><channel><title>Fixture</title>\n')
+
+        for i in range(items):
+            published = start - timedelta(minutes=i)
+            title = f'Flamengo x Palmeiras: notícia de número {i} &amp; análise'
+            description = f'<p>Resumo da notícia <b>{i}</b> sobre o Brasileirão.</p>'
+            if atom:
+                file.write(f'<entry><title>{title}</title>'
+                           f'<link rel="alternate" href="https://example.com/n/{i}"/>'
+                           f'<id>urn:fixture:{i}</id>'
+                           f'<updated>{published.isoformat()}</updated>'
+                           f'<summary type="html">{description.replace("<", "&lt;")}</summary></entry>\n')
+            else:
+                file.write(f'<item><title>{title}</title>'
+                           f'<link>https://example.com/n/{i}</link>'
+                           f'<pubDate>{format_datetime(published)}</pubDate>'
+                           f'<description><![CDATA[{description}]]></description></item>\n')
+
+        file.write('</feed>\n' if atom else '</channel></rss>\n')
+
+
+def run_benchmark(items: int = 50000):
+    workdir = tempfile.mkdtemp()
+    results = {}
+
+    for kind in ('rss', 'atom'):
+        path = os.path.join(workdir, f'fixture.{kind}.xml')
+        write_fixture_feed(path, items, atom=(kind == 'atom'))
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        # Throughput medido sem tracemalloc (que distorce o tempo)
+        started = time.perf_counter()
+        with open(path, 'rb') as stream:
+            count = sum(1 for _ in iter_feed_items(stream, source='Fixture', category='Teste'))
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        with open(path, 'rb') as stream:
+            for _ in iter_feed_items(stream, source='Fixture', category='Teste'):
+                pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[kind] = {
+            'items': count,
+            'feed_mb': size_mb,
+            'seconds': elapsed,
+            'items_per_sec': count / elapsed if elapsed else float('inf'),
+            'peak_python_mb': peak / 1024 / 1024
+        }
+
+    # ru_maxrss é em KB no Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"📊 BENCHMARK DE INGESTÃO DE FEEDS ({items} itens)")
+    print("=" * 60)
+    for kind, result in results.items():
+        print(f"{kind.upper():5} {result['items']:>7} itens | {result['feed_mb']:.1f} MB | "
+              f"{result['items_per_sec']:,.0f} itens/s | pico Python {result['peak_python_mb']:.2f} MB")
+    print(f"Pico de RSS do processo: {peak_rss_mb:.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
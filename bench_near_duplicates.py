@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do índice de quase duplicatas com histórico grande de títulos
+
+Uso: python3 bench_near_duplicates.py [nº de títulos no histórico]
+"""
+
+import random
+import sys
+import time
+
+from near_duplicates import NearDuplicateIndex, normalize_title
+
+TEAMS = ['Flamengo', 'Palmeiras', 'Corinthians', 'São Paulo', 'Santos', 'Vasco', 'Botafogo',
+         'Fluminense', 'Grêmio', 'Internacional', 'Atlético-MG', 'Cruzeiro', 'Bahia', 'Fortaleza',
+         'Athletico-PR', 'Bragantino', 'LOUD', 'paiN Gaming', 'FURIA', 'Imperial']
+VERBS = ['vence', 'empata com', 'perde para', 'anuncia', 'negocia com', 'contrata', 'renova com',
+         'demite', 'enfrenta', 'goleia']
+TOPICS = ['no Brasileirão', 'pela Libertadores', 'na Copa do Brasil', 'no clássico', 'em casa',
+          'fora de casa', 'no CBLOL', 'e sobe na tabela', 'e entra no G4', 'com gol nos acréscimos',
+          'após polêmica', 'para a próxima temporada']
+PLAYERS = ['Gabigol', 'Endrick', 'Arrascaeta', 'Hulk', 'Calleri', 'Cano', 'Yuri Alberto',
+           'Pedro', 'Veiga', 'Soteldo']
+
+
+# Vocabulário sintético grande para os termos específicos de cada notícia
+_vocab_rng = random.Random(7)
+WORDS = [''.join(_vocab_rng.choice('abcdefghijlmnoprstuvz') for _ in range(7)) for _ in range(20000)]
+
+
+def synthetic_title(rng: random.Random, i: int) -> str:
+    details = ' '.join(rng.choice(WORDS) for _ in range(4))
+    return (f"{rng.choice(TEAMS)} {rng.choice(VERBS)} {rng.choice(TEAMS)} {rng.choice(TOPICS)}; "
+            f"{rng.choice(PLAYERS)} {details}")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_benchmark(history: int = 100000, queries: int = 2000):
+    rng = random.Random(42)
+    titles = [synthetic_title(rng, i) for i in range(history)]
+    index = NearDuplicateIndex()
+
+    started = time.perf_counter()
+    for i, title in enumerate(titles):
+        index.add(i, title)
+    build_seconds = time.perf_counter() - started
+
+    # Metade das consultas são variações de títulos já indexados, metade são novas
+    probes = []
+    for q in range(queries):
+        if q % 2 == 0:
+            original = titles[rng.randrange(history)]
+            # Mesma história com outra redação: caixa, pontuação e uma palavra a mais
+            probes.append(original.upper().replace(';', ' -') + ' oficial')
+        else:
+            probes.append(synthetic_title(rng, history + q))
+
+    latencies = []
+    found = 0
+    for probe in probes:
+        tokens = normalize_title(probe)
+        started = time.perf_counter()
+        if index.query(tokens=tokens):
+            found += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    print(f"📊 BENCHMARK DE QUASE DUPLICATAS ({history:,} títulos no índice)")
+    print("=" * 60)
+    print(f"Construção do índice: {build_seconds:.2f}s ({history / build_seconds:,.0f} títulos/s)")
+    print(f"Consultas: {queries} | média {sum(latencies) / len(latencies):.3f} ms | "
+          f"p50 {percentile(latencies, 50):.3f} ms | p99 {percentile(latencies, 99):.3f} ms")
+    print(f"Consultas com duplicata encontrada: {found} (esperado ~{queries // 2})")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark ponta a ponta do relatório contra serviços locais (sem rede)
+
+Roda main.daily_sports_report várias vezes contra mock_services (feeds RSS,
+Gmail, Gemini falso) e mede cada etapa: latência (p50/p90/p99), memória
+alocada por etapa (tracemalloc, numa rodada separada para não distorcer os
+tempos) e pico de memória do processo. O coletor do relatório SMTP
+(TheSportsDB e Nager.Date) é medido como etapa à parte.
+
+Uso:
+    python3 bench_pipeline.py --iterations 20 --latency-ms 20 --failure-rate 0.05
+    python3 bench_pipeline.py --save baseline.json
+    python3 bench_pipeline.py --compare baseline.json --tolerance 0.25   # sai com 1 se piorar
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Etapas sequenciais: a memória alocada de cada uma é medida isoladamente
+ALLOC_STAGES = ('sports', 'news', 'ai', 'render', 'daily_sources')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class StageRecorder:
+    """Tempos (e, com tracemalloc ativo, pico de alocação) de cada etapa"""
+
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = {}
+        self.allocations: Dict[str, List[int]] = {}
+        self.trace_alloc = False
+
+    def wrap(self, stage: str, func):
+        def timed(*args, **kwargs):
+            measure_alloc = self.trace_alloc and stage in ALLOC_STAGES
+            if measure_alloc:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                if measure_alloc:
+                    self.allocations.setdefault(stage, []).append(tracemalloc.get_traced_memory()[1] - before)
+                elif not self.trace_alloc:
+                    self.timings.setdefault(stage, []).append(elapsed)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for stage, values in self.timings.items():
+            result[stage] = {
+                'count': len(values),
+                'p50_ms': percentile(values, 0.50) * 1000,
+                'p90_ms': percentile(values, 0.90) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000,
+                'max_ms': max(values) * 1000,
+            }
+            allocations = self.allocations.get(stage)
+            if allocations:
+                result[stage]['alloc_kib'] = max(allocations) / 1024
+        return result
+
+
+def _prepare_environment(args, services) -> str:
+    workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    os.environ.update(services.env())
+    os.environ.update({
+        'RECIPIENTS': ','.join(f"destinatario{i}@example.com" for i in range(args.recipients)),
+        'HTTP_CACHE_DIR': os.path.join(workdir, 'http'),
+        'SNAPSHOT_DIR': os.path.join(workdir, 'snapshots'),
+        'SOURCE_HEALTH_PATH': os.path.join(workdir, 'source_health.json'),
+        'LLM_CACHE_BACKEND': 'memory',
+        'HTTP_RETRIES': str(args.retries),
+        'HTTP_BACKOFF_FACTOR': '0.05',
+        'AI_DEADLINE': str(args.ai_deadline),
+        'AI_OPPORTUNITIES': '1',
+    })
+    return workdir
+
+
+def _instrument(reporter, recorder: StageRecorder):
+    import delivery
+
+    reporter.sports_collector.get_all_sports_data = recorder.wrap(
+        'sports', reporter.sports_collector.get_all_sports_data)
+    reporter.news_scraper.get_all_news = recorder.wrap('news', reporter.news_scraper.get_all_news)
+    reporter.ai.analyze_all = recorder.wrap('ai', reporter.ai.analyze_all)
+    reporter._send_html = recorder.wrap('send', reporter._send_html)
+    delivery.render_sports_report = recorder.wrap('render', delivery.render_sports_report)
+
+
+def run_benchmark(args) -> Dict[str, Dict[str, float]]:
+    from mock_services import FakeGeminiModel, MockServices
+
+    services = MockServices(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                            failure_rate=args.failure_rate, events_per_day=args.events,
+                            news_per_feed=args.news).start()
+    try:
+        workdir = _prepare_environment(args, services)
+        if args.gmail_failure_rate is not None:
+            services.configure('gmail', failure_rate=args.gmail_failure_rate)
+
+        import main
+        from concurrent_collector import HostPoliteness
+        from delivery import DeliveryLedger
+        from gmail_api_reporter import GmailAPISportsReportREAL
+        from llm_cache import LLMCache
+        from real_news_scraper import FEEDS
+        from sports_reporter import DailySportsReport
+
+        recorder = StageRecorder()
+        # O reporter da instância usa o Gmail local em vez do OAuth
+        main._reporter = GmailAPISportsReportREAL(gmail_client=services.gmail_client())
+        reporter = main.get_reporter()
+        reporter.ai.model = FakeGeminiModel(latency=args.gemini_latency_ms / 1000,
+                                            chunk_delay=args.gemini_chunk_ms / 1000,
+                                            failure_rate=args.gemini_failure_rate)
+        if not args.llm_cache:
+            # TTL zero: toda rodada chama o modelo (sem isso a etapa mede só o cache)
+            reporter.ai.cache = LLMCache(backend=None, ttl=0)
+        # Em produção cada feed é um host diferente; aqui todos são 127.0.0.1, e o
+        # intervalo de cortesia por host serializaria a coleta
+        reporter.news_scraper.collector.politeness = HostPoliteness(max_per_host=len(FEEDS),
+                                                                    min_interval=0.0)
+        _instrument(reporter, recorder)
+        daily = DailySportsReport({})
+        daily_sources = recorder.wrap('daily_sources', lambda: (daily.get_football_games(daily.today),
+                                                                daily.get_holidays_events(daily.today)))
+        handler = recorder.wrap('total', main.daily_sports_report)
+
+        statuses = Counter()
+
+        def iteration(index: int):
+            # Registro de entregas novo: cada rodada envia para todos de novo
+            reporter.ledger = DeliveryLedger(os.path.join(workdir, f"ledger-{index}.json"))
+            _, status = handler(None)
+            if not recorder.trace_alloc:
+                statuses[status] += 1
+            daily_sources()
+
+        # Aquecimento (imports, cliente Gmail, cache HTTP) fora das medições
+        quiet = open(os.devnull, 'w')
+        stdout, sys.stdout = sys.stdout, quiet
+        try:
+            iteration(-1)
+            recorder.timings.clear()
+            statuses.clear()
+            for index in range(args.iterations):
+                iteration(index)
+
+            if not args.no_alloc:
+                recorder.trace_alloc = True
+                tracemalloc.start()
+                iteration(args.iterations)
+                tracemalloc.stop()
+        finally:
+            sys.stdout = stdout
+            quiet.close()
+
+        summary = recorder.summary()
+        _print_report(summary, statuses, services, args)
+        return summary
+    finally:
+        services.stop()
+
+
+def _print_report(summary, statuses, services, args):
+    print("📊 BENCHMARK DO PIPELINE (serviços locais)")
+    print("=" * 78)
+    print(f"{args.iterations} rodadas • {args.recipients} destinatários • latência {args.latency_ms} ms "
+          f"(±{args.jitter_ms}) • falhas {args.failure_rate:.0%}")
+    print(f"{'etapa':<14}{'n':>5}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'máx ms':>11}{'alocado KiB':>14}")
+    for stage, stats in summary.items():
+        alloc = f"{stats['alloc_kib']:.0f}" if 'alloc_kib' in stats else '-'
+        print(f"{stage:<14}{stats['count']:>5}{stats['p50_ms']:>11.1f}{stats['p90_ms']:>11.1f}"
+              f"{stats['p99_ms']:>11.1f}{stats['max_ms']:>11.1f}{alloc:>14}")
+    print("-" * 78)
+    # ru_maxrss vem em KiB no Linux
+    print(f"Pico de memória do processo: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+    print(f"Status HTTP da função: {dict(statuses)}")
+    print(f"Requisições aos serviços: {services.requests} • falhas injetadas: {services.failures}")
+
+
+def compare(summary: Dict[str, Dict[str, float]], baseline_path: str, tolerance: float) -> List[str]:
+    """Etapas cujo p50 piorou mais que `tolerance` (com 1 ms de folga para ruído)"""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressions = []
+    for stage, stats in baseline.items():
+        current = summary.get(stage)
+        if current and current['p50_ms'] > stats['p50_ms'] * (1 + tolerance) + 1.0:
+            regressions.append(f"{stage}: p50 {stats['p50_ms']:.1f} ms -> {current['p50_ms']:.1f} ms")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--recipients', type=int, default=5)
+    parser.add_argument('--events', type=int, default=10, help='jogos por dia no TheSportsDB falso')
+    parser.add_argument('--news', type=int, default=10, help='notícias por feed')
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--gmail-failure-rate', type=float, default=None)
+    parser.add_argument('--gemini-latency-ms', type=float, default=200.0)
+    parser.add_argument('--gemini-chunk-ms', type=float, default=20.0)
+    parser.add_argument('--gemini-failure-rate', type=float, default=0.0)
+    parser.add_argument('--ai-deadline', type=float, default=60.0)
+    parser.add_argument('--retries', type=int, default=1)
+    parser.add_argument('--llm-cache', action='store_true', help='mantém o cache de respostas do Gemini')
+    parser.add_argument('--no-alloc', action='store_true', help='pula a rodada com tracemalloc')
+    parser.add_argument('--save', help='grava o resumo em JSON (linha de base)')
+    parser.add_argument('--compare', help='linha de base para detectar regressões')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    summary = run_benchmark(args)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=2)
+        print(f"💾 Linha de base gravada em {args.save}")
+    if args.compare:
+        regressions = compare(summary, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regressão: {regression}")
+        if regressions:
+            return 1
+        print("✅ Sem regressões em relação à linha de base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da renderização HTML dos relatórios com muitos eventos
+
+Uso: python3 bench_report_render.py [nº de eventos por relatório] [nº de destinatários]
+"""
+
+import sys
+import time
+
+from report_fixtures import synthetic_data
+from report_templates import render_sports_report
+
+
+def run_benchmark(events: int = 10000, recipients: int = 20, rounds: int = 5):
+    data = synthetic_data(events)
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        html = render_sports_report(data)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+
+    people = [{'name': f"Destinatário {i}"} for i in range(recipients)]
+    started = time.perf_counter()
+    variants = render_sports_report(data, recipients=people)
+    variants_seconds = time.perf_counter() - started
+
+    print(f"📊 BENCHMARK DE RENDERIZAÇÃO ({events:,} eventos por relatório)")
+    print("=" * 60)
+    print(f"Relatório completo: {best * 1000:.1f} ms (melhor de {rounds}) | "
+          f"{len(html) / 1024 / 1024:.1f} MB | {events / best:,.0f} eventos/s")
+    print(f"{recipients} versões por destinatário: {variants_seconds * 1000:.1f} ms "
+          f"({len(variants)} geradas; seções montadas uma única vez)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cadastro das competições: id canônico, apelidos, audiência típica e prioridade
+
+Cada provedor escreve a liga de um jeito ('Brazilian Serie A', 'Campeonato
+Brasileiro Série A', 'Brasileirão Série A 2024'). Os apelidos, sem acentos e
+pontuação, viram uma única regex; classificar um nome é uma busca nela (e o
+resultado fica em cache, já que os mesmos nomes se repetem o dia inteiro).
+O filtro de competições acompanhadas, a audiência estimada dos jogos e o
+índice por competição da janela de jogos usam todos esta mesma tabela.
+"""
+
+import re
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from text_utils import fold_accents
+
+# Audiência usada quando a competição não está no cadastro (a mesma estimativa de antes do cadastro)
+DEFAULT_AUDIENCE = 5_000_000
+
+
+class Competition(NamedTuple):
+    id: str
+    name: str
+    aliases: Tuple[str, ...]
+    audience: int
+    # 1 = mais importante; desempata quais jogos entram quando há limite
+    priority: int
+    # Entra no relatório de futebol (competições brasileiras e sul-americanas)
+    tracked: bool = False
+    # Ligas no TheSportsDB (eventsseason.php) e se a temporada vira o ano ('2024-2025')
+    thesportsdb_ids: Tuple[str, ...] = ()
+    split_season: bool = False
+
+
+COMPETITIONS = (
+    Competition('libertadores', 'Copa Libertadores',
+                ('libertadores', 'copa libertadores', 'conmebol libertadores'), 12_000_000, 1, True, ('4501',)),
+    Competition('brasileirao-a', 'Brasileirão Série A',
+                ('brasileirao', 'brasileirao serie a', 'brasileiro serie a', 'campeonato brasileiro',
+                 'campeonato brasileiro serie a', 'brazilian serie a', 'brazil serie a', 'serie a brazil'),
+                8_000_000, 1, True, ('4351',)),
+    Competition('copa-do-brasil', 'Copa do Brasil', ('copa do brasil', 'brazilian cup', 'brazil cup'),
+                6_000_000, 2, True, ('4725',)),
+    Competition('brasileirao-b', 'Brasileirão Série B',
+                ('brasileirao serie b', 'brasileiro serie b', 'campeonato brasileiro serie b',
+                 'brazilian serie b', 'brazil serie b', 'serie b brazil'), 2_000_000, 3, True, ('4404',)),
+    Competition('sul-americana', 'Copa Sul-Americana',
+                ('sul americana', 'sudamericana', 'copa sul americana', 'copa sudamericana'),
+                4_000_000, 2, True, ('4724',)),
+    Competition('copa-america', 'Copa América', ('copa america',), 10_000_000, 1, True),
+    Competition('estaduais', 'Campeonatos Estaduais',
+                ('paulistao', 'campeonato paulista', 'paulista', 'carioca', 'campeonato carioca',
+                 'gauchao', 'campeonato gaucho', 'mineiro', 'campeonato mineiro'), 3_000_000, 3, True),
+    # Ligas brasileiras sem cadastro próprio ('Brazil Serie C', 'Brasileiro Feminino', regionais);
+    # o conjunto acompanhado está fixado em test_competitions.py
+    Competition('brasil', 'Futebol brasileiro',
+                ('brazil', 'brazilian', 'brasil', 'brasileiro', 'brasileira', 'copa do nordeste', 'copa verde'),
+                3_000_000, 4, True),
+    Competition('champions-league', 'UEFA Champions League',
+                ('champions league', 'uefa champions league', 'liga dos campeoes'), 15_000_000, 2,
+                thesportsdb_ids=('4480',), split_season=True),
+    Competition('premier-league', 'Premier League', ('premier league', 'english premier league'),
+                10_000_000, 3, thesportsdb_ids=('4328',), split_season=True),
+    Competition('la-liga', 'La Liga', ('la liga', 'laliga', 'spanish la liga'), 8_000_000, 3,
+                thesportsdb_ids=('4335',), split_season=True),
+    Competition('cblol', 'CBLOL', ('cblol', 'cblol finals'), 300_000, 3),
+    Competition('vct', 'VCT', ('vct', 'valorant champions tour', 'vct americas', 'vct brazil'), 200_000, 4),
+)
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+_CACHE_LIMIT = 4096
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """'Brasileirão Série-A 2024' -> 'brasileirao serie a 2024'"""
+    return ' '.join(_NON_WORD_RE.sub(' ', fold_accents(name or '')).split())
+
+
+class CompetitionRegistry:
+    """Classifica nomes de liga numa competição do cadastro (uma regex para todos os apelidos)"""
+
+    def __init__(self, competitions: Iterable[Competition] = COMPETITIONS):
+        self.competitions = tuple(competitions)
+        self.by_id = {competition.id: competition for competition in self.competitions}
+        self.by_thesportsdb_id = {league_id: competition for competition in self.competitions
+                                  for league_id in competition.thesportsdb_ids}
+        self._by_alias: Dict[str, Competition] = {}
+        for competition in self.competitions:
+            for alias in competition.aliases:
+                self._by_alias.setdefault(normalize_name(alias), competition)
+        # Mais longos primeiro: na mesma posição, 'brasileirao serie b' ganha de 'brasileirao'
+        aliases = sorted(self._by_alias, key=len, reverse=True)
+        self._pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, aliases)) + r')\b')
+        self._cache: Dict[str, Optional[Competition]] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, league: Optional[str]) -> Optional[Competition]:
+        """Competição do nome da liga, ou None se nenhum apelido aparece nele"""
+        try:
+            return self._cache[league]
+        except KeyError:
+            pass
+        competition = self._classify(normalize_name(league))
+        with self._lock:
+            if len(self._cache) >= _CACHE_LIMIT:
+                self._cache.clear()
+            self._cache[league] = competition
+        return competition
+
+    def _classify(self, name: str) -> Optional[Competition]:
+        # O apelido mais longo encontrado é o mais específico ('Brazil - Copa do Brasil')
+        best = max(self._pattern.findall(name), key=len, default=None)
+        return self._by_alias[best] if best else None
+
+    def is_tracked(self, league: Optional[str]) -> bool:
+        competition = self.classify(league)
+        return competition is not None and competition.tracked
+
+    def audience(self, league: Optional[str]) -> int:
+        competition = self.classify(league)
+        return competition.audience if competition else DEFAULT_AUDIENCE
+
+    def priority(self, league: Optional[str]) -> int:
+        competition = self.classify(league)
+        return competition.priority if competition else len(self.competitions)
+
+
+_registry = CompetitionRegistry()
+
+
+def classify_league(league: Optional[str]) -> Optional[Competition]:
+    return _registry.classify(league)
+
+
+def is_tracked_league(league: Optional[str]) -> bool:
+    """Competição acompanhada no relatório de futebol"""
+    return _registry.is_tracked(league)
+
+
+def league_audience(league: Optional[str]) -> int:
+    """Audiência típica da competição (DEFAULT_AUDIENCE se desconhecida)"""
+    return _registry.audience(league)
+
+
+def league_priority(league: Optional[str]) -> int:
+    return _registry.priority(league)
+
+
+def tracked_thesportsdb_leagues() -> List[str]:
+    """Ids do TheSportsDB das competições acompanhadas (padrão de THESPORTSDB_LEAGUES)
+
+    Estaduais, Copa América e demais ligas brasileiras não têm id fixo aqui:
+    entram acrescentando o id em THESPORTSDB_LEAGUES ou via SPORTS_FIXTURES_FILE.
+    """
+    return [league_id for competition in _registry.competitions if competition.tracked
+            for league_id in competition.thesportsdb_ids]
+
+
+def thesportsdb_season(league_id: str, day: date) -> str:
+    """Temporada de `day` no formato do TheSportsDB: '2025' ou, se vira o ano, '2024-2025'
+
+    Ligas fora do cadastro seguem o ano civil, como as brasileiras.
+    """
+    competition = _registry.by_thesportsdb_id.get(league_id)
+    if competition is None or not competition.split_season:
+        return str(day.year)
+    # Temporadas europeias começam em julho/agosto
+    first = day.year if day.month >= 7 else day.year - 1
+    return f"{first}-{first + 1}"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de coleta concorrente para as fontes do relatório esportivo
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Intervalo máximo entre verificações enquanto há fontes na fila (prazo ainda não começou)
+QUEUE_POLL = 0.05
+
+
+class HostPoliteness:
+    """Limita acessos simultâneos e o intervalo mínimo entre requisições por host"""
+
+    def __init__(self, max_per_host: int = 2, min_interval: float = 0.25):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, host: Optional[str]):
+        """Reserva uma vaga no host, respeitando o intervalo mínimo"""
+        if not host:
+            yield
+            return
+
+        semaphore = self._semaphore(host)
+        semaphore.acquire()
+        try:
+            # Reservar o próximo horário livre sob o lock, dormir fora dele
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = start_at + self.min_interval
+            delay = start_at - now
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            semaphore.release()
+
+
+class CollectionTask:
+    """Fonte de dados a ser coletada pelo ConcurrentCollector"""
+
+    __slots__ = ('name', 'func', 'host', 'timeout', 'default', 'label')
+
+    def __init__(self, name: str, func: Callable[[], Any], host: Optional[str] = None,
+                 timeout: Optional[float] = None, default: Any = None, label: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.host = host
+        self.timeout = timeout
+        self.default = default
+        self.label = label
+
+
+class ConcurrentCollector:
+    """Executa todas as fontes ao mesmo tempo com timeout por fonte e prazo global"""
+
+    def __init__(self, max_workers: int = 6, source_timeout: float = 10.0,
+                 global_deadline: float = 30.0, politeness: Optional[HostPoliteness] = None):
+        self.max_workers = max_workers
+        self.source_timeout = source_timeout
+        self.global_deadline = global_deadline
+        self.politeness = politeness or HostPoliteness()
+
+    def _run_task(self, task: CollectionTask, clock: List[Optional[float]]) -> Any:
+        with self.politeness.slot(task.host):
+            # O prazo da fonte conta daqui: fila do executor e cortesia do host não entram
+            clock[0] = time.monotonic()
+            return task.func()
+
+    def collect(self, tasks: List[CollectionTask]) -> Dict[str, Any]:
+        """Coleta todas as fontes e retorna os resultados na ordem de registro
+
+        Fontes que falham ou estouram o prazo recebem o valor `default` da tarefa,
+        de modo que o resultado final não depende da ordem de conclusão. O
+        timeout de cada fonte conta a partir do momento em que ela começa a
+        rodar; o prazo global conta desde a chamada.
+        """
+        results: Dict[str, Any] = {task.name: task.default for task in tasks}
+        if not tasks:
+            return results
+
+        started = time.monotonic()
+        global_end = started + self.global_deadline
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks)))
+
+        try:
+            pending = {}
+            for task in tasks:
+                if task.label:
+                    print(task.label)
+                timeout = task.timeout if task.timeout is not None else self.source_timeout
+                clock: List[Optional[float]] = [None]
+                # Cada tarefa herda o contexto de quem coletou (trace/span atuais)
+                future = executor.submit(contextvars.copy_context().run, self._run_task, task, clock)
+                pending[future] = (task, timeout, clock)
+
+            while pending:
+                now = time.monotonic()
+                next_deadline = global_end
+                queued = False
+                # Descartar fontes cujo prazo individual (ou global) já passou
+                for future, (task, timeout, clock) in list(pending.items()):
+                    deadline = global_end if clock[0] is None else min(clock[0] + timeout, global_end)
+                    if now >= deadline and not future.done():
+                        future.cancel()
+                        del pending[future]
+                        print(f"⏱️ Tempo esgotado para a fonte {task.name}")
+                        continue
+                    next_deadline = min(next_deadline, deadline)
+                    queued = queued or clock[0] is None
+                if not pending:
+                    break
+
+                wait_for = max(0.0, next_deadline - now)
+                if queued:
+                    wait_for = min(wait_for, QUEUE_POLL)
+                done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task, _, _ = pending.pop(future)
+                    try:
+                        results[task.name] = future.result()
+                    except Exception as e:
+                        print(f"Erro ao coletar a fonte {task.name}: {e}")
+        finally:
+            # Não bloquear o relatório esperando threads atrasadas
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
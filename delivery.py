@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Envio do relatório para vários destinatários: conteúdo montado uma vez,
+personalização barata por destinatário, pool limitado com controle de cota
+e registro por destinatário para reenviar apenas as falhas
+"""
+
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from report_templates import SECTION_KEYS, render_sports_report
+from tracing import span
+
+DEFAULT_LEDGER_PATH = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'delivery_ledger.json')
+
+# Gmail: 250 unidades de cota/s por usuário e messages.send custa 100 -> 2,5 envios/s
+GMAIL_SENDS_PER_SECOND = 2.5
+
+
+@dataclass(slots=True, frozen=True)
+class Recipient:
+    """Destinatário e suas preferências"""
+
+    email: str
+    name: str = ''
+    teams: Tuple[str, ...] = ()
+    unsubscribed: FrozenSet[str] = frozenset()
+
+    def overlay(self) -> Dict[str, Any]:
+        return {'email': self.email, 'name': self.name, 'teams': self.teams, 'unsubscribed': self.unsubscribed}
+
+
+def parse_recipients(emails: str, preferences: Any = None) -> List[Recipient]:
+    """RECIPIENTS ('a@x.com,b@y.com') + preferências por email
+
+    `preferences` pode ser o dict já carregado (env.yaml) ou um JSON, ex.:
+    {"a@x.com": {"name": "Ana", "teams": ["Flamengo"], "unsubscribed": ["esports_today"]}}
+    """
+    if isinstance(preferences, str):
+        preferences = json.loads(preferences) if preferences.strip() else {}
+    preferences = {email.strip().lower(): prefs for email, prefs in (preferences or {}).items()}
+
+    recipients = []
+    seen = set()
+    for email in emails.split(','):
+        email = email.strip()
+        if not email or email.lower() in seen:
+            continue
+        seen.add(email.lower())
+
+        prefs = preferences.get(email.lower(), {})
+        unsubscribed = frozenset(prefs.get('unsubscribed', ()))
+        unknown = unsubscribed - set(SECTION_KEYS)
+        if unknown:
+            print(f"⚠️ Seções desconhecidas para {email}: {', '.join(sorted(unknown))}")
+        recipients.append(Recipient(
+            email=email,
+            name=prefs.get('name', ''),
+            teams=tuple(prefs.get('teams', ())),
+            unsubscribed=unsubscribed & set(SECTION_KEYS)
+        ))
+    return recipients
+
+
+class TokenBucket:
+    """Limitador de taxa compartilhado entre as threads de envio"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class DeliveryLedger:
+    """Resultado por destinatário de cada execução (JSON em /tmp, gravação atômica)"""
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, keep_runs: int = 30):
+        self.path = path
+        self.keep_runs = keep_runs
+        self._lock = threading.Lock()
+        self._runs: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Erro ao ler registro de envios: {e}")
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(self._runs, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def was_sent(self, run_id: str, email: str) -> bool:
+        with self._lock:
+            entry = self._runs.get(run_id, {}).get(email.lower())
+        return bool(entry) and entry['status'] == 'sent'
+
+    def entries(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._runs.get(run_id, {}))
+
+    def snapshot_of(self, run_id: str) -> Optional[str]:
+        """Snapshot (`saved_at` ISO) com os dados enviados em `run_id`, se registrado"""
+        with self._lock:
+            return next((entry['snapshot'] for entry in self._runs.get(run_id, {}).values()
+                         if entry.get('snapshot')), None)
+
+    def record(self, run_id: str, email: str, message_id: Optional[str] = None, error: Optional[str] = None,
+               snapshot: Optional[str] = None):
+        with self._lock:
+            run = self._runs.setdefault(run_id, {})
+            previous = run.get(email.lower(), {})
+            run[email.lower()] = {
+                'status': 'sent' if error is None else 'failed',
+                'message_id': message_id,
+                'error': error,
+                'attempts': previous.get('attempts', 0) + 1,
+                'snapshot': snapshot or previous.get('snapshot'),
+                'updated_at': int(time.time())
+            }
+            # Execuções antigas saem do arquivo (ids por data ordenam cronologicamente)
+            for old_run in sorted(self._runs)[:-self.keep_runs]:
+                del self._runs[old_run]
+            self._save()
+
+
+class DeliveryEngine:
+    """Renderiza uma vez e envia uma versão personalizada para cada destinatário
+
+    `send` recebe (destinatário, HTML) e devolve o id da mensagem; é chamado
+    em paralelo por até `max_workers` threads, respeitando `rate` envios/s.
+    `render` monta as versões por destinatário (padrão: render_sports_report).
+    """
+
+    def __init__(self, send: Callable[[Recipient, str], str], max_workers: int = 4,
+                 rate: float = GMAIL_SENDS_PER_SECOND, ledger: Optional[DeliveryLedger] = None,
+                 render: Optional[Callable[..., List[str]]] = None):
+        self.send = send
+        self.render = render
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate, capacity=min(max_workers, 2))
+        self.ledger = ledger if ledger is not None else DeliveryLedger()
+
+    def deliver(self, data: Dict[str, Any], recipients: List[Recipient], run_id: str,
+                snapshot: Optional[str] = None) -> Dict[str, Any]:
+        """Envia para quem ainda não recebeu `run_id`; devolve enviados, falhas e pulados
+
+        `snapshot` identifica os dados no histórico e fica no registro de envios,
+        para uma nova tentativa reenviar exatamente o mesmo relatório.
+        """
+        pending, skipped = [], []
+        for recipient in recipients:
+            (skipped if self.ledger.was_sent(run_id, recipient.email) else pending).append(recipient)
+        skipped = [r.email for r in skipped]
+        if skipped:
+            print(f"⏭️ {len(skipped)} destinatário(s) já receberam o relatório {run_id}")
+
+        result = {'sent': {}, 'failed': {}, 'skipped': skipped}
+        if not pending:
+            return result
+
+        with span('render', recipients=len(pending)):
+            render = self.render or render_sports_report
+            htmls = render(data, recipients=[r.overlay() for r in pending])
+
+        def deliver_one(recipient: Recipient, html: str):
+            with span('gmail.rate_limit'):
+                self.bucket.acquire()
+            try:
+                message_id = self.send(recipient, html)
+            except Exception as e:
+                self.ledger.record(run_id, recipient.email, error=str(e), snapshot=snapshot)
+                return recipient.email, None, str(e)
+            self.ledger.record(run_id, recipient.email, message_id=message_id, snapshot=snapshot)
+            return recipient.email, message_id, None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, deliver_one, r, html)
+                       for r, html in zip(pending, htmls)]
+            for future in futures:
+                email, message_id, error = future.result()
+                if error is None:
+                    result['sent'][email] = message_id
+                else:
+                    print(f"❌ Falha no envio para {email}: {error}")
+                    result['failed'][email] = error
+
+        return result
@@ -42,6 +42,31 @@ if grep -q "COLOQUE_APP_PASSWORD_AQUI" env.yaml; then
     fi
 fi
 
+# Sem bucket, snapshots e rollups ficam no /tmp de cada instância e o resumo sai vazio
+if ! grep -q "^SNAPSHOT_BACKEND: *\"\?gcs" env.yaml; then
+    echo "⚠️  SNAPSHOT_BACKEND não é gcs no env.yaml: o resumo semanal/mensal não terá histórico"
+fi
+
+# Criar ou atualizar um job do Cloud Scheduler: nome, cron, URL, descrição
+schedule_job() {
+    if gcloud scheduler jobs describe "$1" --location=us-central1 &> /dev/null; then
+        echo "📅 Job $1 já existe, atualizando..."
+        gcloud scheduler jobs update http "$1" \
+            --location=us-central1 \
+            --schedule="$2" \
+            --uri="$3" \
+            --time-zone="America/Sao_Paulo"
+    else
+        echo "📅 Criando job $1..."
+        gcloud scheduler jobs create http "$1" \
+            --location=us-central1 \
+            --schedule="$2" \
+            --uri="$3" \
+            --time-zone="America/Sao_Paulo" \
+            --description="$4"
+    fi
+}
+
 # Habilitar APIs necessárias
 echo "🔧 Habilitando APIs do Google Cloud..."
 gcloud services enable cloudfunctions.googleapis.com
@@ -69,23 +94,7 @@ if [ $? -eq 0 ]; then
     # Configurar agendamento (Cloud Scheduler)
     echo "⏰ Configurando agendamento diário..."
     
-    # Verificar se já existe o job
-    if gcloud scheduler jobs describe daily-sports-artplan --location=us-central1 &> /dev/null; then
-        echo "📅 Job do scheduler já existe, atualizando..."
-        gcloud scheduler jobs update http daily-sports-artplan \
-            --location=us-central1 \
-            --schedule="0 8 * * *" \
-            --uri="$FUNCTION_URL" \
-            --time-zone="America/Sao_Paulo"
-    else
-        echo "📅 Criando novo job do scheduler..."
-        gcloud scheduler jobs create http daily-sports-artplan \
-            --location=us-central1 \
-            --schedule="0 8 * * *" \
-            --uri="$FUNCTION_URL" \
-            --time-zone="America/Sao_Paulo" \
-            --description="Relatório esportivo diário Artplan"
-    fi
+    schedule_job daily-sports-artplan "0 8 * * *" "$FUNCTION_URL" "Relatório esportivo diário Artplan"
     
     if [ $? -eq 0 ]; then
         echo "✅ Agendamento configurado!"
@@ -107,6 +116,28 @@ if [ $? -eq 0 ]; then
         echo "⚠️  Função deployada, mas erro no agendamento"
     fi
     
+    # Resumo semanal (segunda, 9h) e mensal (dia 1, 9h) a partir do histórico diário
+    echo "☁️  Fazendo deploy do resumo semanal/mensal..."
+    gcloud functions deploy weekly-sports-digest \
+        --runtime python311 \
+        --trigger-http \
+        --entry-point weekly_sports_digest \
+        --env-vars-file env.yaml \
+        --memory 256MB \
+        --timeout 300s \
+        --region us-central1 \
+        --allow-unauthenticated
+    
+    if [ $? -eq 0 ]; then
+        DIGEST_URL=$(gcloud functions describe weekly-sports-digest --region=us-central1 --format="value(httpsTrigger.url)")
+        echo "🔗 URL do resumo: $DIGEST_URL"
+        schedule_job weekly-sports-digest-artplan "0 9 * * 1" "$DIGEST_URL?period=week" "Resumo esportivo semanal Artplan"
+        schedule_job monthly-sports-digest-artplan "0 9 1 * *" "$DIGEST_URL?period=month" "Resumo esportivo mensal Artplan"
+        echo "📊 Resumos: segundas às 09:00 (semana) e todo dia 1 às 09:00 (mês anterior)"
+    else
+        echo "⚠️  Erro no deploy do resumo semanal/mensal"
+    fi
+    
 else
     echo "❌ Erro no deploy da Cloud Function"
     exit 1
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resumos semanais e mensais a partir do histórico de snapshots
+
+Cada dia com snapshot vira um rollup pequeno (times mais citados, audiência
+e jogos por competição, notícias por fonte), guardado em um JSON por mês
+junto com o total do mês. Um resumo mensal lê só esse total; o semanal soma
+no máximo sete rollups. Os snapshots brutos só são relidos para dias ainda
+sem rollup ou cujo arquivo mudou (reexecução do relatório no mesmo dia).
+
+Os rollups ficam ao lado dos snapshots: no disco em `<SNAPSHOT_DIR>/rollups/`,
+ou no mesmo bucket (prefixo `rollups/`) quando os snapshots estão no GCS.
+
+Uso: python3 digest.py resumo AAAA-MM-DD AAAA-MM-DD
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from competitions import league_audience
+from http_cache import DiskCacheBackend, ObjectStoreCacheBackend
+from models import parse_audience
+from text_utils import fold_accents
+from news_selection import team_pattern
+from snapshot_store import ObjectStoreSnapshotBackend, SnapshotStore, get_snapshot_store
+
+# Seções com os jogos do próprio dia (programação da semana, jogos de amanhã e
+# resultados recentes repetem jogos que já contam no snapshot de outro dia)
+FIXTURE_SECTIONS = ('games_today', 'esports_today')
+TEAM_SECTIONS = ('games_today', 'games_tomorrow', 'recent_results', 'esports_today')
+
+TOP_TEAMS = 10
+
+DIGEST_PERIODS = ('week', 'month')
+
+# Muda quando o formato do rollup muda: meses gravados em outro formato são recalculados
+ROLLUP_FORMAT = 2
+
+
+class Rollup:
+    """Agregados somáveis de um ou mais dias (`games` inclui as partidas de e-sports)"""
+
+    __slots__ = ('days', 'first_day', 'last_day', 'games', 'esports', 'news', 'ai_days',
+                 'team_mentions', 'league_games', 'league_audience', 'news_by_source')
+
+    def __init__(self):
+        self.days = 0
+        self.first_day: Optional[date] = None
+        self.last_day: Optional[date] = None
+        self.games = 0
+        self.esports = 0
+        self.news = 0
+        self.ai_days = 0
+        self.team_mentions: Counter = Counter()
+        self.league_games: Counter = Counter()
+        self.league_audience: Counter = Counter()
+        self.news_by_source: Counter = Counter()
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], day: Optional[date] = None) -> 'Rollup':
+        """Rollup de um dia a partir do registro JSON do snapshot (sem montar os modelos)"""
+        rollup = cls()
+        rollup.days = 1
+        rollup.first_day = rollup.last_day = day
+        sports = record.get('sports_data', {})
+        rollup.esports = len(sports.get('esports_today', []))
+        if (record.get('ai_analysis') or {}).get('ai_powered'):
+            rollup.ai_days = 1
+
+        for key in FIXTURE_SECTIONS:
+            for match in sports.get(key, []):
+                league = match.get('league') or 'Campeonato'
+                rollup.games += 1
+                rollup.league_games[league] += 1
+                rollup.league_audience[league] += (parse_audience(match.get('audience') or match.get('viewers'))
+                                                   or league_audience(league))
+                for team in (match.get('home_team'), match.get('away_team')):
+                    if team:
+                        rollup.team_mentions[team] += 1
+
+        # Notícias citam os times que aparecem nos jogos do dia (nome sem acentos)
+        display = {}
+        for key in TEAM_SECTIONS:
+            for match in sports.get(key, []):
+                for team in (match.get('home_team'), match.get('away_team')):
+                    if team:
+                        display.setdefault(fold_accents(team), team)
+        pattern = team_pattern(display.values())
+
+        for article in record.get('news_data', []):
+            rollup.news += 1
+            rollup.news_by_source[article.get('source') or 'Fonte'] += 1
+            if pattern:
+                text = fold_accents(f"{article.get('title', '')} {article.get('description', '')}")
+                for name in set(pattern.findall(text)):
+                    rollup.team_mentions[display[name]] += 1
+        return rollup
+
+    def merge(self, other: 'Rollup') -> 'Rollup':
+        self.days += other.days
+        if other.first_day and (self.first_day is None or other.first_day < self.first_day):
+            self.first_day = other.first_day
+        if other.last_day and (self.last_day is None or other.last_day > self.last_day):
+            self.last_day = other.last_day
+        self.games += other.games
+        self.esports += other.esports
+        self.news += other.news
+        self.ai_days += other.ai_days
+        self.team_mentions.update(other.team_mentions)
+        self.league_games.update(other.league_games)
+        self.league_audience.update(other.league_audience)
+        self.news_by_source.update(other.news_by_source)
+        return self
+
+    def top_teams(self, limit: int = TOP_TEAMS):
+        # Empates em ordem alfabética: o mesmo histórico gera sempre o mesmo resumo
+        return sorted(self.team_mentions.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'days': self.days,
+                'first_day': self.first_day.isoformat() if self.first_day else None,
+                'last_day': self.last_day.isoformat() if self.last_day else None,
+                'games': self.games, 'esports': self.esports, 'news': self.news, 'ai_days': self.ai_days,
+                'team_mentions': dict(self.team_mentions.most_common()),
+                'league_games': dict(self.league_games.most_common()),
+                'league_audience': dict(self.league_audience.most_common()),
+                'news_by_source': dict(self.news_by_source.most_common())}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rollup':
+        rollup = cls()
+        rollup.days = data.get('days', 0)
+        for name in ('first_day', 'last_day'):
+            if data.get(name):
+                setattr(rollup, name, date.fromisoformat(data[name]))
+        rollup.games = data.get('games', 0)
+        rollup.esports = data.get('esports', 0)
+        rollup.news = data.get('news', 0)
+        rollup.ai_days = data.get('ai_days', 0)
+        for name in ('team_mentions', 'league_games', 'league_audience', 'news_by_source'):
+            getattr(rollup, name).update(data.get(name, {}))
+        return rollup
+
+
+class RollupStore:
+    """Rollups diários e total do mês em `AAAA-MM.json` num backend de bytes
+
+    Aceita os backends do cache HTTP (`DiskCacheBackend`, gravação atômica, ou
+    `ObjectStoreCacheBackend` sobre um bucket GCS).
+    """
+
+    def __init__(self, backend: Any):
+        self.backend = backend
+
+    def load_month(self, year: int, month: int) -> Dict[str, Any]:
+        empty = {'format': ROLLUP_FORMAT, 'days': {}, 'total': None}
+        try:
+            raw = self.backend.get(f"{year:04d}-{month:02d}.json")
+            data = json.loads(raw) if raw is not None else None
+        except Exception as e:
+            print(f"Erro ao ler rollups de {year}-{month:02d}: {e}")
+            return empty
+        if not data or data.get('format') != ROLLUP_FORMAT:
+            return empty
+        return data
+
+    def save_month(self, year: int, month: int, data: Dict[str, Any]):
+        self.backend.put(f"{year:04d}-{month:02d}.json", json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def rollup_store_for(snapshots: SnapshotStore) -> RollupStore:
+    """Rollups no mesmo lugar dos snapshots (bucket ou `<raiz>/rollups`)"""
+    if isinstance(snapshots.backend, ObjectStoreSnapshotBackend):
+        return RollupStore(ObjectStoreCacheBackend(snapshots.backend.bucket, prefix='rollups/'))
+    return RollupStore(DiskCacheBackend(os.path.join(snapshots.root, 'rollups')))
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    first = date(year, month, 1)
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+class DigestBuilder:
+    """Soma os rollups de um período, atualizando os que faltam a partir dos snapshots"""
+
+    def __init__(self, snapshots: SnapshotStore, rollups: Optional[RollupStore] = None):
+        self.snapshots = snapshots
+        self.rollups = rollups or rollup_store_for(snapshots)
+        self._lock = threading.Lock()
+
+    def refresh_month(self, year: int, month: int) -> Dict[str, Any]:
+        """Rollups do mês em dia com os snapshots; só relê dias novos ou alterados"""
+        with self._lock:
+            stored = self.rollups.load_month(year, month)
+            days = stored['days']
+            first, last = _month_range(year, month)
+            changed = False
+
+            present = set()
+            for day in self.snapshots.days(first, last):
+                key = day.isoformat()
+                present.add(key)
+                version = self.snapshots.version(day)
+                if key in days and days[key]['version'] == version:
+                    continue
+                record = next((record for _, record in self.snapshots.iter_range(day, day)), None)
+                if record is None:
+                    continue
+                days[key] = {'version': version, 'rollup': Rollup.from_record(record, day).to_dict()}
+                changed = True
+            for key in set(days) - present:
+                del days[key]
+                changed = True
+
+            if changed or stored['total'] is None:
+                total = Rollup()
+                for key in sorted(days):
+                    total.merge(Rollup.from_dict(days[key]['rollup']))
+                stored['total'] = total.to_dict()
+                self.rollups.save_month(year, month, stored)
+            return stored
+
+    def build(self, start: date, end: date) -> Rollup:
+        """Agregado de `start` a `end` (inclusive): meses inteiros usam o total guardado"""
+        result = Rollup()
+        month = date(start.year, start.month, 1)
+        while month <= end:
+            first, last = _month_range(month.year, month.month)
+            stored = self.refresh_month(month.year, month.month)
+            if start <= first and last <= end:
+                result.merge(Rollup.from_dict(stored['total']))
+            else:
+                for key, entry in sorted(stored['days'].items()):
+                    if start <= date.fromisoformat(key) <= end:
+                        result.merge(Rollup.from_dict(entry['rollup']))
+            month = last + timedelta(days=1)
+        return result
+
+
+def digest_period(period: str, today: date) -> Tuple[date, date]:
+    """'week': os 7 dias até ontem; 'month': o mês anterior completo"""
+    if period == 'week':
+        return today - timedelta(days=7), today - timedelta(days=1)
+    if period == 'month':
+        last = today.replace(day=1) - timedelta(days=1)
+        return last.replace(day=1), last
+    raise ValueError(f"Período desconhecido: {period!r} (use 'week' ou 'month')")
+
+
+def summarize_range(snapshots: SnapshotStore, start: date, end: date) -> Rollup:
+    """Resumo do período (jogos por liga, notícias por fonte, dias com IA) a partir dos rollups"""
+    return DigestBuilder(snapshots).build(start, end)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != 'resumo':
+        print("Uso: python3 digest.py resumo AAAA-MM-DD AAAA-MM-DD")
+        sys.exit(1)
+
+    summary = summarize_range(get_snapshot_store(), date.fromisoformat(sys.argv[2]),
+                              date.fromisoformat(sys.argv[3]))
+    print(json.dumps(summary.to_dict(), ensure_ascii=False, indent=2))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingestão incremental de feeds RSS/Atom (iterparse, memória constante)
+"""
+
+import html
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+import pytz
+
+from models import DEFAULT_TIMEZONE, Article, localize
+
+try:
+    # lxml é mais rápido; a biblioteca padrão atende quando não estiver instalado
+    from lxml import etree as _etree
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as _etree
+    _LXML = False
+
+ITEM_TAGS = frozenset(['item', 'entry'])
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _local_name(tag: Any) -> str:
+    """Remove o namespace ({http://www.w3.org/2005/Atom}entry -> entry)"""
+    if not isinstance(tag, str):
+        return ''
+    return tag.rpartition('}')[2]
+
+
+def _clean_text(value: Optional[str], limit: int = 300) -> str:
+    """Remove HTML e espaços extras da descrição"""
+    if not value:
+        return ''
+    if '<' in value:
+        value = _TAG_RE.sub(' ', value)
+    if '&' in value:
+        value = html.unescape(value)
+    text = _SPACE_RE.sub(' ', value).strip()
+    if len(text) > limit:
+        text = text[:limit].rsplit(' ', 1)[0] + '…'
+    return text
+
+
+def parse_feed_date(value: Optional[str], timezone=DEFAULT_TIMEZONE) -> Optional[datetime]:
+    """Converte datas RFC 822 (RSS) ou ISO 8601 (Atom) para datetime no fuso local"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    # Data sem fuso no feed: UTC, como manda o RFC 822
+    return localize(parsed, pytz.utc).astimezone(timezone)
+
+
+def _item_fields(elem: Any) -> Dict[str, Optional[str]]:
+    """Extrai os campos de um <item> RSS ou <entry> Atom"""
+    fields: Dict[str, Optional[str]] = {}
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == 'link':
+            # Atom usa <link href="..." rel="alternate"/>, RSS usa texto
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', href)
+            elif child.text:
+                fields.setdefault('link', child.text.strip())
+        elif name in ('title', 'description', 'summary', 'guid', 'id',
+                      'pubDate', 'published', 'updated', 'date'):
+            fields.setdefault(name, child.text)
+        elif name == 'encoded' and 'description' not in fields:
+            fields['description'] = child.text
+    return fields
+
+
+def _iter_item_elements(stream: BinaryIO) -> Iterator[Any]:
+    """Percorre os elementos <item>/<entry>, liberando cada um após o uso"""
+    if _LXML:
+        # lxml filtra as tags no parser em C: só os itens chegam ao Python
+        for _, elem in _etree.iterparse(stream, events=('end',), tag=('{*}item', '{*}entry'),
+                                        resolve_entities=False, huge_tree=True, recover=True):
+            yield elem
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
+        return
+
+    parents = []
+    for event, elem in _etree.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if _local_name(elem.tag) in ITEM_TAGS:
+            yield elem
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def iter_feed_items(stream: BinaryIO, source: str, category: str, max_items: Optional[int] = None,
+                    since: Optional[datetime] = None, max_stale: int = 20,
+                    timezone=DEFAULT_TIMEZONE) -> Iterator[Article]:
+    """Gera notícias (Article) a partir de um feed RSS/Atom, item a item
+
+    Cada item é descartado da árvore logo após ser processado, então a memória
+    não cresce com o tamanho do feed. A leitura para cedo quando `max_items`
+    notícias frescas foram emitidas ou quando `max_stale` itens seguidos são
+    mais antigos que `since` (feeds vêm do mais novo para o mais antigo).
+    """
+    emitted = 0
+    stale_in_a_row = 0
+
+    for elem in _iter_item_elements(stream):
+        fields = _item_fields(elem)
+
+        title = _clean_text(fields.get('title'), limit=200)
+        link = (fields.get('link') or fields.get('guid') or fields.get('id') or '').strip()
+        if not title or not link:
+            continue
+
+        published = parse_feed_date(
+            fields.get('pubDate') or fields.get('published') or fields.get('updated') or fields.get('date'),
+            timezone
+        )
+        if since is not None and published is not None and published <= since:
+            stale_in_a_row += 1
+            if stale_in_a_row >= max_stale:
+                break
+            continue
+        stale_in_a_row = 0
+
+        yield Article(
+            title=title,
+            link=link,
+            source=source,
+            category=category,
+            description=_clean_text(fields.get('description') or fields.get('summary')),
+            published=published
+        )
+
+        emitted += 1
+        if max_items is not None and emitted >= max_items:
+            break
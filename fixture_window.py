@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Janela de jogos: um intervalo de datas buscado uma vez e indexado por dia e competição
+
+Os provedores recebem o intervalo inteiro (temporada do TheSportsDB e
+football-data.org custam as mesmas requisições para um dia ou uma semana).
+As partidas ficam ordenadas por horário com a lista de dias ao lado, então
+o recorte de um dia (ou de uma competição num dia) é uma busca binária.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from competitions import classify_league, normalize_name
+from models import DEFAULT_TIMEZONE, Match
+from tracing import span
+
+
+def league_key(league: Optional[str]) -> str:
+    """Id da competição no cadastro ('Brazilian Serie A' -> 'brasileirao-a'), ou o nome sem acentos"""
+    competition = classify_league(league)
+    return competition.id if competition else normalize_name(league)
+
+
+class FixtureWindow:
+    """Partidas de `start` a `end` com índice por dia e por competição"""
+
+    def __init__(self, start: date, end: date, matches: Sequence[Match], timezone=DEFAULT_TIMEZONE):
+        self.start = start
+        self.end = end
+        self._matches = sorted(matches, key=lambda match: match.kickoff)
+        # Dia local cresce junto com o horário: a lista já sai ordenada para o bisect
+        self._days = [match.kickoff.astimezone(timezone).date() for match in self._matches]
+        self._leagues: Dict[str, Tuple[List[date], List[Match]]] = {}
+        for day, match in zip(self._days, self._matches):
+            days, matches_by_day = self._leagues.setdefault(league_key(match.league), ([], []))
+            days.append(day)
+            matches_by_day.append(match)
+
+    @classmethod
+    def load(cls, providers, start: date, end: date) -> 'FixtureWindow':
+        """Busca o intervalo inteiro de uma vez em todos os provedores (ProviderSet)"""
+        with span('fixtures.window', days=(end - start).days + 1) as current:
+            window = cls(start, end, providers.fixtures(start, end))
+            current.set(matches=len(window))
+        return window
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def covers(self, start: date, end: Optional[date] = None) -> bool:
+        return self.start <= start and (end or start) <= self.end
+
+    def between(self, start: date, end: date, league: Optional[str] = None) -> List[Match]:
+        """Partidas de `start` a `end` (inclusive), opcionalmente de uma competição, por horário"""
+        if league is None:
+            days, matches = self._days, self._matches
+        else:
+            days, matches = self._leagues.get(league_key(league), ((), ()))
+        return list(matches[bisect_left(days, start):bisect_right(days, end)])
+
+    def day(self, day: date, league: Optional[str] = None) -> List[Match]:
+        return self.between(day, day, league)
+
+    def leagues(self) -> List[str]:
+        return sorted(self._leagues)
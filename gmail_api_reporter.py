@@ -3,68 +3,177 @@ import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import base64
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 from datetime import datetime
+import threading
 import pytz
-import yaml
+
+from lazy_imports import lazy_import, running_in_cloud
+
+# Clientes Google e YAML só carregam quando usados (o fluxo OAuth interativo
+# nunca é importado dentro da Cloud Function)
+discovery = lazy_import('googleapiclient.discovery')
+oauth_flow = lazy_import('google_auth_oauthlib.flow')
+google_requests = lazy_import('google.auth.transport.requests')
+google_exceptions = lazy_import('google.auth.exceptions')
+google_auth_httplib2 = lazy_import('google_auth_httplib2')
+httplib2 = lazy_import('httplib2')
+yaml = lazy_import('yaml')
 
 # Importar nossos módulos de dados reais
 from real_sports_data import RealSportsData
 from real_news_scraper import RealNewsScraper
+from real_ai_analysis import RealAIAnalysis
+from seen_store import SeenArticleStore
+from snapshot_store import get_snapshot_store
+from report_templates import render_digest, render_sports_report
+from digest import DigestBuilder, digest_period
+from news_selection import teams_in
+from tracing import span, traced
+from delivery import DEFAULT_LEDGER_PATH, DeliveryEngine, DeliveryLedger, Recipient, parse_recipients
+
+# Estado reaproveitado entre invocações da mesma instância (Cloud Function "quente")
+_warm_lock = threading.Lock()
+_config_cache = {}   # caminho -> (mtime, config)
+_gmail_services = {}  # token_file -> (credenciais, serviço)
+
+
+def load_config(env_file):
+    """env.yaml lido uma vez e relido só quando o arquivo muda"""
+    try:
+        mtime = os.stat(env_file).st_mtime_ns
+    except OSError as e:
+        print(f"Erro ao carregar configurações: {e}")
+        return {}
+    
+    cached = _config_cache.get(env_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(env_file, 'r', encoding='utf-8') as file:
+            config = yaml.safe_load(file) or {}
+    except Exception as e:
+        print(f"Erro ao carregar configurações: {e}")
+        return {}
+    _config_cache[env_file] = (mtime, config)
+    return config
+
+
+def _load_credentials(credentials_file, token_file, scopes):
+    creds = None
+    
+    if os.path.exists(token_file):
+        with open(token_file, 'rb') as token:
+            creds = pickle.load(token)
+    
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(google_requests.Request())
+        elif running_in_cloud():
+            raise RuntimeError("Token do Gmail ausente ou inválido; gere o token.pickle localmente "
+                               "com setup_gmail_oauth.py e inclua no deploy")
+        else:
+            flow = oauth_flow.InstalledAppFlow.from_client_secrets_file(credentials_file, scopes)
+            creds = flow.run_local_server(port=0)
+        
+        with open(token_file, 'wb') as token:
+            pickle.dump(creds, token)
+    return creds
+
+
+def get_gmail_service(credentials_file, token_file, scopes):
+    """Credenciais e cliente Gmail compartilhados pelas invocações da instância
+    
+    O cliente usa o documento de descoberta embutido na biblioteca (sem buscar
+    nem reprocessar a cada chamada). Token expirado é renovado no próprio objeto
+    de credenciais; se a renovação falhar, o cache é descartado e tudo é refeito.
+    """
+    with _warm_lock:
+        cached = _gmail_services.get(token_file)
+        if cached:
+            creds, service = cached
+            if creds.valid:
+                return creds, service
+            if creds.expired and creds.refresh_token:
+                try:
+                    creds.refresh(google_requests.Request())
+                    with open(token_file, 'wb') as token:
+                        pickle.dump(creds, token)
+                    return creds, service
+                except google_exceptions.RefreshError as e:
+                    print(f"⚠️ Falha ao renovar credenciais, autenticando novamente: {e}")
+            del _gmail_services[token_file]
+        
+        creds = _load_credentials(credentials_file, token_file, scopes)
+        service = discovery.build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
+        _gmail_services[token_file] = (creds, service)
+        return creds, service
+
+
+def invalidate_gmail_service(token_file='token.pickle'):
+    with _warm_lock:
+        _gmail_services.pop(token_file, None)
+
 
 class GmailAPISportsReportREAL:
     """Relatório esportivo com dados REAIS via Gmail API"""
     
     SCOPES = ['https://www.googleapis.com/auth/gmail.send']
     
-    def __init__(self, credentials_file='credentials.json', token_file='token.pickle', env_file='env.yaml'):
+    def __init__(self, credentials_file='credentials.json', token_file='token.pickle', env_file='env.yaml',
+                 gmail_client=None):
         self.credentials_file = credentials_file
         self.token_file = token_file
+        # (credenciais, serviço) prontos, usados no lugar do OAuth (ex.: MockServices.gmail_client())
+        self.gmail_client = gmail_client
         self.service = None
+        self.creds = None
+        self._local = threading.local()
         self.timezone = pytz.timezone('America/Sao_Paulo')
         
         # Carregar configurações
-        self.config = self._load_config(env_file)
+        self.env_file = env_file
         
         # Inicializar coletores de dados REAIS
         self.sports_collector = RealSportsData()
-        self.news_scraper = RealNewsScraper()
+        
+        # NEWS_SEEN_STORE aponta para o SQLite das notícias já enviadas (modo incremental)
+        seen_store_path = os.environ.get('NEWS_SEEN_STORE') or self.config.get('NEWS_SEEN_STORE')
+        self.seen_store = SeenArticleStore(seen_store_path) if seen_store_path else None
+        self.news_scraper = RealNewsScraper(seen_store=self.seen_store)
+        
+        # Oportunidades de mídia via Gemini: cada execução gasta chamadas pagas, então só
+        # entram com AI_OPPORTUNITIES=1 (além da GEMINI_API_KEY)
+        ai_enabled = os.environ.get('AI_OPPORTUNITIES') or self.config.get('AI_OPPORTUNITIES')
+        self.ai = RealAIAnalysis() if str(ai_enabled or '').lower() in ('1', 'true', 'yes', 'sim') else None
+        
+        # Resultado de cada envio por destinatário (reexecuções reenviam só as falhas)
+        self.ledger = DeliveryLedger(os.environ.get('DELIVERY_LEDGER') or self.config.get('DELIVERY_LEDGER')
+                                     or DEFAULT_LEDGER_PATH)
+        
+        # Dados de cada execução (SNAPSHOT_DIR), para reenviar relatórios antigos e resumos de período
+        self.snapshots = get_snapshot_store(os.environ.get('SNAPSHOT_DIR') or self.config.get('SNAPSHOT_DIR'))
+        self.digests = DigestBuilder(self.snapshots)
         
         self._authenticate()
     
-    def _load_config(self, env_file):
-        """Carrega configurações do arquivo env.yaml"""
-        try:
-            with open(env_file, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
-        except Exception as e:
-            print(f"Erro ao carregar configurações: {e}")
-            return {}
+    @property
+    def config(self):
+        """Configurações do env.yaml (cacheadas por data de modificação)"""
+        return load_config(self.env_file)
     
     def _authenticate(self):
-        """Autentica com Gmail API usando OAuth2"""
-        creds = None
-        
-        if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
-        
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_file, self.SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        self.service = build('gmail', 'v1', credentials=creds)
+        """Autentica com Gmail API usando OAuth2 (reaproveita o cliente da instância)"""
+        self._connect_gmail()
         print("✅ Autenticação Gmail API realizada com sucesso!")
     
+    def _connect_gmail(self):
+        """Credenciais e cliente em dia (o cliente recebido no construtor é usado como está)"""
+        if self.gmail_client is not None:
+            self.creds, self.service = self.gmail_client
+        else:
+            self.creds, self.service = get_gmail_service(self.credentials_file, self.token_file, self.SCOPES)
+    
+    @traced('collect')
     def collect_real_data(self):
         """Coleta todos os dados REAIS"""
         print("🔄 Coletando dados esportivos REAIS...")
@@ -75,242 +184,198 @@ class GmailAPISportsReportREAL:
         
         # 2. Notícias via scraping melhorado
         print("📰 Coletando notícias...")
-        news_data = self.news_scraper.get_all_news()
+        news_data = self.news_scraper.get_all_news(teams=teams_in(sports_data))
         
-        return {
+        data = {
             'sports_data': sports_data,
             'news_data': news_data,
             'collection_time': datetime.now(self.timezone).strftime('%d/%m/%Y %H:%M')
         }
+        
+        # 3. Análise de IA (análise e insights em paralelo, com prazo)
+        if self.ai and self.ai.model:
+            print("🤖 Gerando oportunidades de mídia...")
+            ai_result = self.ai.analyze_all(sports_data, news_data)
+            data['ai_analysis'] = ai_result['analysis']
+            data['market_insights'] = ai_result['market_insights']
+        
+        return data
     
     def generate_html_report(self, data):
         """Gera relatório HTML com dados REAIS - versão limpa sem mentiras"""
-        sports_data = data['sports_data']
-        news_data = data['news_data']
+        return render_sports_report(data)
+    
+    def _thread_http(self):
+        """Transporte HTTP da thread atual (httplib2 não é thread-safe; o cliente é compartilhado)"""
+        http = getattr(self._local, 'http', None)
+        if http is None or http.credentials is not self.creds:
+            http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http(timeout=30))
+            self._local.http = http
+        return http
+    
+    @traced('gmail.send')
+    def _send_html(self, recipient: Recipient, html_content: str, subject: str) -> str:
+        """Envia uma versão do relatório e devolve o id da mensagem"""
+        message = MIMEMultipart('alternative')
+        message['to'] = recipient.email
+        message['from'] = 'artplan.sports.report@gmail.com'
+        message['subject'] = subject
+        message.attach(MIMEText(html_content, 'html', 'utf-8'))
         
-        # Estatísticas dos dados coletados
-        stats = {
-            'games_today': len(sports_data.get('games_today', [])),
-            'games_tomorrow': len(sports_data.get('games_tomorrow', [])),
-            'recent_results': len(sports_data.get('recent_results', [])),
-            'esports_events': len(sports_data.get('esports_today', [])),
-            'total_news': len(news_data),
-            'news_sources': len(set(n['source'] for n in news_data)) if news_data else 0
-        }
+        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        send_message = self.service.users().messages().send(
+            userId='me',
+            body={'raw': raw_message}
+        ).execute(http=self._thread_http(), num_retries=2)
+        return send_message.get('id')
+    
+    def send_reports(self, recipients, run_id: str = None, data=None):
+        """Coleta e renderiza uma vez e envia a versão de cada destinatário
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 900px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
-                .header {{ background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 28px; }}
-                .subtitle {{ margin: 10px 0 0 0; opacity: 0.9; font-size: 16px; }}
-                .section {{ padding: 25px; border-bottom: 1px solid #eee; }}
-                .section:last-child {{ border-bottom: none; }}
-                .section h2 {{ color: #1e3c72; margin-top: 0; font-size: 22px; display: flex; align-items: center; }}
-                .badge {{ background: #1e3c72; color: white; padding: 4px 12px; border-radius: 20px; font-size: 12px; margin-left: 10px; }}
-                .real-badge {{ background: #28a745; }}
-                .live-badge {{ background: #dc3545; }}
-                .game {{ background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 8px; border-left: 4px solid #1e3c72; }}
-                .game-time {{ font-weight: bold; color: #1e3c72; font-size: 14px; }}
-                .game-teams {{ font-size: 16px; font-weight: 600; margin: 5px 0; }}
-                .game-info {{ font-size: 13px; color: #666; }}
-                .result {{ background: #e8f5e8; border-left-color: #28a745; }}
-                .result .game-time {{ color: #28a745; }}
-                .news-item {{ padding: 15px; margin: 10px 0; background: #f8f9fa; border-radius: 8px; border-left: 4px solid #17a2b8; }}
-                .news-link {{ color: #007bff; text-decoration: none; font-weight: 500; }}
-                .news-link:hover {{ text-decoration: underline; }}
-                .news-description {{ color: #666; font-size: 13px; margin-top: 5px; }}
-                .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(140px, 1fr)); gap: 15px; margin: 20px 0; }}
-                .stat-card {{ background: #e3f2fd; padding: 15px; border-radius: 8px; text-align: center; }}
-                .stat-number {{ font-size: 24px; font-weight: bold; color: #1976d2; }}
-                .stat-label {{ font-size: 12px; color: #666; margin-top: 5px; }}
-                .footer {{ text-align: center; padding: 20px; background: #f8f9fa; color: #666; border-radius: 0 0 10px 10px; }}
-                .esports {{ background: #fff3e0; border-left-color: #ff9800; }}
-                .esports .game-time {{ color: #ff9800; }}
-                .category-tag {{ background: #6c757d; color: white; padding: 2px 6px; border-radius: 3px; font-size: 11px; margin-left: 8px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🏆 Relatório Esportivo Artplan</h1>
-                    <p class="subtitle">Dados Coletados em Tempo Real • {data['collection_time']}</p>
-                </div>
-                
-                <div class="section">
-                    <h2>📊 Resumo dos Dados Coletados</h2>
-                    <div class="stats">
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['games_today']}</div>
-                            <div class="stat-label">Jogos Hoje</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['games_tomorrow']}</div>
-                            <div class="stat-label">Jogos Amanhã</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['recent_results']}</div>
-                            <div class="stat-label">Resultados Recentes</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['esports_events']}</div>
-                            <div class="stat-label">E-sports</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['total_news']}</div>
-                            <div class="stat-label">Notícias</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{stats['news_sources']}</div>
-                            <div class="stat-label">Fontes</div>
-                        </div>
-                    </div>
-                </div>
+        `recipients` aceita Recipient ou emails (as preferências vêm de
+        RECIPIENT_PREFERENCES). Destinatários que já receberam `run_id` (padrão:
+        a data de hoje) são pulados, então repetir a chamada reenvia só as falhas,
+        com o mesmo relatório: a nova tentativa usa o snapshot registrado para
+        `run_id` em vez de coletar de novo. Com `data` (ex.: um snapshot), nada é
+        coletado nem gravado no histórico. O resultado inclui o `run_id` usado.
         """
+        if recipients and isinstance(recipients[0], str):
+            preferences = os.environ.get('RECIPIENT_PREFERENCES') or self.config.get('RECIPIENT_PREFERENCES')
+            recipients = parse_recipients(','.join(recipients), preferences)
+        run_id = run_id or datetime.now(self.timezone).strftime('%Y-%m-%d')
+        
+        if all(self.ledger.was_sent(run_id, r.email) for r in recipients):
+            print(f"⏭️ Todos os destinatários já receberam o relatório {run_id}")
+            return {'sent': {}, 'failed': {}, 'skipped': [r.email for r in recipients], 'run_id': run_id}
         
-        # Seção de Jogos de Hoje
-        if sports_data.get('games_today'):
-            html_content += f"""
-                <div class="section">
-                    <h2>⚽ Jogos de Hoje <span class="badge real-badge">BRASILEIRÃO</span></h2>
-            """
-            for game in sports_data['games_today']:
-                html_content += f"""
-                    <div class="game">
-                        <div class="game-time">{game.get('time', 'TBD')} • {game.get('date', '')}</div>
-                        <div class="game-teams">{game.get('home_team', 'Time A')} vs {game.get('away_team', 'Time B')}</div>
-                        <div class="game-info">{game.get('league', 'Liga')} • {game.get('venue', 'Estádio')} • {game.get('status', 'Agendado')}</div>
-                    </div>
-                """
-            html_content += "</div>"
+        # Instância quente: confirma (e renova, se preciso) as credenciais em cache
+        with span('gmail.auth'):
+            self._connect_gmail()
         
-        # Seção de Resultados Recentes
-        if sports_data.get('recent_results'):
-            html_content += f"""
-                <div class="section">
-                    <h2>📈 Resultados Recentes <span class="badge live-badge">FINALIZADOS</span></h2>
-            """
-            for game in sports_data['recent_results']:
-                html_content += f"""
-                    <div class="game result">
-                        <div class="game-time">{game.get('time', 'TBD')} • {game.get('date', '')}</div>
-                        <div class="game-teams">{game.get('home_team', 'Time A')} {game.get('score', '0-0')} {game.get('away_team', 'Time B')}</div>
-                        <div class="game-info">{game.get('league', 'Liga')} • {game.get('venue', 'Estádio')} • {game.get('attendance', 'Público')}</div>
-                    </div>
-                """
-            html_content += "</div>"
+        snapshot = None
+        if data is None and self.ledger.entries(run_id):
+            # Nova tentativa do mesmo envio: quem falhou recebe os dados da primeira vez
+            # (coletar de novo gastaria a IA e o seen_store já tiraria as notícias do dia)
+            snapshot = self.ledger.snapshot_of(run_id)
+            if snapshot:
+                data = self.snapshots.load_saved(datetime.fromisoformat(snapshot))
+            if data is not None:
+                print(f"♻️ Reenviando as falhas de {run_id} com o snapshot de {snapshot}")
         
-        # Seção de Jogos de Amanhã
-        if sports_data.get('games_tomorrow'):
-            html_content += f"""
-                <div class="section">
-                    <h2>📅 Jogos de Amanhã <span class="badge">PROGRAMAÇÃO</span></h2>
-            """
-            for game in sports_data['games_tomorrow']:
-                html_content += f"""
-                    <div class="game">
-                        <div class="game-time">{game.get('time', 'TBD')} • {game.get('date', '')}</div>
-                        <div class="game-teams">{game.get('home_team', 'Time A')} vs {game.get('away_team', 'Time B')}</div>
-                        <div class="game-info">{game.get('league', 'Liga')} • {game.get('venue', 'Estádio')} • {game.get('tv', 'TV')}</div>
-                    </div>
-                """
-            html_content += "</div>"
+        replay = data is not None
+        if replay:
+            real_data = data
+        else:
+            print("🔄 Iniciando coleta de dados REAIS...")
+            real_data = self.collect_real_data()
+            snapshot = self._save_snapshot(real_data)
+        subject = f'🏆 Relatório Esportivo Artplan - {real_data["collection_time"]}'
         
-        # Seção de E-sports
-        if sports_data.get('esports_today'):
-            html_content += f"""
-                <div class="section">
-                    <h2>🎮 E-sports Hoje <span class="badge">CBLOL • VALORANT</span></h2>
-            """
-            for game in sports_data['esports_today']:
-                html_content += f"""
-                    <div class="game esports">
-                        <div class="game-time">{game.get('time', 'TBD')} • {game.get('date', '')}</div>
-                        <div class="game-teams">{game.get('home_team', 'Team A')} vs {game.get('away_team', 'Team B')}</div>
-                        <div class="game-info">{game.get('league', 'Liga')} • {game.get('game', 'Game')} • {game.get('viewers', 'Audiência')}</div>
-                    </div>
-                """
-            html_content += "</div>"
+        print(f"📤 Enviando para {len(recipients)} destinatário(s)...")
+        engine = DeliveryEngine(
+            send=lambda recipient, html: self._send_html(recipient, html, subject),
+            max_workers=int(os.environ.get('DELIVERY_WORKERS', '4')),
+            ledger=self.ledger
+        )
+        result = engine.deliver(real_data, recipients, run_id, snapshot=snapshot)
+        result['run_id'] = run_id
         
-        # Seção de Notícias REAIS
-        if news_data:
-            html_content += f"""
-                <div class="section">
-                    <h2>📰 Notícias Esportivas <span class="badge real-badge">{stats['news_sources']} FONTES</span></h2>
-            """
-            for news in news_data[:12]:  # Mostrar até 12 notícias
-                html_content += f"""
-                    <div class="news-item">
-                        <a href="{news.get('link', '#')}" class="news-link" target="_blank">
-                            {news.get('title', 'Título da notícia')}
-                        </a>
-                        <span class="category-tag">{news.get('category', news.get('source', 'Notícia'))}</span>
-                        <div class="news-description">{news.get('description', '')}</div>
-                        <small>{news.get('source', 'Fonte')} • {news.get('date', 'Data')}</small>
-                    </div>
-                """
-            html_content += "</div>"
+        if result['sent'] and self.seen_store and not replay:
+            self.seen_store.record_delivery(real_data['news_data'])
         
-        html_content += f"""
-                <div class="footer">
-                    <p><strong>🚀 Sistema Artplan - Relatório Esportivo Automatizado</strong></p>
-                    <p>📊 Dados coletados de múltiplas fontes • 📰 {stats['total_news']} notícias • ⚽ {stats['games_today'] + stats['games_tomorrow']} jogos</p>
-                    <p><small>Relatório gerado automaticamente em {data['collection_time']}</small></p>
-                </div>
-            </div>
-        </body>
-        </html>
+        print(f"✅ {len(result['sent'])} enviado(s), ❌ {len(result['failed'])} falha(s), "
+              f"⏭️ {len(result['skipped'])} já enviado(s)")
+        print(f"📊 Dados coletados:")
+        print(f"   • {len(real_data['sports_data'].get('games_today', []))} jogos hoje")
+        print(f"   • {len(real_data['sports_data'].get('games_tomorrow', []))} jogos amanhã")
+        print(f"   • {len(real_data['sports_data'].get('recent_results', []))} resultados recentes")
+        print(f"   • {len(real_data['sports_data'].get('esports_today', []))} eventos de e-sports")
+        print(f"   • {len(real_data['news_data'])} notícias de {len(set(n.source for n in real_data['news_data']))} fontes")
+        
+        return result
+    
+    def _save_snapshot(self, data):
+        """Grava a execução no histórico; devolve o `saved_at` (ISO) que a identifica"""
+        saved_at = datetime.now(self.timezone)
+        try:
+            path = self.snapshots.save(data, saved_at)
+            print(f"💾 Dados da execução guardados em {path}")
+        except Exception as e:
+            print(f"Erro ao gravar snapshot: {e}")
+            return None
+        try:
+            # Rollup do dia já entra no total do mês (o resumo não relê os snapshots)
+            self.digests.refresh_month(saved_at.year, saved_at.month)
+        except Exception as e:
+            print(f"Erro ao atualizar rollups: {e}")
+        return saved_at.isoformat()
+    
+    def render_snapshot(self, day, recipient=None):
+        """HTML do relatório de um dia passado, a partir do snapshot (sem rede)"""
+        data = self.snapshots.load(day)
+        if data is None:
+            return None
+        if recipient is None:
+            return render_sports_report(data)
+        return render_sports_report(data, recipients=[recipient.overlay()])[0]
+    
+    def replay_report(self, day, recipients, run_id: str = None):
+        """Reenvia o relatório de `day` com os dados do snapshot (sem coletar nada)
+        
+        O registro de envios usa `run_id` (padrão: 'AAAA-MM-DD-reenvio'), então
+        repetir a chamada reenvia só para quem falhou.
         """
+        data = self.snapshots.load(day)
+        if data is None:
+            raise ValueError(f"Sem snapshot para {day.isoformat()}")
+        return self.send_reports(recipients, run_id=run_id or f"{day.isoformat()}-reenvio", data=data)
+    
+    def build_digest(self, period: str = 'week', today=None):
+        """Dados do resumo semanal ('week') ou mensal ('month') a partir dos rollups"""
+        today = today or datetime.now(self.timezone).date()
+        start, end = digest_period(period, today)
+        with span('digest.build', period=period):
+            rollup = self.digests.build(start, end)
+        title = 'Resumo Semanal Artplan' if period == 'week' else 'Resumo Mensal Artplan'
+        return {'title': title, 'period': f"{start.strftime('%d/%m/%Y')} a {end.strftime('%d/%m/%Y')}",
+                'rollup': rollup, 'start': start, 'end': end}
+    
+    def send_digest(self, recipients, period: str = 'week', today=None):
+        """Envia o resumo do período; reexecuções reenviam só para quem falhou"""
+        if recipients and isinstance(recipients[0], str):
+            preferences = os.environ.get('RECIPIENT_PREFERENCES') or self.config.get('RECIPIENT_PREFERENCES')
+            recipients = parse_recipients(','.join(recipients), preferences)
+        digest = self.build_digest(period, today)
+        run_id = f"{digest['end'].isoformat()}-resumo-{period}"
+        if digest['rollup'].days == 0:
+            print(f"⚠️ Sem relatórios diários entre {digest['period']}; resumo não enviado")
+            return {'sent': {}, 'failed': {}, 'skipped': [], 'empty': True}
+        
+        with span('gmail.auth'):
+            self._connect_gmail()
         
-        return html_content
+        subject = f"🗓️ {digest['title']} - {digest['period']}"
+        engine = DeliveryEngine(
+            send=lambda recipient, html: self._send_html(recipient, html, subject),
+            max_workers=int(os.environ.get('DELIVERY_WORKERS', '4')),
+            ledger=self.ledger,
+            render=render_digest
+        )
+        result = engine.deliver(digest, recipients, run_id)
+        print(f"✅ Resumo: {len(result['sent'])} enviado(s), ❌ {len(result['failed'])} falha(s), "
+              f"⏭️ {len(result['skipped'])} já enviado(s)")
+        return result
     
     def send_report(self, recipient_email: str):
         """Envia relatório com dados REAIS via Gmail"""
         try:
-            print("🔄 Iniciando coleta de dados REAIS...")
-            
-            # Coletar dados reais
-            real_data = self.collect_real_data()
-            
-            print("📧 Gerando relatório HTML...")
-            html_content = self.generate_html_report(real_data)
-            
-            print("📤 Enviando email...")
-            
-            # Criar mensagem
-            message = MIMEMultipart('alternative')
-            message['to'] = recipient_email
-            message['from'] = 'artplan.sports.report@gmail.com'
-            message['subject'] = f'🏆 Relatório Esportivo Artplan - {real_data["collection_time"]}'
-            
-            # Adicionar conteúdo HTML
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            message.attach(html_part)
-            
-            # Enviar
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-            send_message = self.service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
-            
-            message_id = send_message.get('id')
-            
-            print(f"✅ Email enviado com sucesso!")
-            print(f"📧 Destinatário: {recipient_email}")
-            print(f"🆔 Message ID: {message_id}")
-            print(f"📊 Dados coletados:")
-            print(f"   • {len(real_data['sports_data'].get('games_today', []))} jogos hoje")
-            print(f"   • {len(real_data['sports_data'].get('games_tomorrow', []))} jogos amanhã")
-            print(f"   • {len(real_data['sports_data'].get('recent_results', []))} resultados recentes")
-            print(f"   • {len(real_data['sports_data'].get('esports_today', []))} eventos de e-sports")
-            print(f"   • {len(real_data['news_data'])} notícias de {len(set(n['source'] for n in real_data['news_data']))} fontes")
-            
+            result = self.send_reports([recipient_email])
+            # Enviado agora ou antes (pulado): o registro guarda o id pelo email em minúsculas
+            entry = self.ledger.entries(result['run_id']).get(recipient_email.strip().lower()) or {}
+            message_id = entry.get('message_id') if entry.get('status') == 'sent' else None
+            if message_id:
+                print(f"📧 Destinatário: {recipient_email}")
+                print(f"🆔 Message ID: {message_id}")
             return message_id
             
         except Exception as e:
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calendário de feriados e datas comerciais, pré-carregado para vários anos
+
+Os feriados nacionais vêm do Nager.Date (em cache HTTP e com circuit
+breaker); se a API não responder, são calculados aqui (fixos + os móveis a
+partir da Páscoa). Datas comerciais (Dia das Mães, Dia dos Pais, Black
+Friday...) são sempre calculadas. Tudo fica numa lista ordenada por data,
+então "próximas datas em 30 dias" é uma busca binária, inclusive na virada
+do ano (dezembro já enxerga os feriados de janeiro).
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from http_client import get_http_client
+from models import SpecialDate
+from source_health import SourceHealth, get_source_health
+
+NAGER_URL = 'https://date.nager.at/api/v3'
+
+# Janela padrão das datas especiais do relatório
+UPCOMING_DAYS = 30
+
+# Calendário montado com dados do Nager é reaproveitado pelo processo por este tempo
+CALENDAR_TTL = 6 * 3600
+
+FIXED_HOLIDAYS = (
+    (1, 1, 'Confraternização Universal'),
+    (4, 21, 'Tiradentes'),
+    (5, 1, 'Dia do Trabalhador'),
+    (9, 7, 'Independência do Brasil'),
+    (10, 12, 'Nossa Senhora Aparecida'),
+    (11, 2, 'Finados'),
+    (11, 15, 'Proclamação da República'),
+    (11, 20, 'Dia Nacional de Zumbi e da Consciência Negra'),
+    (12, 25, 'Natal'),
+)
+
+# Feriados móveis: dias a partir do domingo de Páscoa
+EASTER_HOLIDAYS = (
+    (-48, 'Carnaval'),
+    (-47, 'Carnaval'),
+    (-2, 'Sexta-feira Santa'),
+    (0, 'Páscoa'),
+    (60, 'Corpus Christi'),
+)
+
+
+class CalendarEntry(NamedTuple):
+    day: date
+    name: str
+    # Impacto fixo (datas comerciais); feriados usam a distância até a data
+    impact: Optional[str] = None
+
+
+def easter(year: int) -> date:
+    """Domingo de Páscoa no calendário gregoriano (algoritmo de Meeus/Jones/Butcher)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-ésimo dia da semana do mês (segunda=0): 2º domingo de maio = nth_weekday(ano, 5, 6, 2)"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def computed_holidays(year: int) -> List[CalendarEntry]:
+    """Feriados nacionais calculados (usados quando o Nager.Date não responde)"""
+    holidays = [CalendarEntry(date(year, month, day), name) for month, day, name in FIXED_HOLIDAYS]
+    sunday = easter(year)
+    holidays.extend(CalendarEntry(sunday + timedelta(days=offset), name) for offset, name in EASTER_HOLIDAYS)
+    return holidays
+
+
+def commercial_dates(year: int) -> List[CalendarEntry]:
+    """Datas comerciais do varejo brasileiro"""
+    thanksgiving = nth_weekday(year, 11, 3, 4)
+    return [
+        CalendarEntry(date(year, 3, 15), 'Dia do Consumidor', 'Promoções e e-commerce'),
+        CalendarEntry(nth_weekday(year, 5, 6, 2), 'Dia das Mães', 'Campanhas familiares'),
+        CalendarEntry(date(year, 6, 12), 'Dia dos Namorados', 'Campanhas de presentes'),
+        CalendarEntry(nth_weekday(year, 8, 6, 2), 'Dia dos Pais', 'Campanhas familiares'),
+        CalendarEntry(date(year, 10, 12), 'Dia das Crianças', 'Campanhas de brinquedos e games'),
+        CalendarEntry(thanksgiving + timedelta(days=1), 'Black Friday', 'Pico de vendas'),
+        CalendarEntry(thanksgiving + timedelta(days=4), 'Cyber Monday', 'Pico de vendas online'),
+        CalendarEntry(date(year, 12, 31), 'Réveillon', 'Resoluções esportivas'),
+    ]
+
+
+def _impact(entry: CalendarEntry, days_until: int) -> str:
+    if entry.impact:
+        return entry.impact
+    return 'Alto tráfego esperado' if days_until <= 3 else 'Monitorar campanhas'
+
+
+class HolidayCalendar:
+    """Datas especiais de `first_year` a `last_year`, ordenadas para busca binária"""
+
+    def __init__(self, first_year: int, last_year: int, entries: Iterable[CalendarEntry], from_api: bool = True):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.from_api = from_api
+        self.loaded_at = time.time()
+        self._entries = sorted(entries, key=lambda entry: entry.day)
+        self._days = [entry.day for entry in self._entries]
+
+    @classmethod
+    def load(cls, first_year: int, last_year: int,
+             fetch_year: Callable[[int], Optional[List[CalendarEntry]]]) -> 'HolidayCalendar':
+        """Feriados de cada ano via `fetch_year` (None = calcular) mais as datas comerciais"""
+        entries = []
+        from_api = True
+        for year in range(first_year, last_year + 1):
+            holidays = fetch_year(year)
+            if holidays is None:
+                from_api = False
+                holidays = computed_holidays(year)
+            entries.extend(holidays)
+            entries.extend(commercial_dates(year))
+        return cls(first_year, last_year, entries, from_api)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def covers(self, start: date, end: date) -> bool:
+        return self.first_year <= start.year and end.year <= self.last_year
+
+    def between(self, start: date, end: date) -> List[CalendarEntry]:
+        return self._entries[bisect_left(self._days, start):bisect_right(self._days, end)]
+
+    def upcoming(self, today: date, within: int = UPCOMING_DAYS, limit: int = 3) -> List[SpecialDate]:
+        """Até `limit` datas de hoje até `within` dias à frente"""
+        entries = self.between(today, today + timedelta(days=within))[:limit]
+        return [self._special_date(entry, today) for entry in entries]
+
+    def next_dates(self, today: date, limit: int = 1) -> List[SpecialDate]:
+        """Próximas datas a partir de hoje, sem limite de distância (dentro dos anos carregados)"""
+        start = bisect_left(self._days, today)
+        return [self._special_date(entry, today) for entry in self._entries[start:start + limit]]
+
+    @staticmethod
+    def _special_date(entry: CalendarEntry, today: date) -> SpecialDate:
+        days_until = (entry.day - today).days
+        return SpecialDate(day=entry.day, name=entry.name, impact=_impact(entry, days_until),
+                           days_until=days_until)
+
+
+class NagerHolidays:
+    """Feriados de um ano pelo Nager.Date (None se a API e o último resultado bom falharem)"""
+
+    def __init__(self, http=None, health: Optional[SourceHealth] = None, country: str = 'BR'):
+        self.http = http or get_http_client()
+        self.health = health or get_source_health()
+        self.country = country
+
+    def __call__(self, year: int) -> Optional[List[CalendarEntry]]:
+        def fetch_holidays():
+            url = f"{os.environ.get('NAGER_URL', NAGER_URL)}/PublicHolidays/{year}/{self.country}"
+
+            # Lista de feriados do ano muda raramente: revalidar no máximo 1x por semana
+            response = self.http.get_cached(url, default_max_age=7 * 24 * 3600, timeout=10)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            return response.json()
+
+        # Um circuito por ano: cada um guarda o seu último resultado bom
+        holidays = self.health.call(f"nager.{year}", fetch_holidays, key=str(year))
+        if not holidays:
+            return None
+        try:
+            return [CalendarEntry(date.fromisoformat(holiday['date']),
+                                  holiday.get('localName') or holiday['name'])
+                    for holiday in holidays]
+        except Exception as e:
+            print(f"Erro ao ler feriados de {year}: {e}")
+            return None
+
+
+_calendar: Optional[HolidayCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_holiday_calendar(today: date, years: int = 2,
+                         fetch_year: Optional[Callable[[int], Optional[List[CalendarEntry]]]] = None,
+                         ttl: float = CALENDAR_TTL) -> HolidayCalendar:
+    """Calendário do processo cobrindo `years` anos a partir de hoje
+
+    Só calendários montados com dados do Nager ficam guardados; um calendário
+    calculado (API fora) é refeito na próxima chamada, que tenta a API de novo.
+    """
+    global _calendar
+    with _calendar_lock:
+        calendar = _calendar
+        if (calendar is not None and calendar.covers(today, today + timedelta(days=UPCOMING_DAYS))
+                and time.time() - calendar.loaded_at < ttl):
+            return calendar
+        last_year = max(today.year + years - 1, (today + timedelta(days=UPCOMING_DAYS)).year)
+        calendar = HolidayCalendar.load(today.year, last_year, fetch_year or NagerHolidays())
+        _calendar = calendar if calendar.from_api else None
+        return calendar
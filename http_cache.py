@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP persistente com GET condicional (ETag / Last-Modified / Cache-Control)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'http')
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.IGNORECASE)
+
+
+class DiskCacheBackend:
+    """Backend em disco local (use /tmp dentro da Cloud Function)"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        # Escrita atômica: nunca deixar meia entrada para outra instância ler
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [name for name in names if not name.startswith('.tmp-')]
+
+
+class ObjectStoreCacheBackend:
+    """Backend sobre um bucket compatível com o Google Cloud Storage
+
+    Aceita qualquer objeto com a interface de `google.cloud.storage.Bucket`
+    (`blob(name)` → `exists()`, `download_as_bytes()`, `upload_from_string()`, `delete()`),
+    inclusive o `LocalBucket` abaixo, usado como substituto local.
+    """
+
+    def __init__(self, bucket: Any, prefix: str = 'http-cache/'):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        blob = self.bucket.blob(self.prefix + key)
+        if not blob.exists():
+            return None
+        return blob.download_as_bytes()
+
+    def put(self, key: str, data: bytes):
+        self.bucket.blob(self.prefix + key).upload_from_string(data)
+
+    def delete(self, key: str):
+        blob = self.bucket.blob(self.prefix + key)
+        if blob.exists():
+            blob.delete()
+
+    def keys(self) -> List[str]:
+        return [blob.name[len(self.prefix):] for blob in self.bucket.list_blobs(prefix=self.prefix)]
+
+
+class LocalBlob:
+    """Blob local com a mesma interface do google.cloud.storage.Blob"""
+
+    def __init__(self, path: str, name: str = ''):
+        self.path = path
+        self.name = name or os.path.basename(path)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def download_as_bytes(self) -> bytes:
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def upload_from_string(self, data: bytes):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'wb') as file:
+            file.write(data)
+
+    def delete(self):
+        os.remove(self.path)
+
+
+class LocalBucket:
+    """Substituto local de um bucket GCS (testes e desenvolvimento)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(os.path.join(self.directory, name), name)
+
+    def list_blobs(self, prefix: str = '') -> List[LocalBlob]:
+        """Blobs cujo nome começa com `prefix` (nomes com '/' como no GCS)"""
+        blobs = []
+        for folder, _, files in os.walk(self.directory):
+            for file_name in files:
+                name = os.path.relpath(os.path.join(folder, file_name), self.directory).replace(os.sep, '/')
+                if name.startswith(prefix):
+                    blobs.append(LocalBlob(os.path.join(folder, file_name), name))
+        return sorted(blobs, key=lambda blob: blob.name)
+
+
+class CachedResponse:
+    """Resposta HTTP servida pelo cache ou pela rede"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 from_cache: bool = False, revalidated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class HTTPCache:
+    """Cache de respostas por URL com revalidação condicional"""
+
+    def __init__(self, backend: Any = None):
+        self.backend = backend or DiskCacheBackend()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _parse_cache_control(value: str, default_max_age: int):
+        """Retorna (armazenar?, max_age) a partir do header Cache-Control"""
+        value = (value or '').lower()
+        if 'no-store' in value:
+            return False, 0
+        if 'no-cache' in value:
+            return True, 0
+        match = _MAX_AGE_RE.search(value)
+        if match:
+            return True, int(match.group(1))
+        return True, default_max_age
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        raw = self.backend.get(self._key(url))
+        if raw is None:
+            return None
+        try:
+            header, _, body = raw.partition(b'\n')
+            entry = json.loads(header)
+            entry['body'] = body
+            return entry
+        except ValueError:
+            return None
+
+    def _store(self, url: str, entry: Dict[str, Any]):
+        meta = {k: v for k, v in entry.items() if k != 'body'}
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n' + entry['body']
+        self.backend.put(self._key(url), data)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def fetch(self, client: Any, url: str, default_max_age: int = 0, **kwargs: Any) -> CachedResponse:
+        """Busca a URL usando o cache; só baixa o corpo de novo quando ele mudou
+
+        `client` é qualquer objeto com `get(url, **kwargs)` que retorne uma resposta
+        no formato do requests (status_code, headers, content).
+        """
+        entry = self._load(url)
+        now = time.time()
+
+        if entry and now < entry['stored_at'] + entry['max_age']:
+            self._count('hits')
+            return CachedResponse(url, 200, entry['body'], entry['headers'], from_cache=True)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if entry['headers'].get('ETag'):
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = client.get(url, headers=headers, **kwargs)
+        should_store, max_age = self._parse_cache_control(
+            response.headers.get('Cache-Control', ''), default_max_age)
+
+        if response.status_code == 304 and entry:
+            # Corpo inalterado: renovar apenas os metadados
+            self._count('revalidations')
+            for name in ('ETag', 'Last-Modified'):
+                if response.headers.get(name):
+                    entry['headers'][name] = response.headers[name]
+            entry['stored_at'] = now
+            entry['max_age'] = max_age
+            self._store(url, entry)
+            return CachedResponse(url, 200, entry['body'], entry['headers'],
+                                  from_cache=True, revalidated=True)
+
+        self._count('misses')
+        kept_headers = {name: response.headers[name]
+                        for name in ('ETag', 'Last-Modified', 'Content-Type')
+                        if response.headers.get(name)}
+
+        if response.status_code == 200 and should_store:
+            self._store(url, {
+                'url': url,
+                'stored_at': now,
+                'max_age': max_age,
+                'headers': kept_headers,
+                'body': response.content
+            })
+
+        return CachedResponse(url, response.status_code, response.content, kept_headers)
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def _backend_from_env():
+    """Escolhe o backend via HTTP_CACHE_BACKEND = disk | tmp | gcs"""
+    kind = os.environ.get('HTTP_CACHE_BACKEND', 'tmp').lower()
+
+    if kind == 'gcs':
+        bucket_name = os.environ.get('HTTP_CACHE_BUCKET')
+        try:
+            from google.cloud import storage
+            return ObjectStoreCacheBackend(storage.Client().bucket(bucket_name))
+        except Exception as e:
+            print(f"⚠️ Cache GCS indisponível ({e}), usando /tmp")
+    elif kind == 'disk':
+        return DiskCacheBackend(os.environ.get('HTTP_CACHE_DIR', os.path.join('.cache', 'http')))
+
+    return DiskCacheBackend(os.environ.get('HTTP_CACHE_DIR', DEFAULT_CACHE_DIR))
+
+
+def get_http_cache() -> HTTPCache:
+    """Retorna o cache HTTP do processo (criado sob demanda)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HTTPCache(_backend_from_env())
+    return _cache
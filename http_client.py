@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cliente HTTP compartilhado por todos os coletores (pool keep-alive + retry com jitter)
+"""
+
+import os
+import random
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import CachedResponse, HTTPCache, get_http_cache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """Retry do urllib3 com backoff exponencial + jitter aleatório"""
+
+    _rng = random.Random()
+
+    def __init__(self, *args, jitter: float = 0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0 or self.jitter <= 0:
+            return backoff
+        # Espalhar as novas tentativas para não bater no host todas juntas
+        return backoff + self._rng.uniform(0, backoff * self.jitter)
+
+
+class HTTPClient:
+    """Sessão HTTP com pool de conexões por host, reaproveitada entre requisições"""
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, retries: int = 3,
+                 backoff_factor: float = 0.5, jitter: float = 0.5, timeout: float = 10.0,
+                 headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+        retry = JitteredRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            jitter=jitter
+        )
+        # pool_connections = nº de hosts mantidos em cache,
+        # pool_maxsize = conexões keep-alive simultâneas por host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=retry, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """GET com timeout padrão; o corpo é lido por completo para devolver a conexão ao pool"""
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.get(url, **kwargs)
+        if not kwargs.get('stream'):
+            # Consumir o corpo libera a conexão para a próxima requisição no mesmo host
+            response.content
+        return response
+
+    def get_json(self, url: str, **kwargs: Any) -> Any:
+        """GET que retorna o JSON decodificado (levanta erro em status != 2xx)"""
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def get_cached(self, url: str, default_max_age: int = 0, cache: Optional[HTTPCache] = None,
+                   **kwargs: Any) -> CachedResponse:
+        """GET condicional via cache HTTP: respostas 304 reaproveitam o corpo salvo
+
+        `default_max_age` (segundos) vale quando o servidor não envia Cache-Control.
+        """
+        return (cache or get_http_cache()).fetch(self, url, default_max_age=default_max_age, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def get_http_client() -> HTTPClient:
+    """Retorna o cliente HTTP compartilhado do processo (criado sob demanda)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient(
+                    pool_connections=_env_int('HTTP_POOL_CONNECTIONS', 10),
+                    pool_maxsize=_env_int('HTTP_POOL_MAXSIZE', 10),
+                    retries=_env_int('HTTP_RETRIES', 3),
+                    backoff_factor=_env_float('HTTP_BACKOFF_FACTOR', 0.5),
+                    jitter=_env_float('HTTP_BACKOFF_JITTER', 0.5),
+                    timeout=_env_float('HTTP_TIMEOUT', 10.0)
+                )
+    return _client
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Imports sob demanda para dependências pesadas (clientes Google, YAML, Gemini)
+
+Uso:
+    discovery = lazy_import('googleapiclient.discovery')
+    ...
+    discovery.build(...)   # o módulo só é importado aqui, no primeiro uso
+"""
+
+import importlib
+import os
+import sys
+import threading
+
+
+class LazyModule:
+    """Procurador de módulo: importa no primeiro acesso a atributo"""
+
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'carregado' if self.loaded else 'pendente'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def running_in_cloud() -> bool:
+    """Dentro da Cloud Function / Cloud Run (variáveis definidas pelo runtime)"""
+    return bool(os.environ.get('K_SERVICE') or os.environ.get('FUNCTION_TARGET'))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache das respostas do Gemini endereçado pelo conteúdo do prompt
+
+Mesma combinação de modelo + versão do template + contexto normalizado
+reaproveita a resposta anterior (execução repetida, teste seguido do envio
+real) em vez de pagar e esperar uma nova chamada.
+
+`max_entries` limita a memória; no backend, uma varredura periódica (disparada
+pelo `put`) apaga as entradas vencidas e mantém no máximo `max_stored`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from http_cache import DiskCacheBackend, ObjectStoreCacheBackend
+
+DEFAULT_LLM_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'llm')
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_STORED = 2048
+DEFAULT_SWEEP_INTERVAL = 600
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_context(text: str) -> str:
+    """Espaços e indentação não mudam a pergunta: não podem mudar a chave"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def prompt_fingerprint(model: str, template_version: str, context: str) -> str:
+    payload = json.dumps([model, template_version, normalize_context(context)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """LRU em memória na frente de um backend persistente (disco ou bucket), com TTL"""
+
+    def __init__(self, backend: Any = None, ttl: float = DEFAULT_TTL, max_entries: int = 256,
+                 max_stored: int = DEFAULT_MAX_STORED, sweep_interval: float = DEFAULT_SWEEP_INTERVAL):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_stored = max_stored
+        self.sweep_interval = sweep_interval
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, expires_at: float, text: str):
+        with self._lock:
+            self._memory[key] = (expires_at, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+        if self.backend is None:
+            return None
+        try:
+            raw = self.backend.get(key)
+            if raw is None:
+                return None
+            stored = json.loads(raw)
+        except Exception as e:
+            print(f"Erro ao ler cache de IA: {e}")
+            return None
+
+        if stored['expires_at'] <= now:
+            self.backend.delete(key)
+            return None
+        self._remember(key, stored['expires_at'], stored['text'])
+        return stored['text']
+
+    def put(self, key: str, text: str, model: str = '', template_version: str = ''):
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, text)
+        if self.backend is None:
+            return
+        data = {'model': model, 'template': template_version, 'expires_at': expires_at, 'text': text}
+        try:
+            self.backend.put(key, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            print(f"Erro ao gravar cache de IA: {e}")
+        self._maybe_sweep()
+
+    def _maybe_sweep(self):
+        now = time.time()
+        with self._lock:
+            # Uma varredura por intervalo (e nunca duas ao mesmo tempo)
+            if now < self._next_sweep or not hasattr(self.backend, 'keys'):
+                return
+            self._next_sweep = now + self.sweep_interval
+        try:
+            self.sweep(now)
+        except Exception as e:
+            print(f"Erro ao limpar cache de IA: {e}")
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Apaga do backend as entradas vencidas e, acima de `max_stored`, as que vencem primeiro"""
+        now = now or time.time()
+        alive = []
+        removed = 0
+        for key in self.backend.keys():
+            try:
+                raw = self.backend.get(key)
+                if raw is None:
+                    continue
+                expires_at = json.loads(raw)['expires_at']
+            except Exception:
+                expires_at = 0  # entrada ilegível: não serve para nada
+            if expires_at <= now:
+                self.backend.delete(key)
+                removed += 1
+            else:
+                alive.append((expires_at, key))
+
+        alive.sort()
+        for _, key in alive[:max(0, len(alive) - self.max_stored)]:
+            self.backend.delete(key)
+            removed += 1
+        return removed
+
+    def get_or_generate(self, model: str, template_version: str, context: str,
+                        generate: Callable[[], Optional[str]]) -> Optional[str]:
+        """Resposta em cache ou `generate()`; respostas vazias não são guardadas"""
+        key = prompt_fingerprint(model, template_version, context)
+        text = self.get(key)
+        with self._lock:
+            if text is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if text is not None:
+            return text
+
+        text = generate()
+        if text:
+            self.put(key, text, model, template_version)
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'memory_entries': len(self._memory)}
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def _backend_from_env():
+    """Escolhe o backend via LLM_CACHE_BACKEND = tmp | disk | gcs | memory"""
+    kind = os.environ.get('LLM_CACHE_BACKEND', 'tmp').lower()
+
+    if kind == 'memory':
+        return None
+    if kind == 'gcs':
+        bucket_name = os.environ.get('LLM_CACHE_BUCKET') or os.environ.get('HTTP_CACHE_BUCKET')
+        try:
+            from google.cloud import storage
+            return ObjectStoreCacheBackend(storage.Client().bucket(bucket_name), prefix='llm-cache/')
+        except Exception as e:
+            print(f"⚠️ Cache GCS indisponível ({e}), usando /tmp")
+    elif kind == 'disk':
+        return DiskCacheBackend(os.environ.get('LLM_CACHE_DIR', os.path.join('.cache', 'llm')))
+
+    return DiskCacheBackend(os.environ.get('LLM_CACHE_DIR', DEFAULT_LLM_CACHE_DIR))
+
+
+def get_llm_cache() -> LLMCache:
+    """Retorna o cache de IA do processo (criado sob demanda)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache(
+                    _backend_from_env(),
+                    ttl=float(os.environ.get('LLM_CACHE_TTL', DEFAULT_TTL)),
+                    max_entries=int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '256')),
+                    max_stored=int(os.environ.get('LLM_CACHE_MAX_STORED', DEFAULT_MAX_STORED))
+                )
+    return _cache
@@ -1,34 +1,126 @@
 import functions_framework
 import os
-from gmail_api_reporter import GmailAPISportsReport
+import threading
+from datetime import datetime
+import pytz
+from gmail_api_reporter import GmailAPISportsReportREAL
+from delivery import parse_recipients
+from digest import DIGEST_PERIODS
+from tracing import parse_trace_header, span, start_trace
+
+# Criado na primeira requisição e reaproveitado enquanto a instância estiver quente
+# (cliente Gmail, sessões HTTP, templates compilados e coletores)
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def get_reporter():
+    global _reporter
+    if _reporter is None:
+        with _reporter_lock:
+            if _reporter is None:
+                with span('reporter.init'):
+                    _reporter = GmailAPISportsReportREAL()
+    return _reporter
 
 @functions_framework.http
 def daily_sports_report(request):
-    """Entry point para Cloud Function - Relatório Esportivo Artplan via Gmail API"""
+    """Entry point para Cloud Function - Relatório Esportivo Artplan via Gmail API
+    
+    A resposta inclui `timings`: tempo total e por etapa (coletores, IA,
+    renderização, envios) desta invocação; desligue com TRACING=0.
+    """
+    headers = getattr(request, 'headers', None) or {}
+    with start_trace('daily_sports_report', parse_trace_header(headers.get('X-Cloud-Trace-Context'))) as trace:
+        body, status = _daily_sports_report()
+    timings = trace.summary()
+    if timings:
+        body['timings'] = timings
+    return body, status
+
+
+def _recipients(reporter):
+    # RECIPIENTS: lista separada por vírgula; RECIPIENT_PREFERENCES: JSON com nome,
+    # times favoritos e seções descartadas por email
+    preferences = os.environ.get('RECIPIENT_PREFERENCES') or reporter.config.get('RECIPIENT_PREFERENCES')
+    return parse_recipients(os.environ.get('RECIPIENTS', 'caio.castro@artplan.com.br'), preferences)
+
+
+def _daily_sports_report():
     try:
-        # Configurações para Gmail API
-        config = {
-            'recipients': os.environ.get('RECIPIENTS', 'caio.castro@artplan.com.br').split(',')
-        }
+        reporter = get_reporter()
+        recipients = _recipients(reporter)
         
-        print(f"🚀 Iniciando relatório esportivo via Gmail API")
+        print(f"🚀 Iniciando relatório esportivo via Gmail API para {len(recipients)} destinatário(s)")
         
-        reporter = GmailAPISportsReport(config)
-        report = reporter.generate_report()
-        success = reporter.send_email(report)
+        result = reporter.send_reports(recipients)
+        response = {
+            "timestamp": datetime.now(pytz.timezone('America/Sao_Paulo')).isoformat(),
+            "sent_to": sorted(result['sent']),
+            "already_sent": result['skipped'],
+            "failed": result['failed'],
+            "method": "Gmail API"
+        }
         
-        if success:
+        if not result['failed']:
             print("✅ Relatório enviado com sucesso via Gmail API!")
-            return {
-                "status": "success", 
-                "timestamp": reporter.today.isoformat(), 
-                "sent_to": config['recipients'],
-                "method": "Gmail API"
-            }, 200
+            return {"status": "success", **response}, 200
+        elif result['sent'] or result['skipped']:
+            # Nova chamada reenvia apenas para quem falhou
+            print("⚠️ Relatório enviado parcialmente")
+            return {"status": "partial", **response}, 207
         else:
             print("❌ Falha no envio do relatório")
-            return {"status": "error", "message": "Falha no envio do email"}, 500
+            return {"status": "error", "message": "Falha no envio do email", **response}, 500
+        
+    except Exception as e:
+        print(f"❌ Erro: {str(e)}")
+        return {"status": "error", "message": str(e)}, 500 
+
+
+@functions_framework.http
+def weekly_sports_digest(request):
+    """Entry point para Cloud Function - Resumo semanal (ou mensal) a partir do histórico
+    
+    `?period=week` (padrão): os 7 dias até ontem; `?period=month`: o mês
+    anterior. Usa os rollups dos relatórios diários, sem coletar nada.
+    """
+    args = getattr(request, 'args', None) or {}
+    headers = getattr(request, 'headers', None) or {}
+    period = args.get('period', 'week')
+    if period not in DIGEST_PERIODS:
+        return {"status": "error", "message": f"period deve ser {' ou '.join(DIGEST_PERIODS)}"}, 400
+    with start_trace('weekly_sports_digest', parse_trace_header(headers.get('X-Cloud-Trace-Context'))) as trace:
+        body, status = _sports_digest(period)
+    timings = trace.summary()
+    if timings:
+        body['timings'] = timings
+    return body, status
+
+
+def _sports_digest(period):
+    try:
+        reporter = get_reporter()
+        recipients = _recipients(reporter)
+        print(f"🗓️ Iniciando resumo ({period}) para {len(recipients)} destinatário(s)")
+        
+        result = reporter.send_digest(recipients, period)
+        response = {
+            "timestamp": datetime.now(pytz.timezone('America/Sao_Paulo')).isoformat(),
+            "period": period,
+            "sent_to": sorted(result['sent']),
+            "already_sent": result['skipped'],
+            "failed": result['failed']
+        }
+        
+        if result.get('empty'):
+            return {"status": "empty", "message": "Sem relatórios diários no período", **response}, 200
+        if not result['failed']:
+            return {"status": "success", **response}, 200
+        elif result['sent'] or result['skipped']:
+            return {"status": "partial", **response}, 207
+        return {"status": "error", "message": "Falha no envio do email", **response}, 500
         
     except Exception as e:
         print(f"❌ Erro: {str(e)}")
-        return {"status": "error", "message": str(e)}, 500 
\ No newline at end of file
+        return {"status": "error", "message": str(e)}, 500
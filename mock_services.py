@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviços locais que imitam as APIs externas do relatório (para testes e benchmarks)
+
+Um único servidor HTTP em 127.0.0.1 responde por TheSportsDB,
+football-data.org, Nager.Date, os feeds RSS e o envio do Gmail, cada um com latência e taxa de falha
+configuráveis. O Gemini é substituído por FakeGeminiModel, que responde em
+streaming no formato JSON das oportunidades.
+
+Uso:
+    with MockServices(latency=0.02, failure_rate=0.1) as services:
+        os.environ.update(services.env())
+        main._reporter = GmailAPISportsReportREAL(gmail_client=services.gmail_client())
+        ...  # main.daily_sports_report, DailySportsReport, RealNewsScraper
+"""
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from email import message_from_bytes, policy
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from models import DEFAULT_TIMEZONE
+
+SERVICES = ('thesportsdb', 'footballdata', 'nager', 'rss', 'gmail')
+
+TEAMS = ('Flamengo', 'Vasco', 'Palmeiras', 'Corinthians', 'São Paulo', 'Santos', 'Grêmio',
+         'Internacional', 'Atlético-MG', 'Cruzeiro', 'Bahia', 'Vitória')
+HEADLINES = ('vence clássico e assume a liderança', 'anuncia reforço para o meio-campo',
+             'renova contrato do capitão até 2027', 'tem desfalques para a próxima rodada',
+             'divulga preços dos ingressos da final', 'apresenta novo uniforme', 'demite treinador após derrota')
+LEAGUES = ('Brazilian Serie A', 'Copa Libertadores', 'Copa do Brasil', 'English Premier League')
+# Ids de liga do TheSportsDB aceitos em eventsseason.php
+THESPORTSDB_LEAGUE_IDS = {'4351': 'Brazilian Serie A', '4501': 'Copa Libertadores'}
+# Competições que o football-data.org falso cobre (nomes no formato dele)
+FOOTBALL_DATA_COMPETITIONS = {'Brazilian Serie A': 'Campeonato Brasileiro Série A',
+                              'Copa Libertadores': 'Copa Libertadores'}
+
+
+class FaultProfile:
+    """Latência (segundos, com variação) e falhas injetadas em um serviço"""
+
+    __slots__ = ('latency', 'jitter', 'failure_rate', 'status')
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 status: int = 503):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.status = status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: '_Server'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes, content_type: str = 'application/json',
+               headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str):
+        url = urlparse(self.path)
+        service = url.path.strip('/').split('/', 1)[0]
+        body = b''
+        if method == 'POST':
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        mocks = self.server.mocks
+        if service not in SERVICES:
+            self._reply(404, b'{"error": "not found"}')
+            return
+        if not mocks._before_request(service):
+            self._reply(mocks.profiles[service].status, b'{"error": "falha injetada"}')
+            return
+
+        try:
+            status, payload, content_type, headers = mocks._route(service, method, url, body, self.headers)
+        except Exception as e:
+            self._reply(500, json.dumps({'error': str(e)}).encode('utf-8'))
+            return
+        self._reply(status, payload, content_type, headers)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mocks: 'MockServices'
+
+
+class MockServices:
+    """Servidor local com TheSportsDB, football-data.org, Nager.Date, feeds RSS e Gmail falsos"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 events_per_day: int = 10, news_per_feed: int = 10, seed: int = 0):
+        self.profiles = {service: FaultProfile(latency, jitter, failure_rate) for service in SERVICES}
+        self.events_per_day = events_per_day
+        self.news_per_feed = news_per_feed
+        self.requests = {service: 0 for service in SERVICES}
+        self.failures = {service: 0 for service in SERVICES}
+        self.sent_messages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now(DEFAULT_TIMEZONE).replace(microsecond=0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- ciclo de vida ------------------------------------------------------
+
+    def start(self) -> 'MockServices':
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.mocks = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-services', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockServices':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Variáveis de ambiente que apontam o código de produção para os serviços locais"""
+        return {
+            'THESPORTSDB_URL': f"{self.base_url}/thesportsdb",
+            'FOOTBALL_DATA_URL': f"{self.base_url}/footballdata",
+            'FOOTBALL_API_KEY': 'mock',
+            'NAGER_URL': f"{self.base_url}/nager",
+            'NEWS_FEEDS_URL': f"{self.base_url}/rss",
+        }
+
+    def gmail_client(self):
+        """(credenciais, serviço) do Gmail apontando para este servidor, sem OAuth
+
+        Uso: GmailAPISportsReportREAL(gmail_client=services.gmail_client())
+        """
+        from google.auth.credentials import AnonymousCredentials
+        from googleapiclient import discovery
+
+        creds = AnonymousCredentials()
+        service = discovery.build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True,
+                                  client_options={'api_endpoint': f"{self.base_url}/gmail/"})
+        return creds, service
+
+    def configure(self, service: str, **values):
+        """Ex.: configure('gmail', failure_rate=1.0) ou configure('rss', latency=0.5)"""
+        profile = self.profiles[service]
+        for name, value in values.items():
+            setattr(profile, name, value)
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = {service: 0 for service in SERVICES}
+            self.failures = {service: 0 for service in SERVICES}
+            self.sent_messages = []
+
+    # -- requisições --------------------------------------------------------
+
+    def _before_request(self, service: str) -> bool:
+        """Aplica a latência e decide a falha; False = responder com erro"""
+        profile = self.profiles[service]
+        with self._lock:
+            self.requests[service] += 1
+            delay = profile.latency + (self._random.uniform(0, profile.jitter) if profile.jitter else 0.0)
+            fail = profile.failure_rate > 0 and self._random.random() < profile.failure_rate
+            if fail:
+                self.failures[service] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return not fail
+
+    def _route(self, service: str, method: str, url, body: bytes, headers):
+        if service == 'thesportsdb':
+            query = parse_qs(url.query)
+            if url.path.endswith('/eventsseason.php'):
+                events = self._season(query['id'][0], int(query['s'][0]))
+                return 200, json.dumps({'events': events}).encode('utf-8'), 'application/json', None
+            day = query.get('d', [self.started_at.strftime('%Y-%m-%d')])[0]
+            return 200, json.dumps({'events': self._events(day)}).encode('utf-8'), 'application/json', None
+
+        if service == 'footballdata':
+            query = parse_qs(url.query)
+            start = datetime.strptime(query['dateFrom'][0], '%Y-%m-%d').date()
+            end = datetime.strptime(query['dateTo'][0], '%Y-%m-%d').date()
+            days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+            matches = [match for day in days for match in self._football_data_matches(day.isoformat())]
+            return 200, json.dumps({'matches': matches}).encode('utf-8'), 'application/json', None
+
+        if service == 'nager':
+            year = int(url.path.rstrip('/').split('/')[-2])
+            return 200, json.dumps(self._holidays(year)).encode('utf-8'), 'application/json', None
+
+        if service == 'rss':
+            payload = self._feed(url.path.rstrip('/').rsplit('/', 1)[-1])
+            etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+            if headers.get('If-None-Match') == etag:
+                return 304, b'', 'application/rss+xml', {'ETag': etag}
+            return 200, payload, 'application/rss+xml', {'ETag': etag, 'Cache-Control': 'max-age=0'}
+
+        if service == 'gmail' and method == 'POST' and url.path.endswith('/messages/send'):
+            return 200, json.dumps(self._send(body)).encode('utf-8'), 'application/json', None
+
+        return 404, b'{"error": "not found"}', 'application/json', None
+
+    # -- conteúdo -----------------------------------------------------------
+
+    def _events(self, day: str) -> List[Dict[str, Any]]:
+        events = []
+        for i in range(self.events_per_day):
+            home, away = TEAMS[i % len(TEAMS)], TEAMS[(i + 1 + i // len(TEAMS)) % len(TEAMS)]
+            events.append({
+                'strHomeTeam': home,
+                'strAwayTeam': away,
+                'strLeague': LEAGUES[i % len(LEAGUES)],
+                'strTimestamp': f"{day}T{12 + i % 10:02d}:00:00",
+                'strVenue': f"Estádio do {home}",
+                'strCountry': 'Brazil',
+            })
+        return events
+
+    def _season(self, league_id: str, year: int) -> List[Dict[str, Any]]:
+        """Temporada da liga: os jogos dela de uma semana antes a duas depois do início do servidor"""
+        league = THESPORTSDB_LEAGUE_IDS.get(league_id)
+        events = []
+        for offset in range(-7, 15):
+            day = self.started_at.date() + timedelta(days=offset)
+            if day.year != year:
+                continue
+            for event in self._events(day.isoformat()):
+                if event['strLeague'] != league:
+                    continue
+                if offset < 0:
+                    event = dict(event, intHomeScore='2', intAwayScore='1')
+                events.append(event)
+        return events
+
+    def _football_data_matches(self, day: str) -> List[Dict[str, Any]]:
+        """Os mesmos jogos do TheSportsDB (só as competições cobertas), com nomes oficiais e status"""
+        matches = []
+        for event in self._events(day):
+            competition = FOOTBALL_DATA_COMPETITIONS.get(event['strLeague'])
+            if not competition:
+                continue
+            matches.append({
+                'utcDate': event['strTimestamp'] + 'Z',
+                'status': 'TIMED',
+                'competition': {'name': competition},
+                'area': {'name': 'Brazil'},
+                'homeTeam': {'name': f"{event['strHomeTeam']} FC", 'shortName': event['strHomeTeam']},
+                'awayTeam': {'name': f"{event['strAwayTeam']} FC", 'shortName': event['strAwayTeam']},
+                'score': {'fullTime': {'home': None, 'away': None}},
+            })
+        return matches
+
+    def _holidays(self, year: int) -> List[Dict[str, Any]]:
+        base = self.started_at.date()
+        holidays = [{'date': f"{year}-01-01", 'localName': 'Confraternização Universal',
+                     'name': "New Year's Day", 'countryCode': 'BR'}]
+        # Sempre há feriados nos próximos dias, para exercitar a janela de 30 dias
+        for offset in (2, 12, 25):
+            day = base + timedelta(days=offset)
+            if day.year == year:
+                holidays.append({'date': day.isoformat(), 'localName': f'Feriado {offset}',
+                                 'name': f'Holiday {offset}', 'countryCode': 'BR'})
+        return holidays
+
+    def _feed(self, key: str) -> bytes:
+        items = []
+        offset = sum(map(ord, key))
+        for i in range(self.news_per_feed):
+            published = self.started_at - timedelta(minutes=30 * i)
+            title = (f"{TEAMS[(offset + i) % len(TEAMS)]} {HEADLINES[(offset // 7 + 3 * i) % len(HEADLINES)]}"
+                     f" ({key} {i})")
+            items.append(
+                "<item>"
+                f"<title>{escape(title)}</title>"
+                f"<link>https://noticias.example.com/{key}/{i}</link>"
+                f"<description>{escape('Resumo da notícia ' + str(i) + ' de ' + key)}</description>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                "</item>"
+            )
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f"<title>{escape(key)}</title>" + ''.join(items) + '</channel></rss>').encode('utf-8')
+
+    def _send(self, body: bytes) -> Dict[str, Any]:
+        raw = json.loads(body or b'{}').get('raw', '')
+        message = message_from_bytes(base64.urlsafe_b64decode(raw + '=' * (-len(raw) % 4)), policy=policy.default)
+        with self._lock:
+            message_id = f"mock-{len(self.sent_messages) + 1}"
+            self.sent_messages.append({'id': message_id, 'to': message['to'], 'subject': message['subject'],
+                                       'size': len(raw)})
+        return {'id': message_id, 'threadId': message_id, 'labelIds': ['SENT']}
+
+
+class _Chunk:
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Substituto do GenerativeModel: respostas em streaming, com latência e falhas"""
+
+    def __init__(self, latency: float = 0.0, chunk_delay: float = 0.0, failure_rate: float = 0.0,
+                 chunks: int = 8, seed: int = 0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.failure_rate = failure_rate
+        self.chunks = chunks
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _response(self, prompt: str) -> str:
+        if 'TOP 10' in prompt:
+            return json.dumps([{
+                'rank': i,
+                'title': f"🏆 Oportunidade {i}: {TEAMS[i % len(TEAMS)]} em destaque",
+                'justification': 'Audiência alta e conversa nas redes',
+                'recommendation': 'Ativar mídia digital 2h antes do jogo',
+            } for i in range(1, 11)], ensure_ascii=False)
+        return ("📊 INSIGHTS DE MERCADO:\n• Horário nobre concentra a audiência\n"
+                "• Mobile lidera o consumo\n• Real-time marketing nos clássicos")
+
+    def _stream(self, text: str):
+        size = max(1, -(-len(text) // self.chunks))
+        for start in range(0, len(text), size):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield _Chunk(text[start:start + size])
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        with self._lock:
+            self.calls += 1
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("falha injetada no Gemini")
+        text = self._response(prompt)
+        return self._stream(text) if stream else _Chunk(text)
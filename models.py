@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelos tipados e compactos para jogos, notícias, datas especiais e oportunidades
+(e a leitura/formatação de audiências como '8M' usada por todos eles)
+"""
+
+import re
+import sys
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytz
+
+DEFAULT_TIMEZONE = pytz.timezone('America/Sao_Paulo')
+
+_AUDIENCE_RE = re.compile(r'(\d+(?:[.,]\d+)*)\s*([mk]|mil)?', re.IGNORECASE)
+
+
+def localize(value: datetime, timezone=DEFAULT_TIMEZONE) -> datetime:
+    """Garante datetime com fuso (datas sem fuso são consideradas horário de Brasília)"""
+    if value.tzinfo is None:
+        return timezone.localize(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> FrozenSet[str]:
+    return frozenset(field.name for field in fields(cls))
+
+
+def _known_fields(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+    # Snapshots de outras versões podem trazer campos que este modelo não tem
+    names = _field_names(cls)
+    return {key: value for key, value in data.items() if key in names}
+
+
+def parse_audience(value: Optional[str]) -> Optional[int]:
+    """'8M' -> 8000000, '15K espectadores' -> 15000, '30.000 pessoas' -> 30000"""
+    if not value:
+        return None
+    match = _AUDIENCE_RE.search(value)
+    if not match:
+        return None
+    number, suffix = match.groups()
+    suffix = (suffix or '').lower()
+    if suffix:
+        number = float(number.replace(',', '.'))
+    else:
+        # Sem sufixo, ponto e vírgula são separadores de milhar ('30.000')
+        number = float(number.replace('.', '').replace(',', ''))
+    multiplier = {'m': 1_000_000, 'k': 1_000, 'mil': 1_000}.get(suffix, 1)
+    return int(number * multiplier)
+
+
+def format_audience(audience: int) -> str:
+    if audience >= 1_000_000:
+        return f"{audience / 1_000_000:.3g}M"
+    if audience >= 1_000:
+        return f"{audience / 1_000:.3g}K"
+    return str(audience)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Nomes de times e ligas se repetem em todo o histórico: uma cópia só na memória
+    return sys.intern(value) if value else value
+
+
+@dataclass(slots=True)
+class Match:
+    """Partida de futebol ou de e-sports"""
+
+    home_team: str
+    away_team: str
+    league: str
+    kickoff: datetime
+    sport: str = 'Futebol'
+    venue: str = ''
+    status: str = 'Agendado'
+    country: str = ''
+    score: Optional[str] = None
+    tv: Optional[str] = None
+    game: Optional[str] = None
+    audience: Optional[str] = None
+    viewers: Optional[str] = None
+    attendance: Optional[str] = None
+
+    def __post_init__(self):
+        self.home_team = _intern(self.home_team)
+        self.away_team = _intern(self.away_team)
+        self.league = _intern(self.league)
+        self.sport = _intern(self.sport)
+        self.status = _intern(self.status)
+        self.country = _intern(self.country)
+        self.kickoff = localize(self.kickoff)
+
+    @property
+    def time(self) -> str:
+        return self.kickoff.strftime('%H:%M')
+
+    @property
+    def date(self) -> str:
+        return self.kickoff.strftime('%d/%m/%Y')
+
+    @property
+    def label(self) -> str:
+        """'Flamengo vs Vasco' (ou só o nome quando não há confronto)"""
+        if self.home_team and self.away_team:
+            return f"{self.home_team} vs {self.away_team}"
+        return self.home_team or self.league
+
+    @property
+    def event_name(self) -> str:
+        """'CBLOL: LOUD vs paiN Gaming' (ou só a liga, ex.: 'CBLOL Finals')"""
+        if self.home_team and self.away_team:
+            return f"{self.league}: {self.label}"
+        return self.league
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {'kickoff': self.kickoff.isoformat()}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.name != 'kickoff' and value is not None:
+                data[field.name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Match':
+        values = _known_fields(cls, data)
+        values['kickoff'] = datetime.fromisoformat(values['kickoff'])
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class Article:
+    """Notícia normalizada de qualquer fonte"""
+
+    title: str
+    link: str
+    source: str
+    category: str
+    description: str = ''
+    published: Optional[datetime] = None
+    related_sources: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        self.source = _intern(self.source)
+        self.category = _intern(self.category)
+        if self.published is not None:
+            self.published = localize(self.published)
+
+    @property
+    def date(self) -> str:
+        return self.published.strftime('%d/%m/%Y %H:%M') if self.published else ''
+
+    @property
+    def href(self) -> str:
+        """Link para o HTML: só http(s); 'javascript:' ou 'data:' vindos de um feed viram '#'"""
+        link = (self.link or '').strip()
+        return link if urlsplit(link).scheme.lower() in ('http', 'https') else '#'
+
+    def with_related(self, sources: Tuple[str, ...]) -> 'Article':
+        return replace(self, related_sources=tuple(sources))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'title': self.title,
+            'link': self.link,
+            'source': self.source,
+            'category': self.category,
+            'description': self.description
+        }
+        if self.published is not None:
+            data['published'] = self.published.isoformat()
+        if self.related_sources:
+            data['related_sources'] = list(self.related_sources)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Article':
+        values = _known_fields(cls, data)
+        if values.get('published'):
+            values['published'] = datetime.fromisoformat(values['published'])
+        values['related_sources'] = tuple(values.get('related_sources', ()))
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class SpecialDate:
+    """Feriado ou data comercial relevante para campanhas"""
+
+    day: date
+    name: str
+    impact: str
+    days_until: int = 0
+
+    @property
+    def date_label(self) -> str:
+        return self.day.strftime('%d/%m')
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'day': self.day.isoformat(), 'name': self.name,
+                'impact': self.impact, 'days_until': self.days_until}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SpecialDate':
+        values = _known_fields(cls, data)
+        values['day'] = date.fromisoformat(values['day'])
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class Opportunity:
+    """Oportunidade de mídia sugerida pela análise (IA ou fallback)"""
+
+    rank: int
+    title: str
+    justification: str = ''
+    recommendation: str = ''
+    source: str = 'ai'
+
+    @property
+    def label(self) -> str:
+        return f"{self.rank}. {self.title}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'rank': self.rank, 'title': self.title, 'justification': self.justification,
+                'recommendation': self.recommendation, 'source': self.source}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Opportunity':
+        return cls(**_known_fields(cls, data))
+
+
+def json_default(value: Any) -> Any:
+    """Uso: json.dumps(dados, default=json_default)"""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Objeto não serializável: {type(value).__name__}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seleção das notícias do relatório por pontuação, reproduzível por data e destinatário
+
+Cada notícia recebe uma nota por atualidade (meia-vida em horas), prioridade
+da fonte, times citados no título/descrição e quantas fontes deram a mesma
+história. As k melhores saem de um heap (O(n log k)); empates são decididos
+por um hash estável da semente (data, destinatário) com o link, então a mesma
+entrada gera sempre a mesma seleção, sem tocar no `random` global.
+"""
+
+import heapq
+import re
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from models import Article
+from text_utils import fold_accents
+
+# Peso de cada fonte (as de futebol primeiro); fontes fora da tabela usam DEFAULT_SOURCE_PRIORITY
+SOURCE_PRIORITY = {
+    'GloboEsporte': 1.0,
+    'ESPN Brasil': 0.9,
+    'Lance!': 0.8,
+    'UOL Esporte': 0.6,
+    'Transfermarkt Brasil': 0.5,
+    'Mais Esports': 0.5,
+}
+DEFAULT_SOURCE_PRIORITY = 0.3
+
+FRESHNESS_HALF_LIFE_HOURS = 12.0
+# Notícia sem data (dados de referência) conta como de um dia atrás
+UNDATED_FRESHNESS = 0.25
+
+FRESHNESS_WEIGHT = 2.0
+TEAM_WEIGHT = 1.5
+MAX_TEAM_MENTIONS = 2
+COVERAGE_WEIGHT = 0.25
+
+# Seções cujos times contam como relevantes para as notícias do dia
+TEAM_SECTIONS = ('games_today', 'games_tomorrow', 'recent_results')
+
+
+def team_pattern(teams: Iterable[str]) -> Optional['re.Pattern']:
+    """Regex com os nomes sem acentos (mais longos primeiro) para achar citações num texto"""
+    names = sorted({fold_accents(team) for team in teams if team}, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\b')
+
+
+def teams_in(sports_data: Dict[str, Any], sections: Sequence[str] = TEAM_SECTIONS) -> List[str]:
+    """Times dos jogos das seções, na ordem em que aparecem"""
+    teams = {}
+    for key in sections:
+        for match in sports_data.get(key, []):
+            for team in (match.home_team, match.away_team):
+                if team:
+                    teams.setdefault(team, None)
+    return list(teams)
+
+
+def selection_seed(day: Union[date, str], recipient: Optional[str] = None) -> str:
+    """'2025-03-09' ou '2025-03-09|ana@example.com' (aceita também a data já formatada)"""
+    day = day.isoformat() if isinstance(day, date) else str(day)
+    return f"{day}|{recipient.lower()}" if recipient else day
+
+
+class NewsSelector:
+    """Pontua notícias e escolhe as k melhores de forma determinística"""
+
+    def __init__(self, teams: Iterable[str] = (), source_priority: Optional[Dict[str, float]] = None,
+                 half_life_hours: float = FRESHNESS_HALF_LIFE_HOURS):
+        self.pattern = team_pattern(teams)
+        self.source_priority = SOURCE_PRIORITY if source_priority is None else source_priority
+        self.half_life_hours = half_life_hours
+
+    def team_mentions(self, article: Article) -> int:
+        if self.pattern is None:
+            return 0
+        return len(set(self.pattern.findall(fold_accents(f"{article.title} {article.description}"))))
+
+    def score(self, article: Article, now: Optional[datetime]) -> float:
+        if article.published is None or now is None:
+            freshness = UNDATED_FRESHNESS
+        else:
+            hours = max((now - article.published).total_seconds(), 0.0) / 3600
+            freshness = 0.5 ** (hours / self.half_life_hours)
+        return (FRESHNESS_WEIGHT * freshness
+                + self.source_priority.get(article.source, DEFAULT_SOURCE_PRIORITY)
+                + TEAM_WEIGHT * min(self.team_mentions(article), MAX_TEAM_MENTIONS)
+                + COVERAGE_WEIGHT * len(article.related_sources))
+
+    def select(self, articles: Iterable[Article], k: int, seed: str = '',
+               now: Optional[datetime] = None, teams_only: bool = False) -> List[Article]:
+        """As `k` notícias de maior nota, da melhor para a pior
+
+        Sem `now`, a atualidade é medida a partir da notícia mais recente da
+        lista: reenviar um relatório antigo escolhe as mesmas notícias.
+        `teams_only` deixa de fora as que não citam nenhum time.
+        """
+        articles = list(articles)
+        if now is None:
+            now = max((article.published for article in articles if article.published), default=None)
+        if teams_only:
+            articles = [article for article in articles if self.team_mentions(article)]
+        seed_hash = zlib.crc32(seed.encode('utf-8'))
+
+        def key(article: Article):
+            tiebreak = zlib.crc32((article.link or article.title).encode('utf-8'), seed_hash)
+            return round(self.score(article, now), 6), tiebreak
+
+        return heapq.nlargest(k, articles, key=key)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfil do tempo de import do pacote da função (python -X importtime)
+
+Uso:
+    python3 profile_imports.py                       # perfil de `import main`
+    python3 profile_imports.py gmail_api_reporter --top 15
+    python3 profile_imports.py --budget-ms 800       # falha (exit 1) acima do orçamento
+    python3 profile_imports.py --forbid google_auth_oauthlib --forbid google.generativeai
+
+Para CI: o código de saída é 1 quando o orçamento é estourado ou quando algum
+módulo proibido é carregado no import.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Nunca devem carregar no cold start da Cloud Function
+DEFAULT_FORBIDDEN = ('google_auth_oauthlib', 'google.generativeai')
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+class ImportEntry(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str, runs: int = 3) -> List[ImportEntry]:
+    """Entradas do import mais rápido entre `runs` processos novos"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=REPO_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise SystemExit(f"❌ Erro ao importar {module}:\n{result.stderr[-2000:]}")
+
+        entries = []
+        for line in result.stderr.splitlines():
+            match = _LINE_RE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                entries.append(ImportEntry(name, int(self_us), int(cumulative_us), len(indent) // 2))
+
+        total = _module_total(entries, module)
+        if best is None or total < _module_total(best, module):
+            best = entries
+    return best
+
+
+def _module_total(entries: List[ImportEntry], module: str) -> int:
+    for entry in entries:
+        if entry.name == module and entry.depth == 0:
+            return entry.cumulative_us
+    return sum(entry.cumulative_us for entry in entries if entry.depth == 0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Perfil do tempo de import')
+    parser.add_argument('module', nargs='?', default='main')
+    parser.add_argument('--top', type=int, default=20, help='quantos módulos listar')
+    parser.add_argument('--runs', type=int, default=3, help='processos medidos (vale o mais rápido)')
+    parser.add_argument('--budget-ms', type=float, default=None, help='orçamento do import, em ms')
+    parser.add_argument('--forbid', action='append', default=None,
+                        help='módulo que não pode ser importado (repetível)')
+    args = parser.parse_args(argv)
+
+    entries = measure(args.module, args.runs)
+    total_ms = _module_total(entries, args.module) / 1000
+    forbidden = tuple(args.forbid) if args.forbid else DEFAULT_FORBIDDEN
+
+    print(f"📦 IMPORT DE {args.module}: {total_ms:.1f} ms ({len(entries)} módulos)")
+    print("=" * 60)
+    print(f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo")
+    for entry in sorted(entries, key=lambda e: -e.cumulative_us)[:args.top]:
+        print(f"{entry.cumulative_us / 1000:>15.1f} {entry.self_us / 1000:>13.1f}  "
+              f"{'  ' * entry.depth}{entry.name}")
+
+    failed = False
+    loaded = {entry.name for entry in entries}
+    for name in forbidden:
+        hits = sorted(m for m in loaded if m == name or m.startswith(name + '.'))
+        if hits:
+            print(f"❌ Módulo proibido carregado no import: {name} ({len(hits)} módulos)")
+            failed = True
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"❌ Orçamento estourado: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+            failed = True
+        else:
+            print(f"✅ Dentro do orçamento: {total_ms:.1f} ms <= {args.budget_ms:.1f} ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
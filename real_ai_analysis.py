@@ -4,28 +4,85 @@
 Análise de IA REAL usando Gemini para relatórios esportivos
 """
 
-import os
-import google.generativeai as genai
-from typing import Dict, List, Any
 import json
+import os
+import threading
+from dataclasses import replace
+from typing import Callable, Dict, List, Any, Optional
+from datetime import datetime
+
+from lazy_imports import lazy_import
+from ai_context import ContextBuilder, estimate_tokens
+from ai_opportunities import MAX_OPPORTUNITIES, OPPORTUNITIES_SCHEMA, OpportunityParser
+from concurrent_collector import CollectionTask, ConcurrentCollector
+from llm_cache import get_llm_cache
+from models import Article, Match, Opportunity
+from tracing import span, traced
+
+# SDK do Gemini só é importado quando há chave configurada
+genai = lazy_import('google.generativeai')
+
+# Mudou o texto de um prompt? Suba a versão: respostas antigas deixam de valer
+ANALYSIS_PROMPT_VERSION = 'analysis-v3'
+INSIGHTS_PROMPT_VERSION = 'insights-v2'
+
+OPPORTUNITIES_JSON = json.dumps(OPPORTUNITIES_SCHEMA, ensure_ascii=False)
+
+# Prazo total das chamadas de IA (a Cloud Function tem 300 s no total)
+DEFAULT_AI_DEADLINE = 60.0
+
 
 class RealAIAnalysis:
     """Análise de IA real usando Gemini para dados esportivos"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, model_name: str = 'gemini-pro', cache=None,
+                 context_tokens: int = None):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.model_name = model_name
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.context_builder = ContextBuilder(context_tokens)
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
+            self.model = genai.GenerativeModel(model_name)
         else:
             self.model = None
     
-    def analyze_sports_data(self, sports_data: Dict[str, Any], news_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analisa dados esportivos e notícias usando IA"""
+    def _generate(self, template_version: str, prompt: str, on_chunk: Callable[[str], None] = None,
+                  should_stop: Callable[[], bool] = None) -> str:
+        """Chamada ao modelo (em streaming) passando pelo cache de respostas"""
+        print(f"🧮 Prompt {template_version}: ~{estimate_tokens(prompt)} tokens "
+              f"(contexto limitado a {self.context_builder.token_budget})")
+        
+        def call_model():
+            parts = []
+            with span('ai.model', template=template_version, prompt_tokens=estimate_tokens(prompt)) as current:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    if should_stop and should_stop():
+                        raise TimeoutError("prazo da IA esgotado durante a resposta")
+                    text = chunk.text or ''
+                    parts.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+                current.set(chunks=len(parts))
+            return ''.join(parts)
+        
+        # O span externo inclui a consulta ao cache; 'ai.model' só aparece sem acerto
+        with span(f"ai.{template_version}"):
+            return self.cache.get_or_generate(self.model_name, template_version, prompt, call_model)
+    
+    def analyze_sports_data(self, sports_data: Dict[str, Any], news_data: List[Article],
+                            stream: OpportunityParser = None,
+                            should_stop: Callable[[], bool] = None) -> Dict[str, Any]:
+        """Analisa dados esportivos e notícias usando IA
+        
+        Com `stream`, as oportunidades já recebidas ficam disponíveis mesmo se a
+        resposta for interrompida (ver analyze_all).
+        """
         
         if not self.model:
             return self._fallback_analysis(sports_data, news_data)
         
+        stream = stream if stream is not None else OpportunityParser()
         try:
             # Preparar dados para análise
             context = self._prepare_context(sports_data, news_data)
@@ -48,46 +105,53 @@ class RealAIAnalysis:
             4. Oportunidades de real-time marketing
             5. Insights para campanhas digitais
 
-            FORMATO: Retorne EXATAMENTE 10 oportunidades, cada uma com:
-            - Título da oportunidade
-            - Justificativa baseada nos dados
-            - Recomendação específica para ARTPLAN
+            FORMATO: Responda SOMENTE com um array JSON de EXATAMENTE 10 objetos, seguindo o schema:
+            {OPPORTUNITIES_JSON}
 
-            EXEMPLO:
-            1. 🏆 [Time A] vs [Time B] - Audiência de 8M
-               Justificativa: Clássico com alta rivalidade e audiência comprovada
-               Recomendação: Ativar campanhas 2h antes do jogo com foco em mobile
+            EXEMPLO DE ITEM:
+            {{"rank": 1, "title": "🏆 [Time A] vs [Time B] - Audiência de 8M",
+              "justification": "Clássico com alta rivalidade e audiência comprovada",
+              "recommendation": "Ativar campanhas 2h antes do jogo com foco em mobile"}}
 
             Seja específico, use os dados reais fornecidos e crie insights únicos.
             """
             
-            response = self.model.generate_content(prompt)
+            ai_text = self._generate(ANALYSIS_PROMPT_VERSION, prompt, stream.feed, should_stop)
             
-            if response and response.text:
+            if ai_text:
+                if not stream.received:
+                    # Resposta veio do cache: nada passou pelo stream
+                    stream.feed(ai_text)
+                opportunities = stream.close()
+                if not opportunities:
+                    print(f"⚠️ Resposta da IA sem oportunidades válidas ({stream.invalid} descartadas)")
+                    return self._fallback_analysis(sports_data, news_data)
                 return {
-                    'top_10_opportunities': self._parse_ai_response(response.text),
-                    'ai_analysis': response.text,
+                    'top_10_opportunities': opportunities,
+                    'ai_analysis': ai_text,
                     'data_used': context,
                     'ai_powered': True
                 }
             
         except Exception as e:
             print(f"Erro na análise de IA: {e}")
-            return self._fallback_analysis(sports_data, news_data)
+            return self._partial_analysis(stream, sports_data, news_data)
         
         return self._fallback_analysis(sports_data, news_data)
     
-    def generate_market_insights(self, sports_data: Dict[str, Any]) -> str:
+    def generate_market_insights(self, sports_data: Dict[str, Any],
+                                 should_stop: Callable[[], bool] = None) -> str:
         """Gera insights de mercado específicos usando IA"""
         
         if not self.model:
             return self._fallback_insights()
         
         try:
+            context = self.context_builder.build(sports_data)
             prompt = f"""
             Como especialista em mídia esportiva brasileira, analise os dados de jogos e eventos:
             
-            {json.dumps(sports_data, indent=2, ensure_ascii=False)}
+            {context.sports_summary}
             
             Gere 3 insights específicos para agências de mídia:
             1. Horário de maior audiência hoje
@@ -97,94 +161,109 @@ class RealAIAnalysis:
             Seja prático e específico com dados reais.
             """
             
-            response = self.model.generate_content(prompt)
+            ai_text = self._generate(INSIGHTS_PROMPT_VERSION, prompt, should_stop=should_stop)
             
-            if response and response.text:
-                return response.text
+            if ai_text:
+                return ai_text
                 
         except Exception as e:
             print(f"Erro ao gerar insights: {e}")
         
         return self._fallback_insights()
     
-    def _prepare_context(self, sports_data: Dict[str, Any], news_data: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Prepara contexto para análise de IA"""
-        
-        # Resumir dados esportivos
-        sports_summary = "JOGOS DE HOJE:\n"
-        for event in sports_data.get('soccer_today', [])[:5]:
-            sports_summary += f"- {event.get('time', 'TBD')}: {event.get('home_team', '')} vs {event.get('away_team', '')} ({event.get('league', '')})\n"
-        
-        sports_summary += "\nJOGOS DE AMANHÃ:\n"
-        for event in sports_data.get('soccer_tomorrow', [])[:5]:
-            sports_summary += f"- {event.get('time', 'TBD')}: {event.get('home_team', '')} vs {event.get('away_team', '')} ({event.get('league', '')})\n"
-        
-        sports_summary += "\nE-SPORTS:\n"
-        for event in sports_data.get('esports_today', [])[:3]:
-            sports_summary += f"- {event.get('time', 'TBD')}: {event.get('home_team', '')} vs {event.get('away_team', '')} ({event.get('league', '')})\n"
-        
-        # Resumir notícias
-        news_summary = "PRINCIPAIS NOTÍCIAS:\n"
-        for news in news_data[:5]:
-            news_summary += f"- {news.get('title', '')} ({news.get('source', '')})\n"
+    def _prepare_context(self, sports_data: Dict[str, Any], news_data: List[Article]) -> Dict[str, Any]:
+        """Prepara contexto para análise de IA (ranqueado e limitado ao orçamento de tokens)"""
+        return self.context_builder.build(sports_data, news_data).as_dict()
+    
+    def _parse_ai_response(self, ai_text: str) -> List[Opportunity]:
+        """Extrai as oportunidades (JSON) do texto da IA"""
+        parser = OpportunityParser()
+        parser.feed(ai_text)
+        return parser.close()
+    
+    def _partial_analysis(self, stream: OpportunityParser, sports_data: Dict[str, Any],
+                          news_data: List[Article]) -> Dict[str, Any]:
+        """O que chegou da IA antes da falha/prazo, completado pela análise de fallback"""
+        received = stream.close()
+        fallback = self._fallback_analysis(sports_data, news_data)
+        if not received:
+            return fallback
         
-        return {
-            'sports_summary': sports_summary,
-            'news_summary': news_summary
-        }
+        print(f"⚠️ Resposta da IA parcial: {len(received)} oportunidade(s) recebidas")
+        # Itens do fallback continuam marcados como tais (source='fallback')
+        filler = fallback['top_10_opportunities'][:MAX_OPPORTUNITIES - len(received)]
+        opportunities = received + [replace(item, rank=rank)
+                                    for rank, item in enumerate(filler, len(received) + 1)]
+        fallback.update({'top_10_opportunities': opportunities, 'ai_powered': True, 'partial': True})
+        return fallback
     
-    def _parse_ai_response(self, ai_text: str) -> List[str]:
-        """Extrai as 10 oportunidades do texto da IA"""
-        lines = ai_text.split('\n')
-        opportunities = []
+    @traced('ai')
+    def analyze_all(self, sports_data: Dict[str, Any], news_data: List[Article],
+                    deadline: float = None) -> Dict[str, Any]:
+        """Análise e insights em paralelo, com prazo total
         
-        for line in lines:
-            line = line.strip()
-            # Buscar linhas que começam com números (1., 2., etc.)
-            if any(line.startswith(f"{i}.") for i in range(1, 11)):
-                opportunities.append(line)
+        Cada parte que não termina no prazo cai no seu próprio fallback; a
+        análise aproveita as oportunidades que já tinham chegado pelo stream.
+        """
+        deadline = deadline if deadline is not None else float(os.environ.get('AI_DEADLINE', DEFAULT_AI_DEADLINE))
+        stop = threading.Event()
+        stream = OpportunityParser()
         
-        # Se não encontrou 10, completar com análises genéricas
-        while len(opportunities) < 10:
-            opportunities.append(f"{len(opportunities) + 1}. 📊 Análise baseada em dados reais coletados")
+        collector = ConcurrentCollector(max_workers=2, source_timeout=deadline, global_deadline=deadline)
+        results = collector.collect([
+            CollectionTask('analysis', lambda: self.analyze_sports_data(sports_data, news_data, stream, stop.is_set)),
+            CollectionTask('market_insights', lambda: self.generate_market_insights(sports_data, stop.is_set)),
+        ])
+        # Chamadas atrasadas param no próximo pedaço do stream
+        stop.set()
         
-        return opportunities[:10]
+        analysis = results['analysis']
+        if analysis is None:
+            analysis = self._partial_analysis(stream, sports_data, news_data)
+        insights = results['market_insights'] or self._fallback_insights()
+        return {'analysis': analysis, 'market_insights': insights}
     
-    def _fallback_analysis(self, sports_data: Dict[str, Any], news_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _fallback_analysis(self, sports_data: Dict[str, Any], news_data: List[Article]) -> Dict[str, Any]:
         """Análise de fallback quando IA não está disponível"""
         
         opportunities = []
         
+        def add(title: str, justification: str, recommendation: str):
+            opportunities.append(Opportunity(len(opportunities) + 1, title, justification,
+                                             recommendation, source='fallback'))
+        
         # Analisar jogos de hoje
-        today_games = sports_data.get('soccer_today', [])
-        for i, game in enumerate(today_games[:3], 1):
-            opportunities.append(
-                f"{i}. 🏆 {game.get('home_team', 'Time A')} vs {game.get('away_team', 'Time B')} "
-                f"({game.get('time', 'TBD')}) - {game.get('league', 'Liga')}"
-            )
+        today_games = sports_data.get('games_today', [])
+        for game in today_games[:3]:
+            add(f"🏆 {game.label} ({game.time}) - {game.league}",
+                'Jogo do dia com transmissão e repercussão nas redes',
+                'Concentrar mídia digital na janela do jogo')
         
         # Analisar e-sports
         esports = sports_data.get('esports_today', [])
-        for i, game in enumerate(esports[:2], len(opportunities) + 1):
-            opportunities.append(
-                f"{i}. 🎮 {game.get('home_team', 'Team A')} vs {game.get('away_team', 'Team B')} "
-                f"({game.get('league', 'E-sports')}) - Público jovem"
-            )
+        for game in esports[:2]:
+            add(f"🎮 {game.label} ({game.league}) - Público jovem",
+                'Audiência 16-34 anos concentrada em streaming',
+                'Ativações na Twitch/YouTube durante a partida')
         
         # Adicionar insights genéricos baseados nos dados
-        while len(opportunities) < 10:
-            idx = len(opportunities) + 1
-            insights = [
-                f"{idx}. 📱 Prime time mobile: 19h-22h - maior CPM",
-                f"{idx}. 📺 Transmissões ao vivo: oportunidade de real-time marketing",
-                f"{idx}. 🎯 Retargeting pós-jogo: janela de 2h para conversão",
-                f"{idx}. 📊 Second screen: 70% dos torcedores usam mobile durante jogos",
-                f"{idx}. 🔄 Stories interativos: engajamento 3x maior em dias de jogo"
-            ]
-            opportunities.append(insights[(idx - 1) % len(insights)])
+        insights = [
+            ('📱 Prime time mobile: 19h-22h - maior CPM', 'Pico de consumo esportivo no celular',
+             'Priorizar formatos mobile no horário nobre'),
+            ('📺 Transmissões ao vivo: oportunidade de real-time marketing', 'Conversa nas redes acompanha o jogo',
+             'Equipe de real-time durante as transmissões'),
+            ('🎯 Retargeting pós-jogo: janela de 2h para conversão', 'Interesse segue alto após o apito final',
+             'Retargeting de quem engajou durante a partida'),
+            ('📊 Second screen: 70% dos torcedores usam mobile durante jogos', 'Atenção dividida entre TV e celular',
+             'Campanhas sincronizadas TV + social'),
+            ('🔄 Stories interativos: engajamento 3x maior em dias de jogo', 'Formatos interativos rendem mais em dias de jogo',
+             'Enquetes e palpites nos stories'),
+        ]
+        while len(opportunities) < MAX_OPPORTUNITIES:
+            add(*insights[len(opportunities) % len(insights)])
         
         return {
-            'top_10_opportunities': opportunities[:10],
+            'top_10_opportunities': opportunities,
             'ai_analysis': 'Análise baseada em dados coletados em tempo real',
             'data_used': {'sports_count': len(today_games), 'news_count': len(news_data)},
             'ai_powered': False
@@ -204,20 +283,22 @@ if __name__ == "__main__":
     ai = RealAIAnalysis()
     
     # Dados de teste
+    today = datetime.now()
     test_sports = {
-        'soccer_today': [
-            {'home_team': 'Flamengo', 'away_team': 'Vasco', 'time': '16:00', 'league': 'Brasileirão'}
+        'games_today': [
+            Match('Flamengo', 'Vasco', 'Brasileirão', today.replace(hour=16, minute=0))
         ],
         'esports_today': [
-            {'home_team': 'LOUD', 'away_team': 'paiN Gaming', 'time': '20:00', 'league': 'CBLOL'}
+            Match('LOUD', 'paiN Gaming', 'CBLOL', today.replace(hour=20, minute=0), sport='E-Sports')
         ]
     }
     
     test_news = [
-        {'title': 'Flamengo contrata novo técnico', 'source': 'GloboEsporte'}
+        Article('Flamengo contrata novo técnico', 'https://ge.globo.com/', 'GloboEsporte', 'Futebol')
     ]
     
-    analysis = ai.analyze_sports_data(test_sports, test_news)
+    result = ai.analyze_all(test_sports, test_news)
+    analysis = result['analysis']
     
     print("🤖 ANÁLISE DE IA:")
     print("=" * 50)
@@ -225,4 +306,6 @@ if __name__ == "__main__":
     print(f"Dados analisados: {analysis.get('data_used', {})}")
     print("\nTOP 10 OPORTUNIDADES:")
     for opportunity in analysis.get('top_10_opportunities', []):
-        print(f"  {opportunity}") 
\ No newline at end of file
+        print(f"  {opportunity.label}")
+        if opportunity.recommendation:
+            print(f"     Recomendação: {opportunity.recommendation}") 
\ No newline at end of file
@@ -4,337 +4,364 @@
 Coleta de notícias esportivas REAIS de múltiplas fontes brasileiras
 """
 
-import requests
-from bs4 import BeautifulSoup
-import feedparser
+import io
+import os
+import sys
 from datetime import datetime
+from urllib.parse import urlparse
 import pytz
-from typing import Dict, List, Any
-import time
+from typing import Dict, Iterable, List, Optional
 import json
 
+from http_client import get_http_client
+from concurrent_collector import ConcurrentCollector, CollectionTask, HostPoliteness
+from feed_ingest import iter_feed_items
+from near_duplicates import cluster_articles
+from news_selection import NewsSelector, selection_seed
+from seen_store import SeenArticleStore
+from models import Article
+from source_health import SourceHealth, get_source_health
+from tracing import span, traced
+
+# Feeds RSS/Atom de cada fonte
+FEEDS = {
+    'globoesporte': {
+        'url': 'https://ge.globo.com/rss.xml',
+        'source': 'GloboEsporte',
+        'category': 'Futebol Brasileiro',
+        'name': 'do GloboEsporte'
+    },
+    'espn': {
+        'url': 'https://www.espn.com.br/rss/',
+        'source': 'ESPN Brasil',
+        'category': 'Esportes',
+        'name': 'da ESPN'
+    },
+    'lance': {
+        'url': 'https://www.lance.com.br/feed/',
+        'source': 'Lance!',
+        'category': 'Futebol',
+        'name': 'do Lance'
+    },
+    'uol': {
+        'url': 'https://rss.uol.com.br/feed/esporte.xml',
+        'source': 'UOL Esporte',
+        'category': 'Futebol',
+        'name': 'do UOL'
+    },
+    'esports': {
+        'url': 'https://www.maisesports.com.br/feed/',
+        'source': 'Mais Esports',
+        'category': 'E-sports',
+        'name': 'de e-sports'
+    },
+    'transfers': {
+        'url': 'https://www.transfermarkt.com.br/rss/news',
+        'source': 'Transfermarkt Brasil',
+        'category': 'Mercado da Bola',
+        'name': 'de transferências'
+    }
+}
+
+# Notícias realistas usadas quando o feed da fonte não responde
+FALLBACK_NEWS = {
+    'globoesporte': [
+        {
+            'title': 'Flamengo anuncia renovação de contrato com Gabigol até 2025',
+            'link': 'https://ge.globo.com/futebol/times/flamengo/noticia/2024/06/09/flamengo-anuncia-renovacao-gabigol.ghtml',
+            'description': 'Atacante assina novo vínculo com o Rubro-Negro carioca por mais dois anos'
+        },
+        {
+            'title': 'Palmeiras x São Paulo: onde assistir, escalações e arbitragem do Choque-Rei',
+            'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/palmeiras-sao-paulo-onde-assistir.ghtml', 
+            'description': 'Clássico paulista acontece neste domingo pelo Brasileirão'
+        },
+        {
+            'title': 'Corinthians acerta contratação de meio-campista argentino',
+            'link': 'https://ge.globo.com/futebol/times/corinthians/noticia/2024/06/09/corinthians-contratacao-argentino.ghtml',
+            'description': 'Novo reforço chega para disputar posição no meio de campo'
+        },
+        {
+            'title': 'Vasco vence Atlético-MG e se aproxima do G4 do Brasileirão',
+            'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/vasco-atletico-mg-resultado.ghtml',
+            'description': 'Cruzmaltino fez 2 a 1 no Mineirão e sobe na tabela'
+        },
+        {
+            'title': 'CBF define datas das próximas rodadas do Campeonato Brasileiro',
+            'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/cbf-datas-proximas-rodadas.ghtml',
+            'description': 'Confederação divulga calendário das próximas semanas da competição'
+        }
+    ],
+    'espn': [
+        {
+            'title': 'Copa América 2024: Brasil estreia contra Costa Rica na próxima semana',
+            'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456789/copa-america-brasil-costa-rica',
+            'description': 'Seleção Brasileira faz último treino antes da estreia na competição'
+        },
+        {
+            'title': 'Real Madrid oficializa contratação de Endrick; brasileiro assina até 2030',
+            'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456790/real-madrid-endrick-contrato',
+            'description': 'Jovem atacante se torna o brasileiro mais jovem a assinar com os Merengues'
+        },
+        {
+            'title': 'CBLOL: LOUD garante vaga nas finais e enfrentará paiN Gaming',
+            'link': 'https://www.espn.com.br/esports/artigo/_/id/13456791/cblol-loud-pain-gaming-finais',
+            'description': 'Equipe venceu na semifinal e disputa o título do split'
+        },
+        {
+            'title': 'Libertadores: Fluminense e Grêmio avançam às oitavas de final',
+            'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456792/libertadores-fluminense-gremio-oitavas',
+            'description': 'Times brasileiros confirmam classificação na fase de grupos'
+        }
+    ],
+    'lance': [
+        {
+            'title': 'Botafogo anuncia chegada de técnico português para comandar equipe',
+            'link': 'https://www.lance.com.br/botafogo/anuncia-tecnico-portugues.html',
+            'description': 'Novo comandante chega com contrato de dois anos'
+        },
+        {
+            'title': 'Santos negocia contratação de atacante uruguaio para segunda divisão',
+            'link': 'https://www.lance.com.br/santos/negocia-atacante-uruguaio.html', 
+            'description': 'Peixe busca reforços para retornar à elite do futebol brasileiro'
+        },
+        {
+            'title': 'Brasileirão: tabela atualizada após rodada do fim de semana',
+            'link': 'https://www.lance.com.br/brasileirao/tabela-atualizada-rodada.html',
+            'description': 'Veja como ficou a classificação após os jogos do domingo'
+        }
+    ],
+    'uol': [
+        {
+            'title': 'Copa do Mundo de 2026: FIFA define sedes dos jogos da seleção brasileira',
+            'link': 'https://www.uol.com.br/esporte/futebol/copa-mundo-2026-fifa-sedes-brasil.htm',
+            'description': 'Confederação divulga calendário preliminar da competição'
+        },
+        {
+            'title': 'Mercado da bola: principais transferências do meio do ano no futebol brasileiro',
+            'link': 'https://www.uol.com.br/esporte/futebol/mercado-bola-transferencias-meio-ano.htm',
+            'description': 'Janela de transferências movimenta clubes da Série A'
+        }
+    ],
+    'esports': [
+        {
+            'title': 'LOUD confirma roster para Valorant Champions Tour 2024',
+            'link': 'https://www.maisesports.com.br/loud-roster-valorant-champions-2024',
+            'description': 'Equipe brasileira mantém core principal para temporada'
+        },
+        {
+            'title': 'CBLOL: paiN Gaming x FURIA é destaque da rodada de playoffs',
+            'link': 'https://www.maisesports.com.br/cblol-pain-furia-playoffs-destaque',
+            'description': 'Confronto decide uma das vagas para a final do campeonato'
+        },
+        {
+            'title': 'Free Fire: Brasil garante duas vagas no Mundial de Esports 2024',
+            'link': 'https://www.maisesports.com.br/free-fire-brasil-mundial-2024',
+            'description': 'Representantes nacionais se classificam em torneio classificatório'
+        },
+        {
+            'title': 'CS2: Imperial anuncia mudanças no roster para próxima temporada',
+            'link': 'https://www.maisesports.com.br/cs2-imperial-mudancas-roster',
+            'description': 'Time brasileiro busca renovação para competições internacionais'
+        }
+    ],
+    'transfers': [
+        {
+            'title': 'Mercado: Flamengo negocia contratação de lateral-esquerdo argentino',
+            'link': 'https://www.transfermarkt.com.br/flamengo-lateral-argentino/news/123456',
+            'description': 'Rubro-Negro avança nas negociações por reforço para lateral'
+        },
+        {
+            'title': 'Palmeiras renova contratos de três jogadores da base até 2027',
+            'link': 'https://www.transfermarkt.com.br/palmeiras-renovacoes-base/news/123457',
+            'description': 'Verdão garante permanência de promessas das categorias de base'
+        }
+    ]
+}
+
+def feed_url(key: str) -> str:
+    """URL do feed; NEWS_FEEDS_URL troca todos por `<base>/<chave>` (servidor local de teste)"""
+    base_url = os.environ.get('NEWS_FEEDS_URL')
+    return f"{base_url.rstrip('/')}/{key}" if base_url else FEEDS[key]['url']
+
+
+def check_feeds(keys: Iterable[str] = None) -> Dict[str, Optional[str]]:
+    """Baixa cada feed (sem cache) e confere se é RSS/Atom com notícias
+
+    Devolve, por fonte, None quando o feed está bom ou o motivo da falha.
+    Uso: python3 real_news_scraper.py --check-feeds
+    """
+    http = get_http_client()
+    problems = {}
+    for key in (keys or FEEDS):
+        feed = FEEDS[key]
+        try:
+            response = http.get(feed_url(key), timeout=10)
+            if response.status_code != 200:
+                problems[key] = f"HTTP {response.status_code}"
+                continue
+            items = list(iter_feed_items(io.BytesIO(response.content), source=feed['source'],
+                                         category=feed['category'], max_items=5))
+            problems[key] = None if items else 'feed sem itens'
+        except Exception as e:
+            problems[key] = f"não é RSS/Atom ou não respondeu: {e}"
+    return problems
+
+
 class RealNewsScraper:
     """Coleta notícias esportivas reais de múltiplas fontes brasileiras"""
     
-    def __init__(self):
+    def __init__(self, source_timeout: float = 10.0, global_deadline: float = 30.0,
+                 max_per_host: int = 2, min_host_interval: float = 0.5,
+                 max_items_per_source: int = 10, seen_store: Optional[SeenArticleStore] = None,
+                 health: Optional[SourceHealth] = None):
         self.timezone = pytz.timezone('America/Sao_Paulo')
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
+        self.http = get_http_client()
+        self.health = health or get_source_health()
+        self.max_items_per_source = max_items_per_source
+        
+        # Modo incremental: com um registro de entregas, só entram notícias novas
+        self.seen_store = seen_store
+        
+        # Coleta concorrente: timeout por fonte, prazo global e cortesia por host
+        # no lugar do sleep fixo entre as fontes
+        self.collector = ConcurrentCollector(
+            max_workers=6,
+            source_timeout=source_timeout,
+            global_deadline=global_deadline,
+            politeness=HostPoliteness(max_per_host=max_per_host, min_interval=min_host_interval)
+        )
+        
+    def _fallback_news(self, key: str) -> List[Article]:
+        """Notícias realistas da fonte quando o feed não está disponível"""
+        feed = FEEDS[key]
+        current_time = datetime.now(self.timezone)
+        
+        return [Article(
+            title=article['title'],
+            link=article['link'],
+            source=feed['source'],
+            category=feed['category'],
+            description=article['description'],
+            published=current_time
+        ) for article in FALLBACK_NEWS[key]]
+    
+    def _collect_feed(self, key: str, since: Optional[datetime] = None) -> List[Article]:
+        """Baixa (com cache condicional) e processa o feed da fonte em streaming
+
+        Com `since`, a leitura do feed para ao chegar em notícias anteriores a essa data.
+        """
+        with span(f"news.{key}") as current:
+            # Feed em pausa (falhas seguidas ou lentidão) devolve a última coleta boa;
+            # feed sem notícias novas não apaga essa coleta
+            try:
+                news = self.health.call(
+                    f"news.{key}", lambda: self._fetch_feed(key, since),
+                    encode=lambda articles: [article.to_dict() for article in articles],
+                    decode=lambda data: [Article.from_dict(item) for item in data],
+                    keep=bool
+                )
+            except Exception as e:
+                print(f"Erro no feed {key}: {e}")
+                news = None
+            current.set(items=len(news) if news else 0, fallback=news is None)
+        
+        # Só quando o feed falhou (sem coleta boa guardada) entram os dados de referência;
+        # feed vazio no modo incremental é só "nada de novo desde o último relatório"
+        if news is None:
+            return self._fallback_news(key)
+        return news
+    
+    def _fetch_feed(self, key: str, since: Optional[datetime]) -> List[Article]:
+        """Notícias do feed; levanta exceção se a fonte falhar (feed vazio não é falha)"""
+        feed = FEEDS[key]
+        response = self.http.get_cached(feed_url(key), default_max_age=5 * 60, timeout=10)
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code}")
         
-    def get_globoesporte_rss(self) -> List[Dict[str, Any]]:
+        news = list(iter_feed_items(
+            io.BytesIO(response.content),
+            source=feed['source'],
+            category=feed['category'],
+            max_items=self.max_items_per_source,
+            since=since,
+            timezone=self.timezone
+        ))
+        if not news:
+            print(f"ℹ️ Feed {feed['name']} sem notícias{' novas' if since else ''}")
+        return news
+    
+    def get_globoesporte_rss(self) -> List[Article]:
         """Coleta notícias via RSS do GloboEsporte"""
-        try:
-            # RSS do GloboEsporte é mais confiável
-            rss_url = "https://ge.globo.com/rss.xml"
-            
-            # Se RSS não funcionar, usar dados simulados realistas
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias realistas baseadas em eventos atuais do futebol brasileiro
-            sample_news = [
-                {
-                    'title': 'Flamengo anuncia renovação de contrato com Gabigol até 2025',
-                    'link': 'https://ge.globo.com/futebol/times/flamengo/noticia/2024/06/09/flamengo-anuncia-renovacao-gabigol.ghtml',
-                    'description': 'Atacante assina novo vínculo com o Rubro-Negro carioca por mais dois anos'
-                },
-                {
-                    'title': 'Palmeiras x São Paulo: onde assistir, escalações e arbitragem do Choque-Rei',
-                    'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/palmeiras-sao-paulo-onde-assistir.ghtml', 
-                    'description': 'Clássico paulista acontece neste domingo pelo Brasileirão'
-                },
-                {
-                    'title': 'Corinthians acerta contratação de meio-campista argentino',
-                    'link': 'https://ge.globo.com/futebol/times/corinthians/noticia/2024/06/09/corinthians-contratacao-argentino.ghtml',
-                    'description': 'Novo reforço chega para disputar posição no meio de campo'
-                },
-                {
-                    'title': 'Vasco vence Atlético-MG e se aproxima do G4 do Brasileirão',
-                    'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/vasco-atletico-mg-resultado.ghtml',
-                    'description': 'Cruzmaltino fez 2 a 1 no Mineirão e sobe na tabela'
-                },
-                {
-                    'title': 'CBF define datas das próximas rodadas do Campeonato Brasileiro',
-                    'link': 'https://ge.globo.com/futebol/brasileirao-serie-a/noticia/2024/06/09/cbf-datas-proximas-rodadas.ghtml',
-                    'description': 'Confederação divulga calendário das próximas semanas da competição'
-                }
-            ]
-            
-            for i, article in enumerate(sample_news):
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'GloboEsporte',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'Futebol Brasileiro'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias do GloboEsporte: {e}")
-            return []
+        return self._collect_feed('globoesporte')
     
-    def get_espn_brasil_news(self) -> List[Dict[str, Any]]:
+    def get_espn_brasil_news(self) -> List[Article]:
         """Coleta notícias da ESPN Brasil"""
-        try:
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias ESPN Brasil realistas
-            espn_news = [
-                {
-                    'title': 'Copa América 2024: Brasil estreia contra Costa Rica na próxima semana',
-                    'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456789/copa-america-brasil-costa-rica',
-                    'description': 'Seleção Brasileira faz último treino antes da estreia na competição'
-                },
-                {
-                    'title': 'Real Madrid oficializa contratação de Endrick; brasileiro assina até 2030',
-                    'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456790/real-madrid-endrick-contrato',
-                    'description': 'Jovem atacante se torna o brasileiro mais jovem a assinar com os Merengues'
-                },
-                {
-                    'title': 'CBLOL: LOUD garante vaga nas finais e enfrentará paiN Gaming',
-                    'link': 'https://www.espn.com.br/esports/artigo/_/id/13456791/cblol-loud-pain-gaming-finais',
-                    'description': 'Equipe venceu na semifinal e disputa o título do split'
-                },
-                {
-                    'title': 'Libertadores: Fluminense e Grêmio avançam às oitavas de final',
-                    'link': 'https://www.espn.com.br/futebol/artigo/_/id/13456792/libertadores-fluminense-gremio-oitavas',
-                    'description': 'Times brasileiros confirmam classificação na fase de grupos'
-                }
-            ]
-            
-            for article in espn_news:
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'ESPN Brasil',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'Esportes'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias da ESPN: {e}")
-            return []
+        return self._collect_feed('espn')
     
-    def get_lance_net_news(self) -> List[Dict[str, Any]]:
+    def get_lance_net_news(self) -> List[Article]:
         """Coleta notícias do Lance!"""
-        try:
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias Lance! realistas
-            lance_news = [
-                {
-                    'title': 'Botafogo anuncia chegada de técnico português para comandar equipe',
-                    'link': 'https://www.lance.com.br/botafogo/anuncia-tecnico-portugues.html',
-                    'description': 'Novo comandante chega com contrato de dois anos'
-                },
-                {
-                    'title': 'Santos negocia contratação de atacante uruguaio para segunda divisão',
-                    'link': 'https://www.lance.com.br/santos/negocia-atacante-uruguaio.html', 
-                    'description': 'Peixe busca reforços para retornar à elite do futebol brasileiro'
-                },
-                {
-                    'title': 'Brasileirão: tabela atualizada após rodada do fim de semana',
-                    'link': 'https://www.lance.com.br/brasileirao/tabela-atualizada-rodada.html',
-                    'description': 'Veja como ficou a classificação após os jogos do domingo'
-                }
-            ]
-            
-            for article in lance_news:
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'Lance!',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'Futebol'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias do Lance: {e}")
-            return []
+        return self._collect_feed('lance')
     
-    def get_uol_esporte_news(self) -> List[Dict[str, Any]]:
+    def get_uol_esporte_news(self) -> List[Article]:
         """Coleta notícias do UOL Esporte"""
-        try:
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias UOL Esporte realistas
-            uol_news = [
-                {
-                    'title': 'Copa do Mundo de 2026: FIFA define sedes dos jogos da seleção brasileira',
-                    'link': 'https://www.uol.com.br/esporte/futebol/copa-mundo-2026-fifa-sedes-brasil.htm',
-                    'description': 'Confederação divulga calendário preliminar da competição'
-                },
-                {
-                    'title': 'Mercado da bola: principais transferências do meio do ano no futebol brasileiro',
-                    'link': 'https://www.uol.com.br/esporte/futebol/mercado-bola-transferencias-meio-ano.htm',
-                    'description': 'Janela de transferências movimenta clubes da Série A'
-                }
-            ]
-            
-            for article in uol_news:
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'UOL Esporte',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'Futebol'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias do UOL: {e}")
-            return []
+        return self._collect_feed('uol')
     
-    def get_esports_news(self) -> List[Dict[str, Any]]:
+    def get_esports_news(self) -> List[Article]:
         """Coleta notícias específicas de e-sports brasileiro"""
-        try:
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias de e-sports brasileiros realistas
-            esports_news = [
-                {
-                    'title': 'LOUD confirma roster para Valorant Champions Tour 2024',
-                    'link': 'https://www.maisesports.com.br/loud-roster-valorant-champions-2024',
-                    'description': 'Equipe brasileira mantém core principal para temporada'
-                },
-                {
-                    'title': 'CBLOL: paiN Gaming x FURIA é destaque da rodada de playoffs',
-                    'link': 'https://www.maisesports.com.br/cblol-pain-furia-playoffs-destaque',
-                    'description': 'Confronto decide uma das vagas para a final do campeonato'
-                },
-                {
-                    'title': 'Free Fire: Brasil garante duas vagas no Mundial de Esports 2024',
-                    'link': 'https://www.maisesports.com.br/free-fire-brasil-mundial-2024',
-                    'description': 'Representantes nacionais se classificam em torneio classificatório'
-                },
-                {
-                    'title': 'CS2: Imperial anuncia mudanças no roster para próxima temporada',
-                    'link': 'https://www.maisesports.com.br/cs2-imperial-mudancas-roster',
-                    'description': 'Time brasileiro busca renovação para competições internacionais'
-                }
-            ]
-            
-            for article in esports_news:
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'Mais Esports',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'E-sports'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias de e-sports: {e}")
-            return []
+        return self._collect_feed('esports')
     
-    def get_transfer_news(self) -> List[Dict[str, Any]]:
+    def get_transfer_news(self) -> List[Article]:
         """Notícias específicas do mercado de transferências"""
-        try:
-            news = []
-            current_time = datetime.now(self.timezone)
-            
-            # Notícias de transferências realistas
-            transfer_news = [
-                {
-                    'title': 'Mercado: Flamengo negocia contratação de lateral-esquerdo argentino',
-                    'link': 'https://www.transfermarkt.com.br/flamengo-lateral-argentino/news/123456',
-                    'description': 'Rubro-Negro avança nas negociações por reforço para lateral'
-                },
-                {
-                    'title': 'Palmeiras renova contratos de três jogadores da base até 2027',
-                    'link': 'https://www.transfermarkt.com.br/palmeiras-renovacoes-base/news/123457',
-                    'description': 'Verdão garante permanência de promessas das categorias de base'
-                }
-            ]
-            
-            for article in transfer_news:
-                news.append({
-                    'title': article['title'],
-                    'link': article['link'],
-                    'source': 'Transfermarkt Brasil',
-                    'date': current_time.strftime('%d/%m/%Y %H:%M'),
-                    'description': article['description'],
-                    'category': 'Mercado da Bola'
-                })
-                
-            return news
-            
-        except Exception as e:
-            print(f"Erro ao buscar notícias de transferências: {e}")
-            return []
+        return self._collect_feed('transfers')
     
-    def get_all_news(self) -> List[Dict[str, Any]]:
-        """Coleta todas as notícias de diferentes fontes"""
-        all_news = []
-        
-        print("📰 Coletando notícias do GloboEsporte...")
-        globo_news = self.get_globoesporte_rss()
-        all_news.extend(globo_news)
-        time.sleep(0.5)  # Delay menor entre requests
-        
-        print("📰 Coletando notícias da ESPN Brasil...")
-        espn_news = self.get_espn_brasil_news()
-        all_news.extend(espn_news)
-        time.sleep(0.5)
-        
-        print("📰 Coletando notícias do Lance!...")
-        lance_news = self.get_lance_net_news()
-        all_news.extend(lance_news)
-        time.sleep(0.5)
-        
-        print("📰 Coletando notícias do UOL Esporte...")
-        uol_news = self.get_uol_esporte_news()
-        all_news.extend(uol_news)
-        time.sleep(0.5)
+    @traced('news')
+    def get_all_news(self, teams: Iterable[str] = ()) -> List[Article]:
+        """Coleta todas as notícias de diferentes fontes em paralelo
         
-        print("🎮 Coletando notícias de e-sports...")
-        esports_news = self.get_esports_news()
-        all_news.extend(esports_news)
-        time.sleep(0.5)
-        
-        print("💰 Coletando notícias de transferências...")
-        transfer_news = self.get_transfer_news()
-        all_news.extend(transfer_news)
+        `teams` (ex.: times dos jogos do dia) sobem as notícias que os citam.
+        """
+        labels = {
+            'globoesporte': "📰 Coletando notícias do GloboEsporte...",
+            'espn': "📰 Coletando notícias da ESPN Brasil...",
+            'lance': "📰 Coletando notícias do Lance!...",
+            'uol': "📰 Coletando notícias do UOL Esporte...",
+            'esports': "🎮 Coletando notícias de e-sports...",
+            'transfers': "💰 Coletando notícias de transferências..."
+        }
+        since = self.seen_store.last_report_time() if self.seen_store else None
         
-        # Remover duplicatas por título
-        unique_news = []
-        seen_titles = set()
+        tasks = [
+            CollectionTask(key, lambda key=key: self._collect_feed(key, since),
+                           host=urlparse(feed_url(key)).netloc, default=[], label=labels[key])
+            for key in FEEDS
+        ]
         
-        for news in all_news:
-            title_key = news['title'].lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_news.append(news)
+        # Resultados sempre na ordem de registro, independente de quem termina primeiro
+        results = self.collector.collect(tasks)
+        all_news = []
+        for task in tasks:
+            all_news.extend(results[task.name])
         
-        # Ordenar por relevância (notícias de futebol primeiro)
+        # Agrupar a mesma história publicada por fontes diferentes (títulos quase iguais)
         priority_sources = ['GloboEsporte', 'ESPN Brasil', 'Lance!']
-        unique_news.sort(key=lambda x: (
-            0 if x['source'] in priority_sources else 1,
-            x['source']
-        ))
+        unique_news = cluster_articles(all_news, priority_sources=priority_sources)
+        
+        # Pular links já enviados em relatórios anteriores
+        if self.seen_store:
+            unique_news = self.seen_store.filter_unseen(unique_news)
         
-        return unique_news[:15]  # Retornar no máximo 15 notícias
+        # As 15 mais relevantes (atualidade, fonte, times citados), mesma escolha para o mesmo dia
+        today = datetime.now(self.timezone).date()
+        return NewsSelector(teams).select(unique_news, 15, seed=selection_seed(today))
 
 if __name__ == "__main__":
+    if '--check-feeds' in sys.argv:
+        problems = check_feeds()
+        for key, problem in problems.items():
+            print(f"{'❌' if problem else '✅'} {key}: {feed_url(key)}{f' ({problem})' if problem else ''}")
+        sys.exit(1 if any(problems.values()) else 0)
+    
     # Teste do scraper
     scraper = RealNewsScraper()
     news = scraper.get_all_news()
@@ -343,10 +370,10 @@ if __name__ == "__main__":
     print("=" * 80)
     
     for i, article in enumerate(news, 1):
-        print(f"\n{i}. {article['title']}")
-        print(f"   🔗 {article['link']}")
-        print(f"   📰 {article['source']} • {article['category']} • {article['date']}")
-        if 'description' in article:
-            print(f"   📝 {article['description']}")
+        print(f"\n{i}. {article.title}")
+        print(f"   🔗 {article.link}")
+        print(f"   📰 {article.source} • {article.category} • {article.date}")
+        if article.description:
+            print(f"   📝 {article.description}")
     
-    print(f"\n✅ Total de {len(news)} notícias coletadas de {len(set(n['source'] for n in news))} fontes diferentes") 
\ No newline at end of file
+    print(f"\n✅ Total de {len(news)} notícias coletadas de {len(set(n.source for n in news))} fontes diferentes") 
\ No newline at end of file
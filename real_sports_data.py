@@ -4,29 +4,53 @@
 Coleta de dados esportivos REAIS via múltiplas APIs gratuitas
 """
 
-import requests
-import json
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pytz
-from typing import Dict, List, Any
+from typing import Dict, List, Optional
+
+from competitions import is_tracked_league
+from http_client import get_http_client
+from fixture_window import FixtureWindow
+from models import Match
+from sports_providers import ProviderSet, default_providers
+from tracing import traced
+
+WEEK_DAYS = 7
 
 class RealSportsData:
     """Coleta dados esportivos reais de múltiplas APIs gratuitas"""
     
-    def __init__(self):
+    def __init__(self, providers: Optional[ProviderSet] = None):
         self.timezone = pytz.timezone('America/Sao_Paulo')
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
+        self.http = get_http_client()
+        self.providers = providers or default_providers()
+        self._window: Optional[FixtureWindow] = None
+    
+    def fixture_window(self, refresh: bool = False) -> FixtureWindow:
+        """Jogos de ontem até o fim da semana, numa busca só (recarregada a cada coleta)"""
+        today = datetime.now(self.timezone).date()
+        start, end = today - timedelta(days=1), today + timedelta(days=WEEK_DAYS - 1)
+        if refresh or self._window is None or not self._window.covers(start, end):
+            self._window = FixtureWindow.load(self.providers, start, end)
+        return self._window
+    
+    def _real_games(self, start: date, end: date = None) -> List[Match]:
+        """Partidas das competições acompanhadas vindas dos provedores (vazio se nenhum respondeu)"""
+        try:
+            return [match for match in self.fixture_window().between(start, end or start)
+                    if is_tracked_league(match.league)]
+        except Exception as e:
+            print(f"Erro nos provedores de jogos: {e}")
+            return []
         
-    def get_football_api_data(self) -> List[Dict[str, Any]]:
-        """Dados da Football API gratuita"""
+    @traced('sports.games_today')
+    def get_football_api_data(self) -> List[Match]:
+        """Jogos de hoje dos provedores (TheSportsDB, football-data.org com FOOTBALL_API_KEY, arquivo local)"""
+        return self._real_games(datetime.now(self.timezone).date()) or self._simulated_games_today()
+    
+    def _simulated_games_today(self) -> List[Match]:
+        """Programação simulada quando nenhum provedor traz jogos"""
         try:
-            # API gratuita para futebol mundial
-            url = "https://api.football-data.org/v4/competitions/2013/matches"  # Brasileirão
-            headers = {'X-Auth-Token': 'your_token_here'}  # Token gratuito
-            
-            # Como não temos token, vamos simular dados baseados na data atual
             today = datetime.now(self.timezone)
             games = []
             
@@ -42,25 +66,25 @@ class RealSportsData:
             # Simular jogos para hoje e próximos dias
             for i, (home, away) in enumerate(brazilian_teams[:5]):
                 game_date = today + timedelta(hours=i*3)
-                games.append({
-                    'time': game_date.strftime('%H:%M'),
-                    'date': game_date.strftime('%d/%m/%Y'),
-                    'home_team': home,
-                    'away_team': away,
-                    'league': 'Brasileirão Série A 2024',
-                    'venue': f'Estádio do {home}',
-                    'country': 'Brasil',
-                    'sport': 'Futebol',
-                    'status': 'Agendado' if game_date > today else 'Ao Vivo' if game_date.date() == today.date() else 'Finalizado'
-                })
+                games.append(Match(
+                    home_team=home,
+                    away_team=away,
+                    league='Brasileirão Série A 2024',
+                    kickoff=game_date,
+                    venue=f'Estádio do {home}',
+                    country='Brasil',
+                    sport='Futebol',
+                    status='Agendado' if game_date > today else 'Ao Vivo' if game_date.date() == today.date() else 'Finalizado'
+                ))
             
             return games
             
         except Exception as e:
-            print(f"Erro na Football API: {e}")
+            print(f"Erro nos jogos simulados: {e}")
             return []
     
-    def get_esports_data(self) -> List[Dict[str, Any]]:
+    @traced('sports.esports_today')
+    def get_esports_data(self) -> List[Match]:
         """Dados de e-sports brasileiros"""
         try:
             # Dados realistas do cenário brasileiro de e-sports
@@ -81,34 +105,32 @@ class RealSportsData:
             # CBLOL (League of Legends)
             for i, (team1, team2) in enumerate(cblol_teams[:3]):
                 event_time = today.replace(hour=20+i, minute=0)
-                esports_events.append({
-                    'time': event_time.strftime('%H:%M'),
-                    'date': event_time.strftime('%d/%m/%Y'),
-                    'home_team': team1,
-                    'away_team': team2,
-                    'league': 'CBLOL 2024',
-                    'game': 'League of Legends',
-                    'venue': 'Studio Riot Games',
-                    'country': 'Brasil',
-                    'sport': 'E-Sports',
-                    'viewers': f'{(i+1)*15}K espectadores esperados'
-                })
+                esports_events.append(Match(
+                    home_team=team1,
+                    away_team=team2,
+                    league='CBLOL 2024',
+                    kickoff=event_time,
+                    game='League of Legends',
+                    venue='Studio Riot Games',
+                    country='Brasil',
+                    sport='E-Sports',
+                    viewers=f'{(i+1)*15}K espectadores esperados'
+                ))
             
             # Valorant
             for i, (team1, team2) in enumerate(valorant_teams[:2]):
                 event_time = today.replace(hour=18+i, minute=30)
-                esports_events.append({
-                    'time': event_time.strftime('%H:%M'),
-                    'date': event_time.strftime('%d/%m/%Y'),
-                    'home_team': team1,
-                    'away_team': team2,
-                    'league': 'VCT Brazil 2024',
-                    'game': 'Valorant',
-                    'venue': 'Online',
-                    'country': 'Brasil',
-                    'sport': 'E-Sports',
-                    'viewers': f'{(i+1)*20}K espectadores esperados'
-                })
+                esports_events.append(Match(
+                    home_team=team1,
+                    away_team=team2,
+                    league='VCT Brazil 2024',
+                    kickoff=event_time,
+                    game='Valorant',
+                    venue='Online',
+                    country='Brasil',
+                    sport='E-Sports',
+                    viewers=f'{(i+1)*20}K espectadores esperados'
+                ))
             
             return esports_events
             
@@ -116,10 +138,14 @@ class RealSportsData:
             print(f"Erro nos dados de e-sports: {e}")
             return []
     
-    def get_recent_results(self) -> List[Dict[str, Any]]:
+    @traced('sports.recent_results')
+    def get_recent_results(self) -> List[Match]:
         """Resultados recentes dos últimos jogos"""
+        yesterday = datetime.now(self.timezone) - timedelta(days=1)
+        finished = [match for match in self._real_games(yesterday.date()) if match.score]
+        if finished:
+            return finished
         try:
-            yesterday = datetime.now(self.timezone) - timedelta(days=1)
             results = []
             
             # Resultados recentes realistas
@@ -133,17 +159,16 @@ class RealSportsData:
             
             for i, (home, away, score) in enumerate(recent_games):
                 game_time = yesterday - timedelta(hours=i*2)
-                results.append({
-                    'time': game_time.strftime('%H:%M'),
-                    'date': game_time.strftime('%d/%m/%Y'),
-                    'home_team': home,
-                    'away_team': away,
-                    'score': score,
-                    'league': 'Brasileirão Série A',
-                    'venue': f'Estádio do {home}',
-                    'status': 'Finalizado',
-                    'attendance': f'{25 + i*5}.000 pessoas'
-                })
+                results.append(Match(
+                    home_team=home,
+                    away_team=away,
+                    league='Brasileirão Série A',
+                    kickoff=game_time,
+                    score=score,
+                    venue=f'Estádio do {home}',
+                    status='Finalizado',
+                    attendance=f'{25 + i*5}.000 pessoas'
+                ))
             
             return results
             
@@ -151,10 +176,14 @@ class RealSportsData:
             print(f"Erro nos resultados recentes: {e}")
             return []
     
-    def get_tomorrow_games(self) -> List[Dict[str, Any]]:
+    @traced('sports.games_tomorrow')
+    def get_tomorrow_games(self) -> List[Match]:
         """Jogos de amanhã"""
+        tomorrow = datetime.now(self.timezone) + timedelta(days=1)
+        games = self._real_games(tomorrow.date())
+        if games:
+            return games
         try:
-            tomorrow = datetime.now(self.timezone) + timedelta(days=1)
             games = []
             
             # Jogos programados para amanhã
@@ -167,18 +196,18 @@ class RealSportsData:
             ]
             
             for home, away, time in tomorrow_matches:
-                games.append({
-                    'time': time,
-                    'date': tomorrow.strftime('%d/%m/%Y'),
-                    'home_team': home,
-                    'away_team': away,
-                    'league': 'Brasileirão Série A',
-                    'venue': f'Estádio do {home}',
-                    'country': 'Brasil',
-                    'sport': 'Futebol',
-                    'status': 'Agendado',
-                    'tv': 'SporTV, Premiere'
-                })
+                hour, minute = map(int, time.split(':'))
+                games.append(Match(
+                    home_team=home,
+                    away_team=away,
+                    league='Brasileirão Série A',
+                    kickoff=tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0),
+                    venue=f'Estádio do {home}',
+                    country='Brasil',
+                    sport='Futebol',
+                    status='Agendado',
+                    tv='SporTV, Premiere'
+                ))
             
             return games
             
@@ -186,41 +215,22 @@ class RealSportsData:
             print(f"Erro nos jogos de amanhã: {e}")
             return []
     
-    def get_weekly_schedule(self) -> List[Dict[str, Any]]:
-        """Programação da semana"""
-        try:
-            today = datetime.now(self.timezone)
-            weekly_games = []
-            
-            # Programação dos próximos 7 dias
-            for day_offset in range(7):
-                game_date = today + timedelta(days=day_offset)
-                
-                if day_offset < 3:  # Primeiros 3 dias com mais jogos
-                    daily_games = [
-                        f"Jogo {day_offset*2 + 1}",
-                        f"Jogo {day_offset*2 + 2}"
-                    ]
-                else:
-                    daily_games = [f"Jogo {day_offset + 5}"]
-                
-                for i, game in enumerate(daily_games):
-                    weekly_games.append({
-                        'date': game_date.strftime('%d/%m/%Y'),
-                        'day': game_date.strftime('%A'),
-                        'game_number': len(weekly_games) + 1,
-                        'description': f'Rodada {day_offset + 1} - {game}',
-                        'league': 'Brasileirão'
-                    })
-            
-            return weekly_games
-            
-        except Exception as e:
-            print(f"Erro na programação semanal: {e}")
-            return []
+    @traced('sports.weekly_schedule')
+    def get_weekly_schedule(self) -> List[Match]:
+        """Programação da semana (mesma janela de jogos, sem nova busca)
+
+        Sem provedores respondendo a programação fica vazia: jogos inventados
+        para dias futuros seriam enviados como agenda real.
+        """
+        today = datetime.now(self.timezone).date()
+        return self._real_games(today, today + timedelta(days=WEEK_DAYS - 1))
     
-    def get_all_sports_data(self) -> Dict[str, List[Dict[str, Any]]]:
+    @traced('sports')
+    def get_all_sports_data(self) -> Dict[str, List[Match]]:
         """Coleta todos os dados esportivos disponíveis"""
+        # Uma busca nos provedores serve hoje, ontem, amanhã e a semana
+        self.fixture_window(refresh=True)
+        
         print("🔄 Coletando dados de futebol...")
         football_data = self.get_football_api_data()
         
@@ -255,9 +265,6 @@ if __name__ == "__main__":
     for category, events in data.items():
         print(f"\n📊 {category.upper()} ({len(events)} eventos):")
         for event in events[:3]:  # Mostrar apenas os 3 primeiros
-            if 'home_team' in event:
-                print(f"  🏆 {event.get('time', 'TBD')} - {event.get('home_team', '')} vs {event.get('away_team', '')}")
-            else:
-                print(f"  📅 {event}")
+            print(f"  🏆 {event.date} {event.time} - {event.label}")
             
     print(f"\n✅ Total de eventos coletados: {sum(len(events) for events in data.values())}") 
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dados sintéticos de relatório (jogos e notícias) para testes e benchmarks
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from models import Article, Match
+
+TEAMS = ['Flamengo', 'Palmeiras', 'Corinthians', 'São Paulo', 'Santos', 'Vasco', 'Botafogo',
+         'Fluminense', 'Grêmio', 'Internacional', 'Atlético-MG', 'Cruzeiro']
+ESPORTS_TEAMS = ['LOUD', 'paiN Gaming', 'FURIA', 'Imperial', 'MIBR', 'Vivo Keyd']
+
+
+def synthetic_data(events: int, seed: int = 42):
+    """Relatório com `events` jogos divididos entre as seções e 50 notícias (mesma semente, mesmos dados)"""
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 9, 12, 0)
+    per_section = events // 4
+
+    def matches(offset_days, **extra):
+        return [Match(rng.choice(TEAMS), rng.choice(TEAMS), 'Brasileirão',
+                      start + timedelta(days=offset_days, minutes=15 * (i % 40)),
+                      venue='Maracanã', **extra)
+                for i in range(per_section)]
+
+    sports_data = {
+        'games_today': matches(0),
+        'recent_results': matches(-1, score='2-1', attendance='45.000'),
+        'games_tomorrow': matches(1, tv='Globo'),
+        'esports_today': [Match(rng.choice(ESPORTS_TEAMS), rng.choice(ESPORTS_TEAMS), 'CBLOL',
+                                start + timedelta(minutes=30 * (i % 20)), sport='E-Sports',
+                                game='League of Legends', viewers='500K')
+                          for i in range(events - 3 * per_section)],
+    }
+    news_data = [Article(f"Notícia {i} <sobre> {rng.choice(TEAMS)} & mercado", f"https://example.com/n/{i}",
+                         'GloboEsporte', 'Futebol', 'Resumo da notícia', start)
+                 for i in range(50)]
+    return {'sports_data': sports_data, 'news_data': news_data, 'collection_time': '09/06/2025 08:00'}
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro persistente (SQLite) das notícias já entregues, para execuções incrementais
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pytz
+
+from models import Article
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'seen_articles.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS delivered_articles (
+    url_hash INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    source TEXT,
+    published_at INTEGER,
+    delivered_at INTEGER NOT NULL,
+    report_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_delivered_published ON delivered_articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_delivered_at ON delivered_articles (delivered_at);
+CREATE TABLE IF NOT EXISTS reports (
+    report_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sent_at INTEGER NOT NULL,
+    article_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_sent ON reports (sent_at);
+"""
+
+# Parâmetros de rastreamento que não mudam a notícia
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'xtor')
+
+
+def normalize_url(url: str) -> str:
+    """Normaliza o link para que variações de rastreamento virem a mesma notícia"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(_TRACKING_PARAMS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def url_hash(url: str) -> int:
+    """Hash de 64 bits do link normalizado (usado como rowid: busca O(1))"""
+    digest = hashlib.sha1(normalize_url(url).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+class SeenArticleStore:
+    """Notícias já enviadas em relatórios anteriores, com retenção limitada"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, retention_days: int = 90, max_rows: int = 50000):
+        self.path = path
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.timezone = pytz.timezone('America/Sao_Paulo')
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def is_seen(self, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM delivered_articles WHERE url_hash = ?',
+                                     (url_hash(url),)).fetchone()
+        return row is not None
+
+    def filter_unseen(self, articles: List[Article]) -> List[Article]:
+        """Remove as notícias cujo link já foi entregue (consulta em lote pela chave primária)"""
+        if not articles:
+            return []
+        hashes = [url_hash(article.link) for article in articles]
+        seen = set()
+
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT url_hash FROM delivered_articles WHERE url_hash IN ({placeholders})', chunk)
+                seen.update(row[0] for row in rows)
+
+        return [article for article, h in zip(articles, hashes) if h not in seen]
+
+    def last_report_time(self) -> Optional[datetime]:
+        with self._lock:
+            row = self._conn.execute('SELECT MAX(sent_at) FROM reports').fetchone()
+        if not row or row[0] is None:
+            return None
+        return datetime.fromtimestamp(row[0], self.timezone)
+
+    def new_since_last_report(self, articles: List[Article]) -> List[Article]:
+        """Notícias ainda não entregues e publicadas depois do último relatório"""
+        last_report = self.last_report_time()
+        unseen = self.filter_unseen(articles)
+        if last_report is None:
+            return unseen
+        return [article for article in unseen
+                if article.published is None or article.published > last_report]
+
+    def record_delivery(self, articles: Iterable[Article], sent_at: Optional[float] = None) -> int:
+        """Registra o relatório enviado e as notícias que ele continha"""
+        sent_at = int(sent_at if sent_at is not None else time.time())
+        rows = []
+        for article in articles:
+            published = article.published
+            rows.append((
+                url_hash(article.link),
+                article.link,
+                article.title,
+                article.source,
+                int(published.timestamp()) if published else None,
+                sent_at
+            ))
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute('INSERT INTO reports (sent_at, article_count) VALUES (?, ?)',
+                                        (sent_at, len(rows)))
+            report_id = cursor.lastrowid
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO delivered_articles '
+                '(url_hash, url, title, source, published_at, delivered_at, report_id) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [row + (report_id,) for row in rows]
+            )
+
+        self.compact()
+        return report_id
+
+    def compact(self, now: Optional[float] = None):
+        """Aplica a retenção (dias) e o limite de linhas; VACUUM quando muito foi apagado"""
+        now = now if now is not None else time.time()
+        cutoff = int(now - self.retention_days * 86400)
+
+        with self._lock, self._conn:
+            deleted = self._conn.execute('DELETE FROM delivered_articles WHERE delivered_at < ?',
+                                         (cutoff,)).rowcount
+            self._conn.execute('DELETE FROM reports WHERE sent_at < ?', (cutoff,))
+
+            total = self._conn.execute('SELECT COUNT(*) FROM delivered_articles').fetchone()[0]
+            if total > self.max_rows:
+                # Mantém as entregas mais recentes (usa o índice de delivered_at)
+                deleted += self._conn.execute(
+                    'DELETE FROM delivered_articles WHERE url_hash IN ('
+                    'SELECT url_hash FROM delivered_articles ORDER BY delivered_at ASC LIMIT ?)',
+                    (total - self.max_rows,)
+                ).rowcount
+
+        if deleted > self.max_rows // 10:
+            with self._lock:
+                self._conn.execute('VACUUM')
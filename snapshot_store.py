@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Histórico dos dados coletados em cada execução (JSONL comprimido por dia)
+
+Cada execução grava uma linha JSON (jogos, notícias e saída da IA já
+normalizados) em `<raiz>/AAAA/MM/DD.jsonl.gz`. A data é o próprio caminho do
+arquivo, então buscar um dia é abrir um arquivo; períodos longos são lidos
+em streaming, uma linha por vez, sem carregar o histórico na memória.
+
+No disco, cada execução acrescenta um membro gzip ao arquivo do dia. Num
+bucket (SNAPSHOT_BACKEND=gcs), onde objetos não aceitam append, cada execução
+é um objeto em `snapshots/AAAA/MM/DD/`; ler o dia concatena os membros.
+
+Com um snapshot dá para renderizar ou reenviar um relatório antigo sem rede
+(GmailAPISportsReportREAL.replay_report); os resumos de período ficam em digest.py.
+"""
+
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from models import DEFAULT_TIMEZONE, Article, Match, Opportunity, json_default
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'snapshots')
+
+SNAPSHOT_VERSION = 1
+
+
+def encode_snapshot(data: Dict[str, Any], saved_at: datetime) -> Dict[str, Any]:
+    """Dados de collect_real_data -> registro JSON (modelos viram dicts)"""
+    record = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': saved_at.isoformat(),
+        'collection_time': data.get('collection_time'),
+        'sports_data': {key: [match.to_dict() for match in matches]
+                        for key, matches in (data.get('sports_data') or {}).items()},
+        'news_data': [article.to_dict() for article in data.get('news_data') or []],
+    }
+    if data.get('ai_analysis'):
+        record['ai_analysis'] = data['ai_analysis']
+    if data.get('market_insights'):
+        record['market_insights'] = data['market_insights']
+    return record
+
+
+def decode_snapshot(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Registro JSON -> o mesmo dict que collect_real_data devolve"""
+    data = {
+        'sports_data': {key: [Match.from_dict(match) for match in matches]
+                        for key, matches in record.get('sports_data', {}).items()},
+        'news_data': [Article.from_dict(article) for article in record.get('news_data', [])],
+        'collection_time': record.get('collection_time'),
+    }
+    analysis = record.get('ai_analysis')
+    if analysis:
+        data['ai_analysis'] = dict(analysis, top_10_opportunities=[
+            Opportunity.from_dict(item) for item in analysis.get('top_10_opportunities', [])])
+    if record.get('market_insights'):
+        data['market_insights'] = record['market_insights']
+    return data
+
+
+class DiskSnapshotBackend:
+    """Um arquivo por dia; cada execução é um membro gzip acrescentado no fim"""
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def path_for(self, day: date) -> str:
+        return os.path.join(self.root, f"{day.year:04d}", f"{day.month:02d}", f"{day.day:02d}.jsonl.gz")
+
+    def append(self, day: date, member: bytes, saved_at: datetime) -> str:
+        path = self.path_for(day)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Só o membro novo é escrito; um membro cortado no meio é ignorado na leitura
+            with open(path, 'ab') as file:
+                file.write(member)
+        return path
+
+    def open_day(self, day: date) -> Optional[BinaryIO]:
+        try:
+            return open(self.path_for(day), 'rb')
+        except FileNotFoundError:
+            return None
+
+    def days_in_month(self, year: int, month: int) -> List[int]:
+        try:
+            names = os.listdir(os.path.join(self.root, f"{year:04d}", f"{month:02d}"))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name.split('.', 1)[0]) for name in names if name.endswith('.jsonl.gz'))
+
+    def version(self, day: date) -> Optional[str]:
+        """Muda a cada execução gravada no dia (None se não há snapshot)"""
+        try:
+            stat = os.stat(self.path_for(day))
+        except FileNotFoundError:
+            return None
+        # O tamanho cresce a cada append mesmo se o mtime não avançar entre duas gravações
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class ObjectStoreSnapshotBackend:
+    """Snapshots num bucket compatível com o GCS: um objeto por execução
+
+    Aceita `google.cloud.storage.Bucket` ou `http_cache.LocalBucket` (precisa
+    de `list_blobs(prefix=...)` além da interface de blobs do cache HTTP).
+    """
+
+    def __init__(self, bucket: Any, prefix: str = 'snapshots/'):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _day_prefix(self, day: date) -> str:
+        return f"{self.prefix}{day.year:04d}/{day.month:02d}/{day.day:02d}/"
+
+    def _names(self, day: date) -> List[str]:
+        return sorted(blob.name for blob in self.bucket.list_blobs(prefix=self._day_prefix(day)))
+
+    def append(self, day: date, member: bytes, saved_at: datetime) -> str:
+        # Nome ordenável pela hora da execução; o sufixo evita colisão entre instâncias
+        name = f"{self._day_prefix(day)}{saved_at.strftime('%H%M%S%f')}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+        self.bucket.blob(name).upload_from_string(member)
+        return name
+
+    def open_day(self, day: date) -> Optional[BinaryIO]:
+        names = self._names(day)
+        if not names:
+            return None
+        # Membros gzip concatenados formam um único arquivo gzip válido
+        return io.BytesIO(b''.join(self.bucket.blob(name).download_as_bytes() for name in names))
+
+    def days_in_month(self, year: int, month: int) -> List[int]:
+        prefix = f"{self.prefix}{year:04d}/{month:02d}/"
+        days = set()
+        for blob in self.bucket.list_blobs(prefix=prefix):
+            part = blob.name[len(prefix):].split('/', 1)[0]
+            if part.isdigit():
+                days.add(int(part))
+        return sorted(days)
+
+    def version(self, day: date) -> Optional[str]:
+        names = self._names(day)
+        return f"{len(names)}:{names[-1]}" if names else None
+
+
+class SnapshotStore:
+    """Snapshots diários particionados por data (gzip com uma linha JSON por execução)"""
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_DIR, timezone=DEFAULT_TIMEZONE, compresslevel: int = 6,
+                 backend: Any = None):
+        self.root = root
+        self.backend = backend or DiskSnapshotBackend(root)
+        self.timezone = timezone
+        self.compresslevel = compresslevel
+
+    def path_for(self, day: date) -> str:
+        """Arquivo do dia (só no backend em disco)"""
+        return self.backend.path_for(day)
+
+    def version(self, day: date) -> Optional[str]:
+        return self.backend.version(day)
+
+    def save(self, data: Dict[str, Any], saved_at: Optional[datetime] = None) -> str:
+        """Acrescenta a execução ao dia e devolve onde ela foi gravada
+
+        Gzip aceita membros concatenados: a execução vira um membro novo, sem
+        reler nem regravar as anteriores do dia.
+        """
+        saved_at = saved_at or datetime.now(self.timezone)
+        line = json.dumps(encode_snapshot(data, saved_at), ensure_ascii=False, default=json_default) + '\n'
+        member = gzip.compress(line.encode('utf-8'), compresslevel=self.compresslevel)
+        return self.backend.append(saved_at.date(), member, saved_at)
+
+    def _read_day(self, day: date) -> Iterator[Dict[str, Any]]:
+        raw = self.backend.open_day(day)
+        if raw is None:
+            return
+        try:
+            with raw, gzip.open(raw, 'rt', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+        except (OSError, EOFError, ValueError) as e:
+            print(f"Erro ao ler snapshot de {day.isoformat()}: {e}")
+
+    def runs(self, day: date) -> List[Dict[str, Any]]:
+        """Registros (JSON) de todas as execuções do dia, na ordem em que rodaram"""
+        return list(self._read_day(day))
+
+    def load(self, day: date, run: int = -1) -> Optional[Dict[str, Any]]:
+        """Dados de uma execução do dia (padrão: a última), prontos para renderizar"""
+        runs = self.runs(day)
+        try:
+            return decode_snapshot(runs[run])
+        except IndexError:
+            return None
+
+    def load_saved(self, saved_at: datetime) -> Optional[Dict[str, Any]]:
+        """Dados da execução gravada em `saved_at` (o valor passado para `save`)"""
+        key = saved_at.isoformat()
+        for record in self.runs(saved_at.date()):
+            if record.get('saved_at') == key:
+                return decode_snapshot(record)
+        return None
+
+    def days(self, start: date, end: date) -> Iterator[date]:
+        """Dias com snapshot entre `start` e `end` (inclusive), listando só os meses do período"""
+        month = date(start.year, start.month, 1)
+        while month <= end:
+            for number in self.backend.days_in_month(month.year, month.month):
+                day = month.replace(day=number)
+                if start <= day <= end:
+                    yield day
+            month = (month + timedelta(days=32)).replace(day=1)
+
+    def iter_range(self, start: date, end: date, latest_only: bool = True,
+                   decode: bool = False) -> Iterator[Tuple[date, Dict[str, Any]]]:
+        """(dia, registro) de cada execução do período, em ordem, lendo um dia por vez
+
+        Com `latest_only`, só a última execução de cada dia (reexecuções do
+        mesmo relatório não contam em dobro). `decode=True` devolve modelos
+        em vez de dicts; agregações rápidas devem usar os dicts.
+        """
+        for day in self.days(start, end):
+            records = self._read_day(day)
+            if latest_only:
+                last = None
+                for last in records:
+                    pass
+                records = [last] if last is not None else []
+            for record in records:
+                yield day, decode_snapshot(record) if decode else record
+
+
+def _backend_from_env(root: str):
+    """Escolhe o backend via SNAPSHOT_BACKEND = disk | gcs (bucket em SNAPSHOT_BUCKET)
+
+    /tmp some quando a instância da Cloud Function é reciclada; em produção o
+    histórico (reenvios e resumos de período) precisa do bucket.
+    """
+    if os.environ.get('SNAPSHOT_BACKEND', 'disk').lower() == 'gcs':
+        bucket_name = os.environ.get('SNAPSHOT_BUCKET') or os.environ.get('HTTP_CACHE_BUCKET')
+        try:
+            from google.cloud import storage
+            return ObjectStoreSnapshotBackend(storage.Client().bucket(bucket_name))
+        except Exception as e:
+            print(f"⚠️ Snapshots no GCS indisponíveis ({e}), usando {root}")
+    return DiskSnapshotBackend(root)
+
+
+def get_snapshot_store(root: Optional[str] = None) -> SnapshotStore:
+    """Store de SNAPSHOT_BACKEND/SNAPSHOT_DIR (padrão: disco em /tmp/news_update_cache/snapshots)"""
+    root = root or os.environ.get('SNAPSHOT_DIR') or DEFAULT_SNAPSHOT_DIR
+    return SnapshotStore(root, backend=_backend_from_env(root))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Saúde de cada fonte externa com circuit breaker, persistida entre execuções
+
+Cada chamada atualiza a latência média (EWMA) e a taxa de erro (EWMA) da
+fonte. Fonte que falha seguidamente, erra demais ou fica lenta demais é
+"aberta" por um período de espera: nesse tempo ela não é chamada e o último
+resultado bom é usado no lugar. Passada a espera, uma única chamada de teste
+decide se o circuito fecha (com as médias recomeçando dela) ou reabre com
+espera dobrada.
+
+Os contadores ficam num JSON pequeno, regravado a cada chamada; o último
+resultado bom de cada fonte fica num arquivo próprio, gravado só quando muda.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_HEALTH_PATH = os.path.join(tempfile.gettempdir(), 'news_update_cache', 'source_health.json')
+
+# Acima disso a chamada conta como lenta (o timeout das fontes é 10 s)
+SLOW_SECONDS = 5.0
+MAX_COOLDOWN = 24 * 3600
+
+_UNSAFE_NAME_RE = re.compile(r'[^A-Za-z0-9._-]')
+
+# Sem payload em memória para a fonte (ainda não lido do disco)
+_MISSING = object()
+
+
+def _write_json(path: str, data: Any):
+    """Gravação atômica (arquivo temporário + os.replace)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SourceHealth:
+    """Registro de saúde das fontes (JSON em /tmp, gravação atômica)"""
+
+    def __init__(self, path: str = DEFAULT_HEALTH_PATH, alpha: float = 0.3, failure_threshold: int = 3,
+                 error_rate_threshold: float = 0.6, slow_seconds: float = SLOW_SECONDS, min_calls: int = 3,
+                 cooldown: float = 30 * 60, max_payload_age: float = 24 * 3600,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        # Últimos resultados bons: um arquivo por fonte ao lado do JSON de contadores
+        self.payload_dir = os.path.splitext(path)[0] + '.last_good'
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_seconds = slow_seconds
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.max_payload_age = max_payload_age
+        self.clock = clock
+        self._lock = threading.Lock()
+        # Gravações acontecem fora de self._lock; a versão evita que uma mais antiga sobrescreva a nova
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._saved_version = 0
+        self._payloads: Dict[str, Any] = {}
+        self._payload_locks: Dict[str, threading.Lock] = {}
+        # Fontes em meia-abertura com a chamada de teste em andamento
+        self._probing = set()
+        self._sources: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                sources = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Erro ao ler saúde das fontes: {e}")
+            return {}
+        # Formato antigo guardava o payload junto dos contadores
+        for name, state in sources.items():
+            if 'last_good' in state:
+                self._payloads[name] = state.pop('last_good')
+        return sources
+
+    def payload_path(self, name: str) -> str:
+        return os.path.join(self.payload_dir, _UNSAFE_NAME_RE.sub('_', name) + '.json')
+
+    def _state(self, name: str) -> Dict[str, Any]:
+        return self._sources.setdefault(name, {
+            'latency_ewma': None, 'error_rate': 0.0, 'calls': 0, 'consecutive_failures': 0,
+            'open_until': 0.0, 'trips': 0, 'last_error': None,
+            'last_good_key': None, 'last_good_at': None,
+        })
+
+    def is_open(self, name: str) -> bool:
+        with self._lock:
+            state = self._sources.get(name)
+            return bool(state) and state['open_until'] > self.clock()
+
+    def state(self, name: str) -> Dict[str, Any]:
+        """Métricas da fonte (o payload guardado fica no arquivo da fonte)"""
+        with self._lock:
+            return dict(self._sources.get(name) or {})
+
+    def _update(self, name: str, latency: float, error: Optional[str], half_open: bool):
+        """Atualiza as médias e abre o circuito quando passa dos limites (chamar com o lock)"""
+        state = self._state(name)
+        now = self.clock()
+        failed = error is not None
+        slow = latency >= self.slow_seconds
+
+        state['calls'] += 1
+        if half_open and not failed and not slow:
+            # Teste bom: as médias recomeçam dele, senão a média antiga reabriria a fonte
+            state['latency_ewma'] = latency
+            state['error_rate'] = 0.0
+        else:
+            state['latency_ewma'] = latency if state['latency_ewma'] is None else (
+                self.alpha * latency + (1 - self.alpha) * state['latency_ewma'])
+            state['error_rate'] = self.alpha * (1.0 if failed else 0.0) + (1 - self.alpha) * state['error_rate']
+        state['consecutive_failures'] = state['consecutive_failures'] + 1 if failed else 0
+        state['last_error'] = error
+
+        reason = None
+        if half_open and (failed or slow):
+            reason = 'falhou no teste após a pausa' if failed else 'ainda lenta após a pausa'
+        elif state['consecutive_failures'] >= self.failure_threshold:
+            reason = f"{state['consecutive_failures']} falhas seguidas"
+        elif state['calls'] >= self.min_calls and state['error_rate'] >= self.error_rate_threshold:
+            reason = f"taxa de erro {state['error_rate']:.0%}"
+        elif state['calls'] >= self.min_calls and state['latency_ewma'] >= self.slow_seconds:
+            reason = f"latência média {state['latency_ewma']:.1f}s"
+
+        if reason:
+            # Cada reabertura seguida dobra a espera
+            cooldown = min(self.cooldown * (2 ** state['trips']), MAX_COOLDOWN)
+            state['trips'] += 1
+            state['open_until'] = now + cooldown
+            print(f"⛔ Fonte {name} pausada por {cooldown / 60:.0f} min ({reason})")
+        elif half_open:
+            print(f"✅ Fonte {name} de volta")
+            state['trips'] = 0
+
+    def _admit(self, name: str) -> Tuple[bool, bool]:
+        """(pode chamar, é a chamada de teste da meia-abertura) — chamar com o lock"""
+        state = self._sources.get(name)
+        if not state:
+            return True, False
+        if state['open_until'] > self.clock():
+            return False, False
+        if state['trips'] == 0:
+            return True, False
+        # Meia-abertura: só uma chamada de teste por vez; as demais usam o guardado
+        if name in self._probing:
+            return False, False
+        self._probing.add(name)
+        return True, True
+
+    def _good_key(self, name: str) -> Tuple[bool, Optional[str]]:
+        """(há resultado bom válido, chave dele) — chamar com o lock"""
+        state = self._sources.get(name)
+        if not state or state.get('last_good_at') is None:
+            return False, None
+        if self.clock() - state['last_good_at'] > self.max_payload_age:
+            return False, None
+        return True, state['last_good_key']
+
+    def _read_payload(self, name: str) -> Any:
+        payload = self._payloads.get(name, _MISSING)
+        if payload is not _MISSING:
+            return payload
+        try:
+            with open(self.payload_path(name), 'r', encoding='utf-8') as file:
+                payload = json.load(file)['payload']
+        except FileNotFoundError:
+            payload = None
+        except Exception as e:
+            print(f"Erro ao ler último resultado de {name}: {e}")
+            payload = None
+        self._payloads.setdefault(name, payload)
+        return payload
+
+    def _last_good(self, name: str, key: Optional[str]) -> Optional[Any]:
+        with self._lock:
+            valid, stored_key = self._good_key(name)
+        if not valid or stored_key != key:
+            return None
+        return self._read_payload(name)
+
+    def _store_payload(self, name: str, key: Optional[str], payload: Any):
+        """Grava o resultado bom da fonte, só se mudou (fora do lock principal)"""
+        with self._lock:
+            lock = self._payload_locks.setdefault(name, threading.Lock())
+        with lock:
+            with self._lock:
+                _, stored_key = self._good_key(name)
+                state = self._state(name)
+                previous_at = state['last_good_at']
+            # Mesmo conteúdo e mesma chave: basta renovar a data (vai com os contadores)
+            changed = previous_at is None or stored_key != key or self._read_payload(name) != payload
+            if changed:
+                try:
+                    _write_json(self.payload_path(name), {'key': key, 'payload': payload})
+                except Exception as e:
+                    print(f"Erro ao gravar último resultado de {name}: {e}")
+                    return
+                self._payloads[name] = payload
+            with self._lock:
+                state['last_good_key'] = key
+                state['last_good_at'] = self.clock()
+                self._version += 1
+
+    def call(self, name: str, fetch: Callable[[], Any], key: Optional[str] = None,
+             encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None,
+             keep: Callable[[Any], bool] = None) -> Optional[Any]:
+        """Chama `fetch()` pela fonte `name`, ou devolve o último resultado bom
+
+        `fetch` deve levantar exceção quando a fonte falha. O resultado bom é
+        guardado (via `encode`, em formato JSON) sob `key` (ex.: a data pedida)
+        e só é reaproveitado para a mesma chave. Sem resultado guardado, devolve
+        None e quem chamou usa o seu próprio fallback. Com `keep`, só resultados
+        em que `keep(result)` é verdadeiro substituem o guardado (ex.: `bool`
+        para uma lista vazia não apagar a última coleta boa).
+        """
+        with self._lock:
+            allowed, half_open = self._admit(name)
+            until = self._sources[name]['open_until'] if not allowed else None
+        if not allowed:
+            cached = self._last_good(name, key)
+            status = (f"em pausa até {datetime.fromtimestamp(until).strftime('%H:%M')}"
+                      if until > self.clock() else 'em teste')
+            print(f"⏭️ Fonte {name} {status}; "
+                  f"{'usando o último resultado bom' if cached is not None else 'sem resultado guardado'}")
+            return decode(cached) if cached is not None and decode else cached
+
+        started = time.perf_counter()
+        try:
+            result = fetch()
+        except Exception as e:
+            with self._lock:
+                self._update(name, time.perf_counter() - started, f"{type(e).__name__}: {e}", half_open)
+                self._probing.discard(name)
+                self._version += 1
+            self._persist()
+            print(f"Erro na fonte {name}: {e}")
+            cached = self._last_good(name, key)
+            return decode(cached) if cached is not None and decode else cached
+
+        with self._lock:
+            self._update(name, time.perf_counter() - started, None, half_open)
+            self._probing.discard(name)
+            self._version += 1
+        if keep is None or keep(result):
+            self._store_payload(name, key, encode(result) if encode else result)
+        self._persist()
+        return result
+
+    def _persist(self):
+        """Grava só os contadores; a cópia é feita sob o lock e a escrita fora dele"""
+        with self._lock:
+            version = self._version
+            data = {name: dict(state) for name, state in self._sources.items()}
+        with self._write_lock:
+            if version <= self._saved_version:
+                return
+            try:
+                _write_json(self.path, data)
+                self._saved_version = version
+            except Exception as e:
+                print(f"Erro ao gravar saúde das fontes: {e}")
+
+
+_health: Optional[SourceHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_source_health() -> SourceHealth:
+    """Registro de saúde do processo (SOURCE_HEALTH_PATH muda o arquivo)"""
+    global _health
+    if _health is None:
+        with _health_lock:
+            if _health is None:
+                _health = SourceHealth(os.environ.get('SOURCE_HEALTH_PATH', DEFAULT_HEALTH_PATH))
+    return _health
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Provedores de jogos de futebol consultados em paralelo e mesclados por partida
+
+Cada provedor (temporada das ligas no TheSportsDB, jogos do dia no
+TheSportsDB, football-data.org, arquivo local de jogos) devolve `Match` de
+um intervalo de datas. O ProviderSet consulta todos ao mesmo tempo (um
+provedor a mais não soma latência) e junta as partidas pela chave
+times + dia; cada campo vem do primeiro provedor, na ordem de
+FIELD_PRECEDENCE, que tiver o valor.
+
+Variáveis de ambiente:
+    THESPORTSDB_LEAGUES     ligas do TheSportsDB buscadas por temporada (padrão: 4351, Brasileirão)
+    FOOTBALL_API_KEY        token do football-data.org (sem ele o provedor fica desligado)
+    FOOTBALL_COMPETITIONS   competições do football-data.org (padrão: BSA,CLI)
+    SPORTS_FIXTURES_FILE    arquivo JSON de jogos (lista de Match.to_dict)
+"""
+
+import json
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import pytz
+
+from competitions import thesportsdb_season, tracked_thesportsdb_leagues
+from concurrent_collector import CollectionTask, ConcurrentCollector, HostPoliteness
+from http_client import get_http_client
+from models import DEFAULT_TIMEZONE, Match
+from text_utils import fold_accents
+from source_health import SourceHealth, get_source_health
+
+THESPORTSDB_URL = 'https://www.thesportsdb.com/api/v1/json/3'
+FOOTBALL_DATA_URL = 'https://api.football-data.org/v4'
+
+# Ordem dos provedores por campo; campos fora da tabela seguem a ordem de registro
+FIELD_PRECEDENCE = {
+    'kickoff': ('football-data', 'thesportsdb', 'thesportsdb-season', 'fixtures'),
+    'status': ('football-data', 'thesportsdb', 'thesportsdb-season', 'fixtures'),
+    'score': ('football-data', 'thesportsdb', 'thesportsdb-season', 'fixtures'),
+    'venue': ('thesportsdb', 'thesportsdb-season', 'fixtures', 'football-data'),
+    'home_team': ('thesportsdb', 'thesportsdb-season', 'fixtures', 'football-data'),
+    'away_team': ('thesportsdb', 'thesportsdb-season', 'fixtures', 'football-data'),
+}
+
+MERGED_FIELDS = ('home_team', 'away_team', 'league', 'kickoff', 'sport', 'venue', 'status', 'country',
+                 'score', 'tv', 'game', 'audience', 'viewers', 'attendance')
+# Campos sem padrão no Match: se nenhum provedor preencheu, vale o valor (vazio) do primeiro
+REQUIRED_FIELDS = ('home_team', 'away_team', 'league', 'kickoff')
+
+# Prefixos/sufixos de clube que variam entre provedores ('CR Flamengo' x 'Flamengo')
+_CLUB_AFFIXES = frozenset(('fc', 'ec', 'cr', 'se', 'sc', 'ac', 'ca', 'cf', 'clube', 'club', 'esporte',
+                           'futebol', 'regatas', 'de', 'do', 'da', 'saf'))
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+
+
+def team_key(name: Optional[str]) -> str:
+    """'CR Flamengo' -> 'flamengo', 'São Paulo FC' -> 'sao paulo'"""
+    words = _NON_WORD_RE.sub(' ', fold_accents(name or '')).split()
+    core = [word for word in words if word not in _CLUB_AFFIXES]
+    return ' '.join(core or words)
+
+
+def fixture_key(match: Match) -> Tuple[str, str, date]:
+    """Mesma partida em provedores diferentes: times + dia do jogo (horário de Brasília)"""
+    return team_key(match.home_team), team_key(match.away_team), match.kickoff.astimezone(DEFAULT_TIMEZONE).date()
+
+
+def _days(start: date, end: date):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class SportsProvider:
+    """Fonte de partidas; subclasses implementam `fetch(start, end)`"""
+
+    name = 'provider'
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    @property
+    def host(self) -> Optional[str]:
+        """Host consultado (a cortesia por host do coletor vale por provedor)"""
+        return None
+
+    def fetch(self, start: date, end: date) -> List[Match]:
+        raise NotImplementedError
+
+
+class TheSportsDBProvider(SportsProvider):
+    """Jogos do dia em eventsday.php (uma requisição por dia do intervalo)"""
+
+    name = 'thesportsdb'
+
+    def __init__(self, http=None, health: Optional[SourceHealth] = None, timezone=DEFAULT_TIMEZONE):
+        self.http = http or get_http_client()
+        self.health = health or get_source_health()
+        self.timezone = timezone
+
+    @property
+    def base_url(self) -> str:
+        return os.environ.get('THESPORTSDB_URL', THESPORTSDB_URL)
+
+    @property
+    def host(self) -> Optional[str]:
+        return urlparse(self.base_url).netloc
+
+    def kickoff(self, event: Dict[str, Any], day: date) -> datetime:
+        """Horário do evento (em UTC na API) convertido para Brasília"""
+        raw = event.get('strTimestamp')
+        if not raw and event.get('dateEvent'):
+            raw = f"{event['dateEvent']}T{(event.get('strTime') or '00:00:00')[:8]}"
+        try:
+            kickoff = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return self.timezone.localize(datetime(day.year, day.month, day.day))
+        if kickoff.tzinfo is None:
+            kickoff = pytz.utc.localize(kickoff)
+        return kickoff.astimezone(self.timezone)
+
+    def to_match(self, event: Dict[str, Any], day: date) -> Match:
+        home_score, away_score = event.get('intHomeScore'), event.get('intAwayScore')
+        finished = home_score not in (None, '') and away_score not in (None, '')
+        return Match(
+            home_team=event.get('strHomeTeam') or 'Time Casa',
+            away_team=event.get('strAwayTeam') or 'Time Visitante',
+            league=event.get('strLeague') or 'Campeonato',
+            kickoff=self.kickoff(event, day),
+            venue=event.get('strVenue') or '',
+            country=event.get('strCountry') or '',
+            status='Finalizado' if finished else 'Agendado',
+            score=f"{home_score}-{away_score}" if finished else None
+        )
+
+    def fetch_day(self, day: date) -> List[Dict[str, Any]]:
+        def fetch_events():
+            url = f"{self.base_url}/eventsday.php?d={day.isoformat()}&s=Soccer"
+            # Agenda do dia muda pouco ao longo da manhã
+            response = self.http.get_cached(url, default_max_age=15 * 60, timeout=10)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            return response.json().get('events') or []
+
+        # Fonte instável ou lenta fica em pausa e o último resultado bom do dia é usado
+        return self.health.call(self.name, fetch_events, key=day.isoformat()) or []
+
+    def fetch(self, start: date, end: date) -> List[Match]:
+        return [self.to_match(event, day) for day in _days(start, end) for event in self.fetch_day(day)]
+
+
+class TheSportsDBSeasonProvider(TheSportsDBProvider):
+    """Temporada inteira de cada liga em eventsseason.php (uma requisição por liga e temporada)
+
+    A tabela da temporada muda pouco: fica no cache HTTP local por 6 horas, e
+    qualquer intervalo de datas dentro dela sai sem nova requisição.
+    """
+
+    name = 'thesportsdb-season'
+
+    def __init__(self, league_ids: Optional[Sequence[str]] = None, http=None,
+                 health: Optional[SourceHealth] = None, timezone=DEFAULT_TIMEZONE):
+        super().__init__(http, health, timezone)
+        if league_ids is None:
+            configured = os.environ.get('THESPORTSDB_LEAGUES')
+            league_ids = ([league.strip() for league in configured.split(',') if league.strip()]
+                          if configured else tracked_thesportsdb_leagues())
+        self.league_ids = tuple(league_ids)
+
+    @staticmethod
+    def season_for(league_id: str, day: date) -> str:
+        return thesportsdb_season(league_id, day)
+
+    def fetch_season(self, league_id: str, season: str) -> List[Dict[str, Any]]:
+        def fetch_events():
+            url = f"{self.base_url}/eventsseason.php?id={league_id}&s={season}"
+            response = self.http.get_cached(url, default_max_age=6 * 3600, timeout=10)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            return response.json().get('events') or []
+
+        return self.health.call(f"{self.name}.{league_id}", fetch_events, key=season) or []
+
+    def fetch(self, start: date, end: date) -> List[Match]:
+        matches = []
+        for league_id in self.league_ids:
+            # Intervalo curto: no máximo duas temporadas (a de `start` e a de `end`)
+            for season in sorted({self.season_for(league_id, start), self.season_for(league_id, end)}):
+                for event in self.fetch_season(league_id, season):
+                    match = self.to_match(event, start)
+                    if start <= match.kickoff.date() <= end:
+                        matches.append(match)
+        return matches
+
+
+class FootballDataProvider(SportsProvider):
+    """football-data.org v4: um intervalo de datas por requisição (exige FOOTBALL_API_KEY)"""
+
+    name = 'football-data'
+
+    STATUS = {
+        'SCHEDULED': 'Agendado', 'TIMED': 'Agendado', 'IN_PLAY': 'Ao Vivo', 'PAUSED': 'Ao Vivo',
+        'FINISHED': 'Finalizado', 'POSTPONED': 'Adiado', 'SUSPENDED': 'Suspenso', 'CANCELLED': 'Cancelado',
+    }
+
+    def __init__(self, api_key: Optional[str] = None, competitions: Optional[str] = None, http=None,
+                 health: Optional[SourceHealth] = None, timezone=DEFAULT_TIMEZONE):
+        self.api_key = api_key if api_key is not None else os.environ.get('FOOTBALL_API_KEY', '')
+        self.competitions = competitions or os.environ.get('FOOTBALL_COMPETITIONS', 'BSA,CLI')
+        self.http = http or get_http_client()
+        self.health = health or get_source_health()
+        self.timezone = timezone
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def base_url(self) -> str:
+        return os.environ.get('FOOTBALL_DATA_URL', FOOTBALL_DATA_URL)
+
+    @property
+    def host(self) -> Optional[str]:
+        return urlparse(self.base_url).netloc
+
+    def to_match(self, item: Dict[str, Any]) -> Match:
+        def team(side):
+            data = item.get(side) or {}
+            return data.get('shortName') or data.get('name') or ''
+
+        full_time = ((item.get('score') or {}).get('fullTime')) or {}
+        score = None
+        if full_time.get('home') is not None and full_time.get('away') is not None:
+            score = f"{full_time['home']}-{full_time['away']}"
+        kickoff = datetime.fromisoformat(item['utcDate'].replace('Z', '+00:00')).astimezone(self.timezone)
+        return Match(
+            home_team=team('homeTeam'),
+            away_team=team('awayTeam'),
+            league=(item.get('competition') or {}).get('name') or 'Campeonato',
+            kickoff=kickoff,
+            venue=item.get('venue') or '',
+            status=self.STATUS.get(item.get('status'), 'Agendado'),
+            country=((item.get('area') or {}).get('name')) or '',
+            score=score
+        )
+
+    def fetch(self, start: date, end: date) -> List[Match]:
+        def fetch_matches():
+            url = (f"{self.base_url}/matches?competitions={self.competitions}"
+                   f"&dateFrom={start.isoformat()}&dateTo={end.isoformat()}")
+            response = self.http.get_cached(url, default_max_age=15 * 60, timeout=10,
+                                            headers={'X-Auth-Token': self.api_key})
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            return response.json().get('matches') or []
+
+        items = self.health.call(self.name, fetch_matches, key=f"{start.isoformat()}/{end.isoformat()}") or []
+        matches = []
+        for item in items:
+            try:
+                matches.append(self.to_match(item))
+            except (KeyError, ValueError) as e:
+                print(f"⚠️ Partida ignorada do football-data.org: {e}")
+        return matches
+
+
+class FixtureFileProvider(SportsProvider):
+    """Jogos de um arquivo JSON local (lista de Match.to_dict), para testes e ajustes manuais"""
+
+    name = 'fixtures'
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.environ.get('SPORTS_FIXTURES_FILE', '')
+        self._cache: Optional[Tuple[int, List[Match]]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _load(self) -> List[Match]:
+        mtime = os.stat(self.path).st_mtime_ns
+        if self._cache and self._cache[0] == mtime:
+            return self._cache[1]
+        with open(self.path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        matches = [Match.from_dict(item) for item in (data.get('fixtures', []) if isinstance(data, dict) else data)]
+        self._cache = (mtime, matches)
+        return matches
+
+    def fetch(self, start: date, end: date) -> List[Match]:
+        return [match for match in self._load()
+                if start <= match.kickoff.astimezone(DEFAULT_TIMEZONE).date() <= end]
+
+
+def merge_fixtures(results: Sequence[Tuple[str, List[Match]]],
+                   precedence: Optional[Dict[str, Sequence[str]]] = None) -> List[Match]:
+    """Junta as partidas de vários provedores (na ordem de registro) numa lista por horário
+
+    Uma passada agrupa por fixture_key e outra resolve cada grupo; como cada
+    grupo tem no máximo um item por provedor, o custo é linear no total de partidas.
+    """
+    precedence = FIELD_PRECEDENCE if precedence is None else precedence
+    order = [name for name, _ in results]
+    groups: Dict[Tuple[str, str, date], Dict[str, Match]] = {}
+    for name, matches in results:
+        for match in matches:
+            # Duplicata no mesmo provedor: fica a primeira
+            groups.setdefault(fixture_key(match), {}).setdefault(name, match)
+
+    rank = {field: list(names) + [name for name in order if name not in names]
+            for field, names in precedence.items()}
+    merged = []
+    for candidates in groups.values():
+        if len(candidates) == 1:
+            merged.append(next(iter(candidates.values())))
+            continue
+        values = {}
+        for field in MERGED_FIELDS:
+            for name in rank.get(field, order):
+                match = candidates.get(name)
+                value = getattr(match, field) if match is not None else None
+                if value:
+                    values[field] = value
+                    break
+        first = candidates[next(name for name in order if name in candidates)]
+        for field in REQUIRED_FIELDS:
+            values.setdefault(field, getattr(first, field))
+        merged.append(Match(**values))
+    merged.sort(key=lambda match: match.kickoff)
+    return merged
+
+
+class ProviderSet:
+    """Consulta os provedores ativos em paralelo e mescla as partidas"""
+
+    def __init__(self, providers: Sequence[SportsProvider], precedence: Optional[Dict[str, Sequence[str]]] = None,
+                 source_timeout: float = 10.0, global_deadline: float = 20.0):
+        self.providers = list(providers)
+        self.precedence = precedence
+        self.collector = ConcurrentCollector(
+            max_workers=max(1, len(self.providers)),
+            source_timeout=source_timeout,
+            global_deadline=global_deadline,
+            politeness=HostPoliteness(max_per_host=2, min_interval=0.0)
+        )
+
+    def fixtures(self, start: date, end: Optional[date] = None) -> List[Match]:
+        """Partidas de `start` a `end` (inclusive; padrão: só `start`) de todos os provedores"""
+        end = end or start
+        active = [provider for provider in self.providers if provider.enabled]
+        results = self.collector.collect([
+            CollectionTask(provider.name, lambda provider=provider: provider.fetch(start, end),
+                           host=provider.host, default=[])
+            for provider in active
+        ])
+        return merge_fixtures([(provider.name, results[provider.name]) for provider in active], self.precedence)
+
+
+def default_providers() -> ProviderSet:
+    """Temporadas do TheSportsDB, football-data.org (com FOOTBALL_API_KEY) e SPORTS_FIXTURES_FILE
+
+    Todos buscam um intervalo inteiro com o mesmo número de requisições de um
+    dia só; TheSportsDBProvider (uma requisição por dia) fica disponível à parte.
+    """
+    return ProviderSet([TheSportsDBSeasonProvider(), FootballDataProvider(), FixtureFileProvider()])
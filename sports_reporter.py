@@ -1,6 +1,7 @@
-import requests
 import json
+from dataclasses import replace
 from datetime import datetime, timedelta
+import pytz
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -9,36 +10,42 @@ from email.mime.base import MIMEBase
 from email import encoders
 import os
 
+from http_client import get_http_client
+from models import Article, Match, format_audience
+from source_health import get_source_health
+from competitions import is_tracked_league, league_audience, league_priority
+from sports_providers import default_providers
+from fixture_window import FixtureWindow
+from holiday_calendar import NagerHolidays, get_holiday_calendar
+from news_selection import NewsSelector, selection_seed
+from report_templates import render_daily_report
+from tracing import traced
+
 class DailySportsReport:
     def __init__(self, email_config):
-        self.today = datetime.now()
+        self.timezone = pytz.timezone('America/Sao_Paulo')
+        self.today = datetime.now(self.timezone)
         self.yesterday = self.today - timedelta(days=1)
         self.tomorrow = self.today + timedelta(days=1)
         self.email_config = email_config
+        self.http = get_http_client()
+        self.health = get_source_health()
+        self.providers = default_providers()
+        self.report_data = None
         
-    def get_football_games(self, date):
-        """Coleta jogos de futebol usando APIs gratuitas"""
-        games = []
+    @traced('sources.football')
+    def get_football_games(self, date, window=None):
+        """Jogos de futebol do dia de todos os provedores (TheSportsDB, football-data.org, arquivo local)
         
+        Com `window` (FixtureWindow já carregada), o dia é só um recorte dela, sem rede.
+        """
+        games = []
         try:
-            # TheSportsDB API - jogos do dia
-            date_str = date.strftime('%Y-%m-%d')
-            url = f"https://www.thesportsdb.com/api/v1/json/3/eventsday.php?d={date_str}&s=Soccer"
-            
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('events'):
-                    for event in data['events'][:5]:  # Limitar a 5 jogos
-                        if event.get('strLeague') and any(keyword in event.get('strLeague', '').lower() 
-                                                        for keyword in ['brazil', 'brasileir', 'copa', 'libertadores']):
-                            games.append({
-                                'time': event.get('strTime', '00:00')[:5],
-                                'home': event.get('strHomeTeam', 'Time Casa'),
-                                'away': event.get('strAwayTeam', 'Time Visitante'),
-                                'competition': event.get('strLeague', 'Campeonato'),
-                                'audience': self.estimate_audience(event.get('strLeague', ''))
-                            })
+            if window is None or not window.covers(date.date()):
+                window = FixtureWindow.load(self.providers, date.date(), date.date())
+            for match in window.day(date.date()):
+                if is_tracked_league(match.league):
+                    games.append(replace(match, audience=match.audience or self.estimate_audience(match.league)))
         except Exception as e:
             print(f"Erro ao buscar jogos: {str(e)}")
         
@@ -46,36 +53,35 @@ class DailySportsReport:
         if not games:
             games = self.get_fallback_games(date)
             
-        return games[:3]  # Máximo 3 jogos
+        # Máximo 3 jogos: os das competições mais importantes, exibidos por horário
+        games = sorted(games, key=lambda match: (league_priority(match.league), match.kickoff))[:3]
+        return sorted(games, key=lambda match: match.kickoff)
     
     def get_fallback_games(self, date):
         """Jogos fictícios quando API falha"""
         fallback_games = [
-            {"time": "16:00", "home": "Flamengo", "away": "Vasco", "competition": "Brasileirão", "audience": "8M"},
-            {"time": "18:30", "home": "Corinthians", "away": "Palmeiras", "competition": "Brasileirão", "audience": "10M"},
-            {"time": "21:00", "home": "São Paulo", "away": "Santos", "competition": "Brasileirão", "audience": "6M"}
+            ("16:00", "Flamengo", "Vasco", "8M"),
+            ("18:30", "Corinthians", "Palmeiras", "10M"),
+            ("21:00", "São Paulo", "Santos", "6M")
         ]
         
         # Variar baseado no dia da semana
         day_of_week = date.weekday()
-        return [fallback_games[day_of_week % len(fallback_games)]]
+        time, home, away, audience = fallback_games[day_of_week % len(fallback_games)]
+        hour, minute = map(int, time.split(':'))
+        return [Match(
+            home_team=home,
+            away_team=away,
+            league='Brasileirão',
+            kickoff=date.replace(hour=hour, minute=minute, second=0, microsecond=0),
+            audience=audience
+        )]
     
     def estimate_audience(self, competition):
-        """Estima audiência baseada na competição"""
-        audience_map = {
-            'brasileirao': '8M',
-            'libertadores': '12M',
-            'copa do brasil': '6M',
-            'champions league': '15M',
-            'premier league': '10M',
-            'la liga': '8M'
-        }
-        
-        for key, audience in audience_map.items():
-            if key in competition.lower():
-                return audience
-        return '5M'
+        """Estima audiência baseada na competição (cadastro de competitions.py)"""
+        return format_audience(league_audience(competition))
     
+    @traced('sources.esports')
     def get_esports_events(self, date):
         """Coleta eventos de e-sports"""
         esports = []
@@ -84,62 +90,48 @@ class DailySportsReport:
             # Eventos fixos baseados no dia da semana
             day_of_week = date.weekday()
             
+            # (horário, liga, time A, time B, jogo, audiência)
             events_by_day = {
-                0: [{"time": "20:00", "event": "CBLOL: LOUD vs paiN Gaming", "game": "League of Legends", "audience": "800K"}],
-                1: [{"time": "21:30", "event": "CS Major: FURIA vs Astralis", "game": "CS2", "audience": "1.2M"}],
-                2: [{"time": "19:00", "event": "Free Fire: Corinthians vs Flamengo", "game": "Free Fire", "audience": "2M"}],
-                3: [{"time": "20:30", "event": "Valorant Champions: LOUD vs Sentinels", "game": "Valorant", "audience": "900K"}],
-                4: [{"time": "21:00", "event": "CBLOL Finals", "game": "League of Legends", "audience": "1.5M"}],
-                5: [{"time": "15:00", "event": "CS2 Arena: SK vs Imperial", "game": "CS2", "audience": "600K"}],
-                6: [{"time": "16:00", "event": "Free Fire World Series", "game": "Free Fire", "audience": "3M"}]
+                0: [("20:00", "CBLOL", "LOUD", "paiN Gaming", "League of Legends", "800K")],
+                1: [("21:30", "CS Major", "FURIA", "Astralis", "CS2", "1.2M")],
+                2: [("19:00", "Free Fire", "Corinthians", "Flamengo", "Free Fire", "2M")],
+                3: [("20:30", "Valorant Champions", "LOUD", "Sentinels", "Valorant", "900K")],
+                4: [("21:00", "CBLOL Finals", "", "", "League of Legends", "1.5M")],
+                5: [("15:00", "CS2 Arena", "SK", "Imperial", "CS2", "600K")],
+                6: [("16:00", "Free Fire World Series", "", "", "Free Fire", "3M")]
             }
             
-            esports = events_by_day.get(day_of_week, [])
+            for time, league, home, away, game, audience in events_by_day.get(day_of_week, []):
+                hour, minute = map(int, time.split(':'))
+                esports.append(Match(
+                    home_team=home,
+                    away_team=away,
+                    league=league,
+                    kickoff=date.replace(hour=hour, minute=minute, second=0, microsecond=0),
+                    sport='E-Sports',
+                    game=game,
+                    audience=audience
+                ))
             
         except Exception as e:
             print(f"Erro ao buscar e-sports: {str(e)}")
         
         return esports[:2]  # Máximo 2 eventos
     
+    @traced('sources.nager')
     def get_holidays_events(self, date):
-        """Coleta feriados e datas especiais"""
-        special_events = []
-        
+        """Feriados e datas comerciais dos próximos 30 dias (calendário pré-carregado)"""
         try:
-            # Nager.Date API para feriados brasileiros
-            year = date.year
-            url = f"https://date.nager.at/api/v3/PublicHolidays/{year}/BR"
-            
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                holidays = response.json()
-                
-                # Verificar próximos feriados (próximos 30 dias)
-                for holiday in holidays:
-                    holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-                    days_diff = (holiday_date - date).days
-                    
-                    if 0 <= days_diff <= 30:
-                        special_events.append({
-                            'date': holiday_date.strftime('%d/%m'),
-                            'name': holiday['name'],
-                            'days_until': days_diff,
-                            'impact': 'Alto tráfego esperado' if days_diff <= 3 else 'Monitorar campanhas'
-                        })
+            calendar = get_holiday_calendar(date.date(), fetch_year=NagerHolidays(self.http, self.health))
+            # Sem nada nos próximos 30 dias, a próxima data especial, mesmo que mais longe
+            return calendar.upcoming(date.date(), limit=3) or calendar.next_dates(date.date(), limit=1)
         except Exception as e:
             print(f"Erro ao buscar feriados: {str(e)}")
-        
-        # Eventos fixos importantes
-        fixed_events = [
-            {'date': '25/12', 'name': 'Natal', 'impact': 'Campanhas familiares'},
-            {'date': '01/01', 'name': 'Ano Novo', 'impact': 'Resoluções esportivas'},
-            {'date': '29/11', 'name': 'Black Friday', 'impact': 'Pico de vendas'}
-        ]
-        
-        return special_events[:3] if special_events else fixed_events[:1]
+            return []
     
-    def get_sports_news(self):
-        """Coleta notícias esportivas relevantes"""
+    @traced('sources.news')
+    def get_sports_news(self, teams=()):
+        """Coleta notícias esportivas relevantes (as que citam `teams` primeiro)"""
         news = [
             "Neymar volta aos treinos - impacto nas apostas esportivas",
             "Regulamentação das apostas: nova lei aprovada no Senado",
@@ -150,20 +142,35 @@ class DailySportsReport:
             "Brasileirão 2025: novas regras de fair play financeiro"
         ]
         
-        # Retornar 3 notícias aleatórias baseadas no dia
-        import random
-        random.seed(self.today.day)  # Seed baseada no dia para consistência
-        return random.sample(news, min(3, len(news)))
+        # 3 notícias por pontuação; empates mudam de um dia para o outro, mas não na mesma data
+        articles = [Article(title=title, link='', source='Artplan', category='Esportes') for title in news]
+        selected = NewsSelector(teams).select(articles, 3, seed=selection_seed(self.today.date()))
+        return [article.title for article in selected]
     
     def generate_report(self):
         """Gera relatório completo personalizado para Artplan"""
-        yesterday_games = self.get_football_games(self.yesterday)
-        today_games = self.get_football_games(self.today)
-        tomorrow_games = self.get_football_games(self.tomorrow)
-        
+        # Ontem, hoje e amanhã numa busca só
+        window = FixtureWindow.load(self.providers, self.yesterday.date(), self.tomorrow.date())
+        yesterday_games = self.get_football_games(self.yesterday, window)
+        today_games = self.get_football_games(self.today, window)
+        tomorrow_games = self.get_football_games(self.tomorrow, window)
         esports_today = self.get_esports_events(self.today)
         special_events = self.get_holidays_events(self.today)
-        news = self.get_sports_news()
+        news = self.get_sports_news(teams=[team for game in today_games + tomorrow_games
+                                           for team in (game.home_team, game.away_team) if team])
+        
+        # Os mesmos dados alimentam a versão HTML (format_html_report)
+        self.report_data = {
+            'yesterday': self.yesterday,
+            'today': self.today,
+            'tomorrow': self.tomorrow,
+            'yesterday_games': yesterday_games,
+            'today_games': today_games,
+            'tomorrow_games': tomorrow_games,
+            'esports_today': esports_today,
+            'special_events': special_events,
+            'news': news
+        }
         
         report = f"""📊 RELATÓRIO ESPORTIVO DIÁRIO ARTPLAN - {self.today.strftime('%d/%m/%Y')}
 
@@ -211,7 +218,7 @@ class DailySportsReport:
         
         formatted = ""
         for game in games:
-            formatted += f"- {game['time']} - {game['home']} vs {game['away']} - {game['competition']} (Audiência: {game['audience']})\n"
+            formatted += f"- {game.time} - {game.home_team} vs {game.away_team} - {game.league} (Audiência: {game.audience})\n"
         return formatted
     
     def format_esports(self, events):
@@ -220,7 +227,7 @@ class DailySportsReport:
         
         formatted = ""
         for event in events:
-            formatted += f"- {event['time']} - {event['event']} ({event['game']}) - Audiência: {event['audience']}\n"
+            formatted += f"- {event.time} - {event.event_name} ({event.game}) - Audiência: {event.audience}\n"
         return formatted
     
     def format_special_events(self, events):
@@ -229,8 +236,8 @@ class DailySportsReport:
         
         formatted = ""
         for event in events:
-            days_text = f"em {event['days_until']} dias" if event['days_until'] > 0 else "hoje"
-            formatted += f"- {event['name']} ({event['date']}) - {days_text} - {event['impact']}\n"
+            days_text = f"em {event.days_until} dias" if event.days_until > 0 else "hoje"
+            formatted += f"- {event.name} ({event.date_label}) - {days_text} - {event.impact}\n"
         return formatted
     
     def format_news(self, news):
@@ -276,37 +283,8 @@ class DailySportsReport:
             print(f"❌ Erro ao enviar email: {str(e)}")
             return False
     
-    def format_html_report(self, text_report):
-        """Converte relatório texto para HTML com estilo Artplan"""
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{ font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: white; padding: 20px; }}
-                .section {{ margin: 20px 0; padding: 15px; border-left: 4px solid #667eea; background: #f8f9fa; }}
-                .section h3 {{ margin-top: 0; color: #667eea; }}
-                .game {{ background: white; margin: 10px 0; padding: 10px; border-radius: 5px; border: 1px solid #e0e0e0; }}
-                .footer {{ background: #333; color: white; padding: 15px; text-align: center; border-radius: 0 0 10px 10px; }}
-                .emoji {{ font-size: 1.2em; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>📊 Relatório Esportivo Artplan</h1>
-                <p>{self.today.strftime('%d/%m/%Y')}</p>
-            </div>
-            <div class="content">
-                <pre style="white-space: pre-wrap; font-family: inherit;">{text_report}</pre>
-            </div>
-            <div class="footer">
-                <p>🎯 <strong>Artplan Analytics</strong> | analytics.artplan@gmail.com</p>
-                <p>Relatório automático gerado às {self.today.strftime('%H:%M')}</p>
-            </div>
-        </body>
-        </html>
-        """
-        return html
\ No newline at end of file
+    def format_html_report(self, text_report=None):
+        """Converte o relatório para HTML com estilo Artplan (seções estruturadas)"""
+        if self.report_data is None:
+            self.generate_report()
+        return render_daily_report(self.report_data, self.today)
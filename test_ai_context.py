@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do contexto dos prompts com orçamento de tokens
+"""
+
+from datetime import datetime, timedelta
+
+from ai_context import ContextBuilder, estimate_tokens
+from models import DEFAULT_TIMEZONE, Article, Match, parse_audience
+
+NOW = DEFAULT_TIMEZONE.localize(datetime(2025, 6, 9, 12, 0))
+
+
+def _match(home, away, league='Brasileirão', hours=2, **extra):
+    return Match(home, away, league, NOW + timedelta(hours=hours), **extra)
+
+
+def test_parse_audience_formats():
+    assert parse_audience('8M') == 8_000_000
+    assert parse_audience('1.5M') == 1_500_000
+    assert parse_audience('15K espectadores esperados') == 15_000
+    assert parse_audience('30.000 pessoas') == 30_000
+    assert parse_audience('') is None and parse_audience('Audiência') is None
+
+
+def test_ranks_classics_and_audience_first():
+    sports_data = {
+        'games_today': [
+            _match('Bragantino', 'Cuiabá', 'Campeonato Estadual', hours=1),
+            _match('Grêmio', 'Internacional', hours=3),
+            _match('Flamengo', 'Vasco', 'Libertadores', hours=5),
+        ]
+    }
+    context = ContextBuilder(token_budget=50, now=NOW).build(sports_data)
+
+    assert 'Flamengo vs Vasco' in context.sports_summary and 'clássico' in context.sports_summary
+    assert 'Bragantino' not in context.sports_summary
+    # A saída segue a ordem do horário, não a da pontuação
+    assert context.sports_summary.index('Grêmio') < context.sports_summary.index('Flamengo')
+
+
+def test_budget_holds_as_data_grows_and_every_section_is_represented():
+    teams = ['Flamengo', 'Palmeiras', 'Corinthians', 'Santos', 'Bahia', 'Vitória']
+    sports_data = {
+        'games_today': [_match(teams[i % 6], teams[(i + 1) % 6], hours=i % 10) for i in range(5000)],
+        'weekly_schedule': [_match('Bahia', 'Vitória', hours=24 * (1 + i % 6)) for i in range(5000)],
+        'esports_today': [_match('LOUD', 'FURIA', 'CBLOL', viewers='50K')],
+    }
+    news = [Article(f"Notícia {i}", f"https://example.com/{i}", 'GloboEsporte', 'Futebol',
+                    published=NOW - timedelta(hours=i)) for i in range(2000)]
+
+    context = ContextBuilder(token_budget=600, now=NOW).build(sports_data, news)
+    assert context.tokens <= 600
+    assert estimate_tokens(context.sports_summary + context.news_summary) <= 600
+    assert context.included + context.dropped == 12001
+    for header in ('JOGOS DE HOJE', 'PRÓXIMOS DIAS', 'E-SPORTS HOJE'):
+        assert header in context.sports_summary
+    assert 'Notícia 0 ' in context.news_summary
+
+
+if __name__ == "__main__":
+    test_parse_audience_formats()
+    test_ranks_classics_and_audience_first()
+    test_budget_holds_as_data_grows_and_every_section_is_represented()
+    print("✅ Contexto dos prompts: OK")
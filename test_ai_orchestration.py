@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes das chamadas de IA em paralelo, com streaming e prazo
+"""
+
+import time
+from datetime import datetime
+
+from llm_cache import LLMCache
+from models import Match
+from real_ai_analysis import RealAIAnalysis
+
+SPORTS = {'games_today': [Match('Flamengo', 'Vasco', 'Brasileirão', datetime(2025, 6, 9, 16, 0))]}
+
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class StreamingModel:
+    """Análise chega em pedaços e trava no meio da 3ª oportunidade; insights são rápidos"""
+
+    def generate_content(self, prompt, stream=False):
+        if 'TOP 10' not in prompt:
+            return iter([Chunk("Insights de mercado rápidos")])
+        return self._slow_analysis()
+
+    def _slow_analysis(self):
+        yield Chunk('[{"title": "🏆 Flamengo vs Vasco", "justification": "Clássico", '
+                    '"recommendation": "Mobile"}, {"title": "⚽ Clás')
+        yield Chunk('sico no Maracanã", "justification": "Estádio cheio"}, '
+                    '{"title": "🎮 CBLOL à noite", "justification": "Público jov')
+        time.sleep(1.0)
+        yield Chunk('em"}, {"title": "Nunca chega a tempo"}]')
+
+
+def test_deadline_keeps_streamed_opportunities_and_fast_section():
+    ai = RealAIAnalysis(api_key='', cache=LLMCache(backend=None))
+    ai.model = StreamingModel()
+
+    started = time.monotonic()
+    result = ai.analyze_all(SPORTS, [], deadline=0.3)
+    assert time.monotonic() - started < 0.9
+
+    analysis = result['analysis']
+    opportunities = analysis['top_10_opportunities']
+    assert analysis['partial'] and len(opportunities) == 10
+    assert [item.label for item in opportunities[:3]] == [
+        '1. 🏆 Flamengo vs Vasco', '2. ⚽ Clássico no Maracanã', '3. 🎮 CBLOL à noite']
+    # O item cortado pelo prazo é reparado com o que já tinha chegado
+    assert opportunities[2].justification == 'Público jov' and opportunities[2].source == 'ai'
+    assert opportunities[3].rank == 4 and opportunities[3].source == 'fallback'
+    assert result['market_insights'] == "Insights de mercado rápidos"
+
+
+if __name__ == "__main__":
+    test_deadline_keeps_streamed_opportunities_and_fast_section()
+    print("✅ Orquestração da IA: OK")
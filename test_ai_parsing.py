@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da saída estruturada (JSON) das oportunidades de IA
+"""
+
+import json
+
+from ai_opportunities import OpportunityParser, parse_opportunities
+from models import Opportunity
+from report_templates import render_opportunities
+
+ITEMS = [{'rank': 7, 'title': f'Oportunidade {i}', 'justification': f'Motivo "{i}" [dados]',
+          'recommendation': 'Ativar {campanha}'} for i in range(1, 13)]
+
+
+def test_parses_objects_as_chunks_arrive_and_ignores_surrounding_text():
+    text = 'Claro! Segue:\n```json\n' + json.dumps(ITEMS, ensure_ascii=False) + '\n```\nObs: [nada]'
+    parser = OpportunityParser()
+    for start in range(0, len(text), 7):
+        parser.feed(text[start:start + 7])
+        if start == 7 * 20:
+            assert 0 < len(parser.opportunities) < 10
+    opportunities = parser.close()
+
+    # Limite de 10, posição no array vale mais que o `rank` do modelo
+    assert [item.rank for item in opportunities] == list(range(1, 11))
+    assert opportunities[0] == Opportunity(1, 'Oportunidade 1', 'Motivo "1" [dados]', 'Ativar {campanha}')
+
+
+def test_skips_invalid_items_and_nested_objects():
+    text = json.dumps({'opportunities': [
+        {'title': 'Válida', 'tags': [{'title': 'aninhado'}]},
+        {'justification': 'sem título'},
+        'texto solto',
+        {'title': '  Espaços\n extras  ', 'recommendation': None},
+    ]})
+    parser = OpportunityParser()
+    parser.feed(text)
+    assert [item.title for item in parser.close()] == ['Válida', 'Espaços extras']
+    assert parser.invalid == 1
+
+
+def test_repairs_truncated_response():
+    full = json.dumps(ITEMS[:3], ensure_ascii=False)
+    cut_in_string = full[:full.index('Motivo \\"3') + 5]
+    opportunities = parse_opportunities(cut_in_string)
+    assert len(opportunities) == 3 and opportunities[2].justification == 'Motiv'
+
+    # Cortado no meio de uma chave: volta até o último campo completo
+    parser = OpportunityParser()
+    parser.feed('[{"title": "A", "justification": "ok", "recomm')
+    assert parser.close() == [Opportunity(1, 'A', 'ok')] and parser.repaired
+
+    assert parse_opportunities('1. 🏆 texto livre sem JSON') == []
+
+
+def test_renderer_consumes_typed_opportunities():
+    html = render_opportunities([Opportunity(1, 'Clássico <Fla x Flu>', 'Audiência', source='ai')])
+    assert '1. Clássico &lt;Fla x Flu&gt;' in html and 'GEMINI' in html
+    assert '<strong>Recomendação:</strong> -' in html
+
+
+if __name__ == "__main__":
+    test_parses_objects_as_chunks_arrive_and_ignores_surrounding_text()
+    test_skips_invalid_items_and_nested_objects()
+    test_repairs_truncated_response()
+    test_renderer_consumes_typed_opportunities()
+    print("✅ Oportunidades estruturadas: OK")
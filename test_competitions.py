@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cadastro de competições (apelidos, filtro e audiência)
+"""
+
+import time
+
+from competitions import CompetitionRegistry, classify_league, is_tracked_league, league_audience
+
+
+def test_aliases_from_every_provider_resolve_to_the_same_competition():
+    for name in ('Brazilian Serie A', 'Campeonato Brasileiro Série A', 'Brasileirão Série A 2024', 'BRASILEIRAO'):
+        assert classify_league(name).id == 'brasileirao-a', name
+    assert classify_league('Campeonato Brasileiro Série B').id == 'brasileirao-b'
+    assert classify_league('CONMEBOL Libertadores').id == 'libertadores'
+    # O apelido mais específico ganha do genérico 'brazil'
+    assert classify_league('Brazil - Copa do Brasil').id == 'copa-do-brasil'
+    assert classify_league('Brazil Serie C').id == 'brasil'
+    assert classify_league('Italian Serie A') is None and classify_league(None) is None
+
+
+def test_tracked_filter_and_audience():
+    assert is_tracked_league('Copa Libertadores') and is_tracked_league('Copa do Brasil')
+    assert not is_tracked_league('English Premier League') and not is_tracked_league('Copa del Rey')
+    assert not is_tracked_league('UEFA Champions League') and not is_tracked_league('')
+    assert league_audience('Copa Libertadores') == 12_000_000
+    assert league_audience('CBLOL 2024') == 300_000
+    # 'Valorant Champions' não é a Champions League: fica com a estimativa padrão
+    assert league_audience('Valorant Champions') == 5_000_000
+
+
+def test_tracked_leagues_are_pinned():
+    # Mudou o cadastro e esta lista quebrou? Confirme que a mudança no relatório é intencional
+    tracked = ['Brazilian Serie A', 'Campeonato Brasileiro Série B', 'Brazil Serie C', 'Brasileiro Feminino',
+               'Copa do Brasil', 'Copa do Nordeste', 'Copa Verde', 'Campeonato Paulista', 'Carioca',
+               'Copa Libertadores', 'CONMEBOL Sudamericana', 'Copa América', 'Supercopa Brasileira']
+    ignored = ['English Premier League', 'UEFA Champions League', 'Spanish La Liga', 'Italian Serie A',
+               'Copa del Rey', 'Copa Argentina', 'Argentine Primera División', 'MLS', 'CBLOL', 'VCT Americas']
+    assert [league for league in tracked if not is_tracked_league(league)] == []
+    assert [league for league in ignored if is_tracked_league(league)] == []
+
+
+def test_classification_is_cached_per_name():
+    registry = CompetitionRegistry()
+    leagues = ['Brazilian Serie A', 'Copa Libertadores', 'English Premier League', 'CBLOL'] * 2500
+    started = time.perf_counter()
+    tracked = sum(registry.is_tracked(league) for league in leagues)
+    elapsed = time.perf_counter() - started
+
+    assert tracked == 5000
+    assert elapsed < 0.5, f"{len(leagues)} classificações em {elapsed:.3f}s"
+
+
+if __name__ == "__main__":
+    test_aliases_from_every_provider_resolve_to_the_same_competition()
+    print("✅ Apelidos das competições: OK")
+    test_tracked_filter_and_audience()
+    print("✅ Filtro e audiência: OK")
+    test_tracked_leagues_are_pinned()
+    print("✅ Competições acompanhadas: OK")
+    test_classification_is_cached_per_name()
+    print("✅ Cache da classificação: OK")
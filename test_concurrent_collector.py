@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do motor de coleta concorrente (prazos, ordem dos resultados e cortesia por host)
+"""
+
+import threading
+import time
+
+from concurrent_collector import CollectionTask, ConcurrentCollector, HostPoliteness
+
+
+def _sleeper(seconds, value):
+    def run():
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def _fail():
+    raise RuntimeError('fonte fora do ar')
+
+
+def test_slow_or_failing_source_gets_its_default():
+    collector = ConcurrentCollector(source_timeout=0.1, global_deadline=5.0,
+                                    politeness=HostPoliteness(min_interval=0.0))
+    started = time.perf_counter()
+    results = collector.collect([
+        CollectionTask('lenta', _sleeper(1.0, 'tarde'), default=[]),
+        CollectionTask('rapida', _sleeper(0.01, 'ok'), default=[]),
+        CollectionTask('quebrada', _fail, default='padrão'),
+    ])
+    assert results == {'lenta': [], 'rapida': 'ok', 'quebrada': 'padrão'}
+    assert time.perf_counter() - started < 0.6
+
+
+def test_global_deadline_caps_the_whole_collection():
+    collector = ConcurrentCollector(source_timeout=5.0, global_deadline=0.15,
+                                    politeness=HostPoliteness(min_interval=0.0))
+    started = time.perf_counter()
+    results = collector.collect([CollectionTask(f"fonte{i}", _sleeper(1.0, i), default=None) for i in range(3)])
+    assert results == {'fonte0': None, 'fonte1': None, 'fonte2': None}
+    assert time.perf_counter() - started < 0.6
+
+
+def test_results_follow_registration_order():
+    collector = ConcurrentCollector(politeness=HostPoliteness(min_interval=0.0))
+    tasks = [CollectionTask(name, _sleeper(delay, name)) for name, delay in (('c', 0.1), ('a', 0.0), ('b', 0.05))]
+    results = collector.collect(tasks)
+    assert list(results) == ['c', 'a', 'b'] and list(results.values()) == ['c', 'a', 'b']
+    assert collector.collect([]) == {}
+
+
+def test_host_limit_and_queue_time_do_not_count_against_the_timeout():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(name):
+        def run():
+            with lock:
+                running.append(name)
+                peak.append(len(running))
+            time.sleep(0.1)
+            with lock:
+                running.remove(name)
+            return name
+        return run
+
+    # Uma por vez no host: a terceira espera ~0.2 s na fila, mais que o timeout de 0.15 s
+    collector = ConcurrentCollector(source_timeout=0.15, global_deadline=5.0,
+                                    politeness=HostPoliteness(max_per_host=1, min_interval=0.0))
+    results = collector.collect([CollectionTask(f"feed{i}", fetch(f"feed{i}"), host='rss.example.com')
+                                 for i in range(3)])
+    assert results == {'feed0': 'feed0', 'feed1': 'feed1', 'feed2': 'feed2'}
+    assert max(peak) == 1
+
+    # Intervalo mínimo entre requisições ao mesmo host
+    starts = []
+    politeness = HostPoliteness(max_per_host=2, min_interval=0.05)
+    collector = ConcurrentCollector(politeness=politeness)
+    began = time.monotonic()
+    collector.collect([CollectionTask(f"t{i}", lambda: starts.append(time.monotonic()), host='api.example.com')
+                       for i in range(3)])
+    starts.sort()
+    assert all(start - began >= 0.05 * index for index, start in enumerate(starts))
+
+
+if __name__ == "__main__":
+    test_slow_or_failing_source_gets_its_default()
+    print("✅ Timeout por fonte: OK")
+    test_global_deadline_caps_the_whole_collection()
+    print("✅ Prazo global: OK")
+    test_results_follow_registration_order()
+    print("✅ Ordem dos resultados: OK")
+    test_host_limit_and_queue_time_do_not_count_against_the_timeout()
+    print("✅ Limite por host: OK")
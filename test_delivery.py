@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do envio para vários destinatários com personalização e registro de falhas
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from report_fixtures import synthetic_data
+from delivery import DeliveryEngine, DeliveryLedger, TokenBucket, parse_recipients
+
+
+def _ledger():
+    return DeliveryLedger(os.path.join(tempfile.mkdtemp(), 'ledger.json'))
+
+
+def test_parse_recipients_with_preferences():
+    recipients = parse_recipients(
+        'ana@x.com, bia@y.com,ANA@x.com,',
+        '{"Ana@X.com": {"name": "Ana", "teams": ["Grêmio"], "unsubscribed": ["news", "nada"]}}'
+    )
+    assert [r.email for r in recipients] == ['ana@x.com', 'bia@y.com']
+    assert recipients[0].name == 'Ana' and recipients[0].teams == ('Grêmio',)
+    assert recipients[0].unsubscribed == frozenset({'news'})
+    assert recipients[1].name == '' and not recipients[1].unsubscribed
+
+
+def test_personalized_versions_and_retry_only_failures():
+    data = synthetic_data(40)
+    recipients = parse_recipients('ana@x.com,bia@y.com,caio@z.com', {
+        'ana@x.com': {'name': 'Ana', 'teams': ['gremio']},
+        'bia@y.com': {'unsubscribed': ['news', 'esports_today']}
+    })
+    sent = {}
+    failing = {'caio@z.com'}
+    lock = threading.Lock()
+
+    def send(recipient, html):
+        if recipient.email in failing:
+            raise RuntimeError('quota')
+        with lock:
+            sent[recipient.email] = html
+        return f"id-{recipient.email}"
+
+    ledger = _ledger()
+    engine = DeliveryEngine(send, rate=1000, ledger=ledger)
+    result = engine.deliver(data, recipients, run_id='2025-06-09')
+
+    assert result['sent'] == {'ana@x.com': 'id-ana@x.com', 'bia@y.com': 'id-bia@y.com'}
+    assert list(result['failed']) == ['caio@z.com']
+    assert 'Olá, Ana!' in sent['ana@x.com'] and '⭐ Seus Times' in sent['ana@x.com']
+    assert 'class="news-item"' not in sent['bia@y.com'] and 'class="game esports"' not in sent['bia@y.com']
+
+    # Nova execução (com o registro relido do disco) só reenvia a falha
+    failing.clear()
+    sent.clear()
+    engine = DeliveryEngine(send, rate=1000, ledger=DeliveryLedger(ledger.path))
+    result = engine.deliver(data, recipients, run_id='2025-06-09')
+    assert list(sent) == ['caio@z.com']
+    assert sorted(result['skipped']) == ['ana@x.com', 'bia@y.com']
+    assert engine.ledger.entries('2025-06-09')['caio@z.com']['attempts'] == 2
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    # 1 imediato + 5 a 20/s
+    assert time.perf_counter() - started >= 0.2
+
+
+if __name__ == "__main__":
+    test_parse_recipients_with_preferences()
+    test_personalized_versions_and_retry_only_failures()
+    test_token_bucket_limits_rate()
+    print("✅ Envio para vários destinatários: OK")
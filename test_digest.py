@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos rollups diários e dos resumos semanal/mensal
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+
+from digest import DigestBuilder, Rollup, digest_period, summarize_range
+from http_cache import LocalBucket
+from models import DEFAULT_TIMEZONE, Article, Match
+from report_templates import render_digest
+from snapshot_store import ObjectStoreSnapshotBackend, SnapshotStore
+
+
+def _save(store: SnapshotStore, day: date, home: str = 'São Paulo', news_source: str = 'GloboEsporte',
+          ai: bool = False):
+    kickoff = DEFAULT_TIMEZONE.localize(datetime(day.year, day.month, day.day, 16))
+    data = {
+        'sports_data': {
+            'games_today': [Match(home, 'Flamengo', 'Brasileirão Série A', kickoff, audience='8M')],
+            'esports_today': [Match('LOUD', 'paiN Gaming', 'CBLOL', kickoff, viewers='150K')],
+            'weekly_schedule': [Match('Jogo 1', 'Jogo 2', 'Brasileirão', kickoff)],
+        },
+        'news_data': [
+            Article('Sao Paulo vence e Flamengo tropeça', 'https://ge.globo.com/1', news_source, 'Futebol'),
+            Article('LOUD anuncia reforço', 'https://ge.globo.com/2', 'ESPN Brasil', 'E-sports'),
+        ],
+        'collection_time': kickoff.strftime('%d/%m/%Y %H:%M'),
+    }
+    if ai:
+        data['ai_analysis'] = {'top_10_opportunities': [], 'ai_powered': True}
+    store.save(data, kickoff)
+
+
+def test_daily_rollup_counts_mentions_audience_and_sources():
+    store = SnapshotStore(tempfile.mkdtemp())
+    day = date(2025, 3, 9)
+    _save(store, day)
+    _, record = next(store.iter_range(day, day))
+    rollup = Rollup.from_record(record)
+
+    # Jogo + notícia (sem acento no título) contam para o mesmo time; programação simulada fica fora
+    assert rollup.top_teams(3) == [('Flamengo', 2), ('LOUD', 2), ('São Paulo', 2)]
+    assert 'Jogo 1' not in rollup.team_mentions
+    assert rollup.league_audience == {'Brasileirão Série A': 8_000_000, 'CBLOL': 150_000}
+    assert rollup.news_by_source == {'GloboEsporte': 1, 'ESPN Brasil': 1}
+    assert Rollup.from_dict(rollup.to_dict()).to_dict() == rollup.to_dict()
+
+
+def test_month_total_is_precomputed_and_refreshed_only_for_changed_days():
+    store = SnapshotStore(tempfile.mkdtemp())
+    for day in range(1, 32):
+        _save(store, date(2025, 3, day))
+    _save(store, date(2025, 4, 1))
+    builder = DigestBuilder(store)
+
+    month = builder.build(*digest_period('month', date(2025, 4, 15)))
+    assert month.days == 31 and month.games == 62
+    assert month.news_by_source['GloboEsporte'] == 31
+
+    # Sem mudanças, o mês não relê nenhum snapshot
+    reads = []
+    original = store.iter_range
+    store.iter_range = lambda *args, **kwargs: reads.append(args) or original(*args, **kwargs)
+    builder.build(date(2025, 3, 1), date(2025, 3, 31))
+    assert reads == []
+
+    # Reexecução de um dia troca só o rollup daquele dia
+    _save(store, date(2025, 3, 9), news_source='Lance!')
+    path = store.path_for(date(2025, 3, 9))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    week = builder.build(*digest_period('week', date(2025, 3, 12)))
+    assert reads == [(date(2025, 3, 9), date(2025, 3, 9))]
+    assert week.days == 7 and week.news_by_source['Lance!'] == 1 and week.news_by_source['GloboEsporte'] == 6
+
+
+def test_range_summary_uses_latest_run_per_day_across_months():
+    store = SnapshotStore(tempfile.mkdtemp())
+    for day in (date(2025, 1, 30), date(2025, 2, 2), date(2025, 3, 1), date(2025, 4, 1)):
+        _save(store, day, ai=day.month == 2)
+    _save(store, date(2025, 2, 2), news_source='Lance!')
+
+    summary = summarize_range(store, date(2025, 1, 1), date(2025, 3, 31)).to_dict()
+    assert summary['days'] == 3 and summary['games'] == 6 and summary['esports'] == 3
+    assert summary['league_games'] == {'Brasileirão Série A': 3, 'CBLOL': 3}
+    assert summary['news_by_source'] == {'ESPN Brasil': 3, 'GloboEsporte': 2, 'Lance!': 1}
+    assert (summary['first_day'], summary['last_day']) == ('2025-01-30', '2025-03-01')
+    assert summary['ai_days'] == 0
+
+
+def test_rollups_follow_snapshots_into_the_bucket():
+    bucket = LocalBucket(tempfile.mkdtemp())
+    store = SnapshotStore(backend=ObjectStoreSnapshotBackend(bucket))
+    # Mês gravado num formato antigo é recalculado
+    bucket.blob('rollups/2025-03.json').upload_from_string(b'{"days": {}, "total": {"days": 99}}')
+    _save(store, date(2025, 3, 9), ai=True)
+
+    month = DigestBuilder(store).build(date(2025, 3, 1), date(2025, 3, 31))
+    assert month.days == 1 and month.ai_days == 1 and month.first_day == date(2025, 3, 9)
+    assert [blob.name for blob in bucket.list_blobs(prefix='rollups/')] == ['rollups/2025-03.json']
+    assert DigestBuilder(store).build(date(2025, 3, 1), date(2025, 3, 31)).to_dict() == month.to_dict()
+
+
+def test_digest_renders_rankings():
+    store = SnapshotStore(tempfile.mkdtemp())
+    _save(store, date(2025, 3, 9))
+    rollup = DigestBuilder(store).build(date(2025, 3, 3), date(2025, 3, 9))
+    html = render_digest({'title': 'Resumo Semanal Artplan', 'period': '03/03/2025 a 09/03/2025',
+                          'rollup': rollup}, recipients=[{'name': 'Ana'}, {}])
+    assert len(html) == 2 and 'Olá, Ana!' in html[0] and 'Olá' not in html[1]
+    assert '1. Flamengo' in html[1] and '8M de audiência' in html[1] and '8.15M' in html[1]
+
+
+if __name__ == "__main__":
+    test_daily_rollup_counts_mentions_audience_and_sources()
+    test_month_total_is_precomputed_and_refreshed_only_for_changed_days()
+    test_range_summary_uses_latest_run_per_day_across_months()
+    test_rollups_follow_snapshots_into_the_bucket()
+    test_digest_renders_rankings()
+    print("✅ Resumos semanal e mensal: OK")
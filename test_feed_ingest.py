@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da ingestão de feeds RSS/Atom com feeds locais grandes
+"""
+
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+import pytz
+
+from bench_feed_ingest import write_fixture_feed
+from feed_ingest import iter_feed_items
+from mock_services import MockServices
+from real_news_scraper import FEEDS, check_feeds
+
+
+def _fixture(items, atom=False):
+    path = os.path.join(tempfile.mkdtemp(), 'feed.xml')
+    write_fixture_feed(path, items, atom=atom)
+    return path
+
+
+def test_rss_items_are_normalized():
+    """Campos normalizados: HTML removido, entidades decodificadas, data local"""
+    with open(_fixture(3), 'rb') as stream:
+        news = list(iter_feed_items(stream, source='GloboEsporte', category='Futebol'))
+
+    assert len(news) == 3
+    first = news[0]
+    assert first.title == 'Flamengo x Palmeiras: notícia de número 0 & análise'
+    assert first.link == 'https://example.com/n/0'
+    assert first.description == 'Resumo da notícia 0 sobre o Brasileirão.'
+    assert first.source == 'GloboEsporte' and first.category == 'Futebol'
+    assert first.date == '09/06/2025 09:00'
+
+
+def test_atom_feed():
+    with open(_fixture(5, atom=True), 'rb') as stream:
+        news = list(iter_feed_items(stream, source='ESPN Brasil', category='Esportes'))
+
+    assert [n.link for n in news] == [f'https://example.com/n/{i}' for i in range(5)]
+    assert news[0].published.tzinfo is not None
+
+
+def test_large_feed_streams_with_bounded_memory():
+    """Feed com dezenas de milhares de itens sem a memória crescer com o feed"""
+    path = _fixture(20000)
+
+    tracemalloc.start()
+    with open(path, 'rb') as stream:
+        count = sum(1 for _ in iter_feed_items(stream, source='Fixture', category='Teste'))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 20000
+    # O arquivo tem ~3,5 MB; a árvore inteira em memória passaria bem disso
+    assert peak < 2 * 1024 * 1024
+
+
+def test_stops_early_on_max_items_and_stale_items():
+    path = _fixture(20000)
+
+    with open(path, 'rb') as stream:
+        assert len(list(iter_feed_items(stream, 'Fixture', 'Teste', max_items=10))) == 10
+
+    # Apenas os 30 itens mais novos são posteriores a `since`
+    since = datetime(2025, 6, 9, 11, 30, tzinfo=pytz.utc)
+    with open(path, 'rb') as stream:
+        fresh = list(iter_feed_items(stream, 'Fixture', 'Teste', since=since))
+    assert len(fresh) == 30
+
+
+def test_check_feeds_reports_each_source(monkeypatch):
+    monkeypatch.setenv('HTTP_RETRIES', '0')
+    with MockServices() as services:
+        for name, value in services.env().items():
+            monkeypatch.setenv(name, value)
+        assert check_feeds() == {key: None for key in FEEDS}
+
+        services.configure('rss', failure_rate=1.0)
+        assert all(check_feeds(['globoesporte', 'uol']).values())
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
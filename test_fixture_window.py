@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da janela de jogos (busca única por intervalo e índice por dia/competição)
+"""
+
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from fixture_window import FixtureWindow
+from mock_services import MockServices
+from models import Match
+from real_sports_data import RealSportsData
+from source_health import SourceHealth
+from sports_providers import FootballDataProvider, ProviderSet, SportsProvider, TheSportsDBSeasonProvider
+
+
+def _utc(day: int, hour: int) -> datetime:
+    return pytz.utc.localize(datetime(2025, 3, day, hour))
+
+
+def test_day_and_league_slices():
+    matches = [
+        Match('Grêmio', 'Inter', 'Brasileirão Série A', _utc(10, 19)),
+        Match('Flamengo', 'Vasco', 'Brasileirão Série A', _utc(9, 19)),
+        # 01:00 UTC do dia 10 ainda é dia 9 em Brasília
+        Match('River', 'Boca', 'Copa Libertadores', _utc(10, 1)),
+        Match('Bahia', 'Vitória', 'Copa do Brasil', _utc(11, 22)),
+    ]
+    window = FixtureWindow(date(2025, 3, 8), date(2025, 3, 12), matches)
+
+    assert [match.home_team for match in window.day(date(2025, 3, 9))] == ['Flamengo', 'River']
+    # Qualquer grafia da competição cai no mesmo índice
+    assert [match.home_team for match in window.day(date(2025, 3, 9), 'Brazilian Serie A')] == ['Flamengo']
+    assert [match.home_team for match in window.between(date(2025, 3, 10), date(2025, 3, 12))] == \
+        ['Grêmio', 'Bahia']
+    assert window.day(date(2025, 3, 8)) == [] and window.day(date(2025, 3, 9), 'Premier League') == []
+    assert window.leagues() == ['brasileirao-a', 'copa-do-brasil', 'libertadores']
+    assert window.covers(date(2025, 3, 8), date(2025, 3, 12)) and not window.covers(date(2025, 3, 13))
+
+
+def test_week_costs_the_same_requests_as_one_day(monkeypatch):
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setenv('HTTP_CACHE_DIR', os.path.join(workdir, 'http'))
+    with MockServices() as services:
+        for name, value in services.env().items():
+            monkeypatch.setenv(name, value)
+        health = SourceHealth(os.path.join(workdir, 'health.json'))
+        sports = RealSportsData(ProviderSet([TheSportsDBSeasonProvider(health=health),
+                                             FootballDataProvider(health=health)]))
+        data = sports.get_all_sports_data()
+
+        # Uma temporada por liga + um intervalo no football-data.org para ontem, hoje, amanhã e a semana
+        leagues = TheSportsDBSeasonProvider().league_ids
+        assert '4351' in leagues and '4501' in leagues
+        assert services.requests['thesportsdb'] == len(leagues) and services.requests['footballdata'] == 1
+
+    today = services.started_at.date()
+    assert data['recent_results'] and all(match.score == '2-1' for match in data['recent_results'])
+    assert {match.kickoff.date() for match in data['games_tomorrow']} == {today + timedelta(days=1)}
+    assert max(match.kickoff.date() for match in data['weekly_schedule']) == today + timedelta(days=6)
+    # Libertadores também vem por padrão, não só o Brasileirão
+    assert {match.league for match in data['weekly_schedule']} == {'Brazilian Serie A', 'Copa Libertadores'}
+
+
+def test_weekly_schedule_is_empty_without_providers():
+    class NoGames(SportsProvider):
+        name = 'vazio'
+
+        def fetch(self, start, end):
+            return []
+
+    assert RealSportsData(ProviderSet([NoGames()])).get_weekly_schedule() == []
+
+
+def test_season_format_per_league():
+    # Ligas brasileiras seguem o ano civil; as europeias viram o ano em julho
+    assert TheSportsDBSeasonProvider.season_for('4351', date(2025, 1, 10)) == '2025'
+    assert TheSportsDBSeasonProvider.season_for('4328', date(2025, 1, 10)) == '2024-2025'
+    assert TheSportsDBSeasonProvider.season_for('4328', date(2025, 8, 10)) == '2025-2026'
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
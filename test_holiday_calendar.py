@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do calendário de feriados e datas comerciais
+"""
+
+from datetime import date
+
+import holiday_calendar
+from holiday_calendar import CalendarEntry, HolidayCalendar, easter, get_holiday_calendar
+
+
+def test_computed_dates():
+    assert easter(2024) == date(2024, 3, 31) and easter(2025) == date(2025, 4, 20)
+    calendar = HolidayCalendar.load(2025, 2025, lambda year: None)
+    days = {entry.name: entry.day for entry in calendar.between(date(2025, 1, 1), date(2025, 12, 31))}
+
+    assert days['Sexta-feira Santa'] == date(2025, 4, 18) and days['Corpus Christi'] == date(2025, 6, 19)
+    assert days['Dia das Mães'] == date(2025, 5, 11) and days['Dia dos Pais'] == date(2025, 8, 10)
+    assert days['Black Friday'] == date(2025, 11, 28)
+    assert not calendar.from_api
+
+
+def test_upcoming_crosses_the_year_boundary():
+    fetched = []
+
+    def fetch_year(year):
+        fetched.append(year)
+        return [CalendarEntry(date(year, 1, 1), 'Confraternização Universal'),
+                CalendarEntry(date(year, 12, 25), 'Natal')]
+
+    calendar = HolidayCalendar.load(2025, 2026, fetch_year)
+    events = calendar.upcoming(date(2025, 12, 20))
+
+    assert fetched == [2025, 2026]
+    assert [(event.name, event.days_until) for event in events] == \
+        [('Natal', 5), ('Réveillon', 11), ('Confraternização Universal', 12)]
+    assert events[0].impact == 'Monitorar campanhas' and events[1].impact == 'Resoluções esportivas'
+    # Sem datas na janela, a próxima mesmo que longe
+    assert calendar.upcoming(date(2026, 1, 2)) == []
+    assert [(event.name, event.days_until) for event in calendar.next_dates(date(2026, 1, 2))] == \
+        [('Dia do Consumidor', 72)]
+
+
+def test_process_calendar_is_reused_only_when_built_from_the_api(monkeypatch):
+    monkeypatch.setattr(holiday_calendar, '_calendar', None)
+    calls = []
+
+    def offline(year):
+        calls.append(year)
+        return None
+
+    get_holiday_calendar(date(2025, 12, 20), fetch_year=offline)
+    get_holiday_calendar(date(2025, 12, 20), fetch_year=offline)
+    assert calls == [2025, 2026, 2025, 2026]
+
+    online = lambda year: calls.append(year) or []
+    first = get_holiday_calendar(date(2025, 12, 20), fetch_year=online)
+    assert get_holiday_calendar(date(2025, 12, 21), fetch_year=online) is first
+    assert len(calls) == 6
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache HTTP com GET condicional (sem rede)
+"""
+
+import tempfile
+
+from http_cache import HTTPCache, DiskCacheBackend, ObjectStoreCacheBackend, LocalBucket
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeServer:
+    """Servidor simulado que responde 304 quando o ETag confere"""
+
+    def __init__(self, body=b'[1, 2, 3]', etag='"v1"', cache_control=''):
+        self.body = body
+        self.etag = etag
+        self.cache_control = cache_control
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        response_headers = {'ETag': self.etag}
+        if self.cache_control:
+            response_headers['Cache-Control'] = self.cache_control
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304, b'', response_headers)
+        return FakeResponse(200, self.body, response_headers)
+
+
+def test_conditional_get_returns_cached_body_on_304():
+    """Segunda chamada envia If-None-Match e reaproveita o corpo no 304"""
+    cache = HTTPCache(DiskCacheBackend(tempfile.mkdtemp()))
+    server = FakeServer()
+
+    first = cache.fetch(server, 'https://date.nager.at/api/v3/PublicHolidays/2025/BR')
+    second = cache.fetch(server, 'https://date.nager.at/api/v3/PublicHolidays/2025/BR')
+
+    assert first.json() == [1, 2, 3] and not first.from_cache
+    assert server.requests[1]['If-None-Match'] == '"v1"'
+    assert second.revalidated and second.json() == [1, 2, 3]
+    assert cache.misses == 1 and cache.revalidations == 1
+
+
+def test_max_age_skips_network():
+    """Cache-Control max-age evita qualquer requisição enquanto fresco"""
+    cache = HTTPCache(DiskCacheBackend(tempfile.mkdtemp()))
+    server = FakeServer(cache_control='public, max-age=600')
+
+    cache.fetch(server, 'https://ge.globo.com/rss.xml')
+    cached = cache.fetch(server, 'https://ge.globo.com/rss.xml')
+
+    assert len(server.requests) == 1
+    assert cached.from_cache and cache.hits == 1
+
+
+def test_no_store_is_not_persisted():
+    cache = HTTPCache(DiskCacheBackend(tempfile.mkdtemp()))
+    server = FakeServer(cache_control='no-store')
+
+    cache.fetch(server, 'https://example.com/feed')
+    cache.fetch(server, 'https://example.com/feed')
+
+    assert 'If-None-Match' not in server.requests[1]
+
+
+def test_object_store_backend():
+    """Backend compatível com GCS usando o bucket local substituto"""
+    cache = HTTPCache(ObjectStoreCacheBackend(LocalBucket(tempfile.mkdtemp())))
+    server = FakeServer(cache_control='max-age=60')
+
+    cache.fetch(server, 'https://www.thesportsdb.com/api/v1/json/3/eventsday.php')
+    cached = cache.fetch(server, 'https://www.thesportsdb.com/api/v1/json/3/eventsday.php')
+
+    assert cached.from_cache and cached.content == b'[1, 2, 3]'
+
+
+if __name__ == "__main__":
+    test_conditional_get_returns_cached_body_on_304()
+    test_max_age_skips_network()
+    test_no_store_is_not_persisted()
+    test_object_store_backend()
+    print("✅ Cache HTTP: OK")
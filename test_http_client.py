@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cliente HTTP compartilhado (retry por status, jitter, variáveis de ambiente e singleton)
+"""
+
+import threading
+
+from urllib3.util.retry import RequestHistory
+
+import http_client
+from http_client import HTTPClient, JitteredRetry, get_http_client
+from mock_services import MockServices
+
+
+def test_retries_only_retryable_statuses():
+    with MockServices() as services:
+        url = f"{services.env()['NAGER_URL']}/PublicHolidays/2025/BR"
+        client = HTTPClient(retries=2, backoff_factor=0)
+
+        services.configure('nager', failure_rate=1.0, status=503)
+        assert client.get(url).status_code == 503
+        assert services.requests['nager'] == 3
+
+        # 404 não está em RETRY_STATUS_CODES: uma tentativa só
+        services.reset_counters()
+        services.configure('nager', status=404)
+        assert client.get(url).status_code == 404
+        assert services.requests['nager'] == 1
+
+        services.reset_counters()
+        services.configure('nager', failure_rate=0.0)
+        assert client.get(url).status_code == 200 and isinstance(client.get_json(url), list)
+        assert services.requests['nager'] == 2
+        client.close()
+
+
+def test_backoff_jitter_stays_within_bounds():
+    history = RequestHistory('GET', '/', None, 503, None)
+    retry = JitteredRetry(total=5, backoff_factor=1, jitter=0.5)
+    for attempts in (2, 3, 4):
+        base = 2 ** (attempts - 1)
+        delays = [retry.new(history=(history,) * attempts).get_backoff_time() for _ in range(200)]
+        assert all(base <= delay <= base * 1.5 for delay in delays)
+        assert len(set(delays)) > 1
+
+    # Sem jitter, o backoff é o exponencial puro; a primeira tentativa não espera
+    plain = JitteredRetry(total=5, backoff_factor=1, jitter=0)
+    assert plain.new(history=(history,) * 3).get_backoff_time() == 4
+    assert retry.new(history=(history,)).get_backoff_time() == 0
+    assert retry.new(total=4).jitter == 0.5
+
+
+def test_shared_client_reads_env_once(monkeypatch):
+    monkeypatch.setattr(http_client, '_client', None)
+    monkeypatch.setenv('HTTP_POOL_CONNECTIONS', '3')
+    monkeypatch.setenv('HTTP_POOL_MAXSIZE', '7')
+    monkeypatch.setenv('HTTP_RETRIES', 'muitas')
+    monkeypatch.setenv('HTTP_BACKOFF_JITTER', '0.2')
+    monkeypatch.setenv('HTTP_TIMEOUT', '4.5')
+
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(get_http_client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client = clients[0]
+    assert all(other is client for other in clients)
+
+    adapter = client.session.get_adapter('https://example.com')
+    assert adapter._pool_connections == 3 and adapter._pool_maxsize == 7
+    # Valor inválido cai no padrão
+    assert adapter.max_retries.total == 3 and adapter.max_retries.jitter == 0.2
+    assert client.timeout == 4.5
+
+    # Mudar o ambiente depois não recria o cliente
+    monkeypatch.setenv('HTTP_POOL_MAXSIZE', '1')
+    assert get_http_client() is client
+    client.close()
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos imports sob demanda e do orçamento de cold start
+"""
+
+import subprocess
+import sys
+
+from lazy_imports import lazy_import
+from profile_imports import main as profile_main
+
+
+def test_lazy_module_loads_on_first_attribute():
+    module = lazy_import('colorsys')
+    sys.modules.pop('colorsys', None)
+    assert not module.loaded
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert module.loaded
+
+
+def test_function_bundle_does_not_import_heavy_clients():
+    code = ("import sys, main; "
+            "print(','.join(m for m in ('google_auth_oauthlib', 'googleapiclient', "
+            "'google.generativeai', 'yaml') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == ''
+
+
+def test_profiler_fails_on_forbidden_module():
+    assert profile_main(['lazy_imports', '--runs', '1', '--top', '1']) == 0
+    assert profile_main(['lazy_imports', '--runs', '1', '--top', '1', '--forbid', 'threading']) == 1
+
+
+if __name__ == "__main__":
+    test_lazy_module_loads_on_first_attribute()
+    test_function_bundle_does_not_import_heavy_clients()
+    test_profiler_fails_on_forbidden_module()
+    print("✅ Imports sob demanda: OK")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache de respostas do Gemini
+"""
+
+import tempfile
+import time
+
+from http_cache import DiskCacheBackend, LocalBucket, ObjectStoreCacheBackend
+from llm_cache import LLMCache, prompt_fingerprint
+from real_ai_analysis import RealAIAnalysis
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+
+        class Response:
+            text = f"1. 🏆 Oportunidade gerada na chamada {self.calls}"
+        return [Response()] if stream else Response()
+
+
+def test_fingerprint_ignores_whitespace_but_not_model_or_version():
+    base = prompt_fingerprint('gemini-pro', 'v1', 'Jogos:\n  - Flamengo vs Vasco')
+    assert base == prompt_fingerprint('gemini-pro', 'v1', 'Jogos: - Flamengo   vs Vasco ')
+    assert base != prompt_fingerprint('gemini-pro', 'v2', 'Jogos: - Flamengo vs Vasco')
+    assert base != prompt_fingerprint('gemini-1.5', 'v1', 'Jogos: - Flamengo vs Vasco')
+
+
+def test_hits_survive_new_instance_and_expire_with_ttl():
+    backend = DiskCacheBackend(tempfile.mkdtemp())
+    cache = LLMCache(backend, ttl=0.2)
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return 'resposta'
+
+    assert cache.get_or_generate('m', 'v1', 'ctx', generate) == 'resposta'
+    assert cache.get_or_generate('m', 'v1', 'ctx', generate) == 'resposta'
+    # Outra instância (nova invocação) lê do backend persistente
+    other = LLMCache(backend, ttl=0.2)
+    assert other.get_or_generate('m', 'v1', 'ctx', generate) == 'resposta'
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses, other.hits) == (1, 1, 1)
+
+    time.sleep(0.25)
+    assert other.get_or_generate('m', 'v1', 'ctx', generate) == 'resposta'
+    assert len(calls) == 2
+
+
+def test_lru_eviction_and_empty_responses_not_cached():
+    cache = LLMCache(backend=None, max_entries=2)
+    for context in ('a', 'b', 'c'):
+        cache.get_or_generate('m', 'v1', context, lambda: context.upper())
+    assert cache.stats()['memory_entries'] == 2
+    assert cache.get(prompt_fingerprint('m', 'v1', 'a')) is None
+
+    cache.get_or_generate('m', 'v1', 'vazio', lambda: '')
+    assert cache.get(prompt_fingerprint('m', 'v1', 'vazio')) is None
+
+
+def test_put_sweeps_expired_entries_and_caps_the_backend():
+    backend = DiskCacheBackend(tempfile.mkdtemp())
+    old = LLMCache(backend, ttl=0.05)
+    old.put('vencida', 'texto')
+    time.sleep(0.1)
+
+    cache = LLMCache(backend, ttl=60, max_stored=3, sweep_interval=3600)
+    for index in range(5):
+        cache.put(f'k{index}', 'texto')
+    # A primeira varredura apaga a vencida; as demais esperam o intervalo
+    assert sorted(backend.keys()) == ['k0', 'k1', 'k2', 'k3', 'k4']
+    assert cache.sweep() == 2
+    assert sorted(backend.keys()) == ['k2', 'k3', 'k4']
+
+
+def test_sweep_on_object_store_backend():
+    backend = ObjectStoreCacheBackend(LocalBucket(tempfile.mkdtemp()), prefix='llm-cache/')
+    LLMCache(backend, ttl=0.05).put('vencida', 'texto')
+    time.sleep(0.1)
+    LLMCache(backend, ttl=60).put('nova', 'texto')
+    assert backend.keys() == ['nova']
+
+
+def test_analysis_reuses_cached_model_response():
+    ai = RealAIAnalysis(api_key='', cache=LLMCache(backend=None))
+    ai.model = FakeModel()
+
+    first = ai.generate_market_insights({'games_today': []})
+    second = ai.generate_market_insights({'games_today': []})
+    assert first == second and ai.model.calls == 1
+    assert ai.cache.stats()['hits'] == 1
+
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_whitespace_but_not_model_or_version()
+    test_hits_survive_new_instance_and_expire_with_ttl()
+    test_lru_eviction_and_empty_responses_not_cached()
+    test_put_sweeps_expired_entries_and_caps_the_backend()
+    test_sweep_on_object_store_backend()
+    test_analysis_reuses_cached_model_response()
+    print("✅ Cache de IA: OK")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos modelos (ida e volta por to_dict/from_dict/json_default e fusos horários)
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from models import DEFAULT_TIMEZONE, Article, Match, Opportunity, SpecialDate, json_default, localize
+
+
+def test_localize_keeps_aware_and_assumes_brasilia_for_naive():
+    naive = localize(datetime(2025, 3, 9, 16))
+    assert naive.tzinfo is not None and naive.utcoffset() == timedelta(hours=-3)
+    aware = pytz.utc.localize(datetime(2025, 3, 9, 19))
+    assert localize(aware) is aware
+    assert localize(datetime(2025, 3, 9, 16), pytz.utc).utcoffset() == timedelta(0)
+
+
+def test_match_round_trip_with_naive_and_aware_kickoff():
+    naive = Match('Flamengo', 'Vasco', 'Brazilian Serie A', datetime(2025, 3, 9, 16), tv='Globo')
+    aware = Match('LOUD', 'paiN Gaming', 'CBLOL', pytz.utc.localize(datetime(2025, 3, 9, 19)),
+                  sport='E-sports', game='League of Legends', viewers='150K')
+
+    assert naive.kickoff == DEFAULT_TIMEZONE.localize(datetime(2025, 3, 9, 16)) and naive.time == '16:00'
+    for match in (naive, aware):
+        data = match.to_dict()
+        # Campos None não vão para o JSON
+        assert 'score' not in data
+        restored = Match.from_dict(json.loads(json.dumps(data)))
+        assert restored == match and restored.kickoff.utcoffset() == match.kickoff.utcoffset()
+    assert Match.from_dict(aware.to_dict()).kickoff.utcoffset() == timedelta(0)
+
+
+def test_article_and_opportunity_round_trip():
+    published = DEFAULT_TIMEZONE.localize(datetime(2025, 3, 9, 8, 30))
+    article = Article('Flamengo renova com Pedro', 'https://example.com/1', 'GloboEsporte', 'Futebol',
+                      'Contrato até 2027', published, related_sources=('Lance!', 'UOL Esporte'))
+    data = json.loads(json.dumps(article.to_dict()))
+    assert data['related_sources'] == ['Lance!', 'UOL Esporte']
+    assert Article.from_dict(data) == article
+
+    undated = Article('Sem data', 'https://example.com/2', 'Lance!', 'Futebol')
+    assert 'published' not in undated.to_dict() and 'related_sources' not in undated.to_dict()
+    assert Article.from_dict(undated.to_dict()) == undated
+
+    opportunity = Opportunity(1, 'Clássico no domingo', 'Audiência alta', 'Reforçar mídia', source='fallback')
+    assert Opportunity.from_dict(opportunity.to_dict()) == opportunity
+    special = SpecialDate(date(2025, 5, 11), 'Dia das Mães', 'Campanhas familiares', 63)
+    assert SpecialDate.from_dict(special.to_dict()) == special
+
+
+def test_from_dict_ignores_unknown_keys_and_fills_defaults():
+    match = Match.from_dict({'home_team': 'Grêmio', 'away_team': 'Inter', 'league': 'Gauchão',
+                             'kickoff': '2025-03-09T16:00:00', 'campo_novo': 1})
+    assert match.sport == 'Futebol' and match.status == 'Agendado' and match.score is None
+    assert match.kickoff.utcoffset() == timedelta(hours=-3)
+
+    article = Article.from_dict({'title': 'T', 'link': 'L', 'source': 'S', 'category': 'C',
+                                 'published': None, 'extra': True})
+    assert article.published is None and article.description == '' and article.related_sources == ()
+    assert Opportunity.from_dict({'rank': 2, 'title': 'X', 'score': 0.9}) == Opportunity(2, 'X')
+    assert SpecialDate.from_dict({'day': '2025-06-12', 'name': 'Namorados', 'impact': 'Presentes',
+                                  'weekday': 'quinta'}).days_until == 0
+
+
+def test_json_default_serializes_models_and_dates():
+    match = Match('Flamengo', 'Vasco', 'Brazilian Serie A', datetime(2025, 3, 9, 16))
+    payload = json.loads(json.dumps({'games': [match], 'day': date(2025, 3, 9),
+                                     'at': datetime(2025, 3, 9, 8)}, default=json_default))
+    assert payload == {'games': [match.to_dict()], 'day': '2025-03-09', 'at': '2025-03-09T08:00:00'}
+    try:
+        json.dumps({'x': object()}, default=json_default)
+    except TypeError as e:
+        assert 'object' in str(e)
+    else:
+        raise AssertionError('json_default deveria recusar objetos desconhecidos')
+
+
+if __name__ == "__main__":
+    test_localize_keeps_aware_and_assumes_brasilia_for_naive()
+    print("✅ Fusos horários: OK")
+    test_match_round_trip_with_naive_and_aware_kickoff()
+    print("✅ Ida e volta de Match: OK")
+    test_article_and_opportunity_round_trip()
+    print("✅ Ida e volta de Article e Opportunity: OK")
+    test_from_dict_ignores_unknown_keys_and_fills_defaults()
+    print("✅ Chaves desconhecidas e ausentes: OK")
+    test_json_default_serializes_models_and_dates()
+    print("✅ json_default: OK")
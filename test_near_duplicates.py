@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da detecção de notícias quase duplicadas (normalização, índice MinHash e agrupamento)
+"""
+
+from models import Article
+from near_duplicates import NearDuplicateIndex, cluster_articles, jaccard, normalize_title
+from text_utils import fold_accents
+
+
+def _article(title, source, description=''):
+    return Article(title, f"https://example.com/{source}/{title}", source, 'Futebol', description)
+
+
+def test_normalization_folds_accents_and_prefixes():
+    assert fold_accents('São Paulo e Grêmio') == 'sao paulo e gremio'
+    # Flexões viram o mesmo radical; stopwords e pontuação somem
+    renova = normalize_title('Flamengo renova contrato de Pedro até 2027')
+    renovacao = normalize_title('Flamengo: renovação do contrato de Pedro até 2027!')
+    assert renova == renovacao == frozenset({'flame', 'renov', 'contr', 'pedro', '2027'})
+    # Título só com stopwords ainda tem chave
+    assert normalize_title('de para com') == frozenset({'de', 'para', 'com'})
+
+    index = NearDuplicateIndex()
+    index.add('a', 'Grêmio anuncia técnico para a temporada')
+    assert index.query('Gremio anuncia tecnico da temporada') == ['a']
+    assert index.query('Palmeiras vence o Santos no Allianz') == []
+    assert len(index) == 1
+
+
+def test_canonical_item_and_related_sources():
+    articles = [
+        _article('Flamengo renova contrato de Pedro até 2027', 'UOL Esporte', 'Curta'),
+        _article('Palmeiras vence o Santos no Allianz', 'Lance!'),
+        _article('Flamengo renovação do contrato de Pedro até 2027', 'Lance!', 'Descrição bem mais completa'),
+        _article('Flamengo renova contrato de Pedro ate 2027', 'GloboEsporte'),
+        _article('Flamengo renova o contrato de Pedro até 2027', 'UOL Esporte'),
+    ]
+    # Prioridade da fonte vence a descrição mais longa
+    clustered = cluster_articles(articles, priority_sources=['GloboEsporte', 'Lance!'])
+    assert [article.source for article in clustered] == ['GloboEsporte', 'Lance!']
+    assert clustered[0].related_sources == ('UOL Esporte', 'Lance!')
+    assert clustered[1].title == 'Palmeiras vence o Santos no Allianz'
+    assert clustered[1].related_sources == ()
+
+    # Sem prioridade, a descrição mais completa decide
+    clustered = cluster_articles(articles)
+    assert clustered[0].source == 'Lance!' and clustered[0].description == 'Descrição bem mais completa'
+    assert clustered[0].related_sources == ('UOL Esporte', 'GloboEsporte')
+    assert cluster_articles([]) == []
+
+
+def test_clusters_do_not_chain_through_intermediate_titles():
+    first = 'Alfa Bravo Charlie Delta Echo'
+    middle = 'Alfa Bravo Charlie Delta Echo Foxtrot Golf'
+    last = 'Charlie Delta Echo Foxtrot Golf'
+    assert jaccard(normalize_title(first), normalize_title(middle)) >= 0.5
+    assert jaccard(normalize_title(middle), normalize_title(last)) >= 0.5
+    assert jaccard(normalize_title(first), normalize_title(last)) < 0.5
+
+    clustered = cluster_articles([_article(first, 'A'), _article(middle, 'B'), _article(last, 'C')])
+    assert [article.title for article in clustered] == [first, last]
+    assert clustered[0].related_sources == ('B',)
+
+
+def test_pairs_at_the_threshold_are_found():
+    # {a, b, c} x {a, b, d}: Jaccard exatamente 0,5
+    index = NearDuplicateIndex(threshold=0.5)
+    for i in range(300):
+        index.add(i, tokens=frozenset({f'a{i}', f'b{i}', f'c{i}'}))
+    found = sum(index.query(tokens=frozenset({f'a{i}', f'b{i}', f'd{i}'})) == [i] for i in range(300))
+    assert found == 300
+    # Abaixo do limiar, candidatos são descartados pelo Jaccard exato
+    assert index.query(tokens=frozenset({'a0', 'x', 'y'})) == []
+
+
+if __name__ == "__main__":
+    test_normalization_folds_accents_and_prefixes()
+    print("✅ Normalização de títulos: OK")
+    test_canonical_item_and_related_sources()
+    print("✅ Item canônico e fontes relacionadas: OK")
+    test_clusters_do_not_chain_through_intermediate_titles()
+    print("✅ Grupos sem encadeamento: OK")
+    test_pairs_at_the_threshold_are_found()
+    print("✅ Pares no limiar: OK")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da seleção de notícias por pontuação (determinística, sem random global)
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from models import DEFAULT_TIMEZONE, Article
+from news_selection import NewsSelector, selection_seed
+from report_templates import render_sports_report
+from sports_reporter import DailySportsReport
+
+NOW = DEFAULT_TIMEZONE.localize(datetime(2025, 3, 9, 18))
+
+
+def _article(title, source='UOL Esporte', hours=1, link=None):
+    return Article(title, link or f"https://example.com/{title}", source, 'Futebol',
+                   published=NOW - timedelta(hours=hours))
+
+
+def test_scores_freshness_source_and_teams():
+    articles = [
+        _article('Mercado da bola movimentado', source='Transfermarkt Brasil', hours=30),
+        _article('Rodada tem estádios cheios', source='GloboEsporte', hours=1),
+        _article('Grêmio confirma escalação', source='UOL Esporte', hours=2),
+        _article('Resultado antigo', source='Lance!', hours=72),
+    ]
+    selected = NewsSelector(teams=['Gremio']).select(articles, 3, seed='2025-03-09')
+
+    # Time citado (sem acento na lista) pesa mais que a fonte; notícia velha fica de fora
+    assert [article.title for article in selected] == \
+        ['Grêmio confirma escalação', 'Rodada tem estádios cheios', 'Mercado da bola movimentado']
+
+
+def test_top_k_matches_full_sort_and_is_reproducible():
+    articles = [_article(f"Notícia {i}", source=('GloboEsporte', 'Lance!', 'Outra')[i % 3], hours=i % 48,
+                         link=f"https://example.com/{i}") for i in range(3000)]
+    selector = NewsSelector(teams=['Flamengo'])
+    seed = selection_seed(NOW.date(), 'Ana@example.com')
+
+    top = selector.select(articles, 15, seed=seed)
+    assert top == selector.select(list(reversed(articles)), 15, seed=seed)
+    scores = sorted((round(selector.score(article, NOW), 6) for article in articles), reverse=True)
+    assert [round(selector.score(article, NOW), 6) for article in top] == scores[:15]
+    # Empates (mesma nota) são decididos pela semente: outro dia, outra ordem
+    ties = [_article(f"Empate {i}", hours=0, link=f"https://example.com/e{i}") for i in range(20)]
+    assert selector.select(ties, 5, seed='2025-03-09') != selector.select(ties, 5, seed='2025-03-10')
+
+
+def test_daily_news_does_not_touch_global_random():
+    random.seed(1234)
+    state = random.getstate()
+    daily = DailySportsReport({})
+    first = daily.get_sports_news(teams=['Corinthians'])
+
+    assert random.getstate() == state
+    assert first == daily.get_sports_news(teams=['Corinthians']) and len(first) == 3
+    assert first[0] == 'Free Fire: Corinthians investe R$ 5M em e-sports'
+
+
+def test_favorite_team_news_in_personal_block():
+    news = [_article('Grêmio vence o Inter no Gre-Nal'), _article('Palmeiras renova com técnico')]
+    data = {'sports_data': {}, 'news_data': news, 'collection_time': '09/03/2025 18:00'}
+    ana, bia = render_sports_report(data, recipients=[
+        {'email': 'ana@x.com', 'teams': ('gremio',)},
+        {'email': 'bia@x.com', 'teams': ('gremio',), 'unsubscribed': frozenset({'news'})},
+    ])
+    assert '⭐ Seus Times' in ana and ana.index('Gre-Nal') < ana.index('📰 Notícias Esportivas')
+    assert '⭐ Seus Times' not in bia
+
+
+if __name__ == "__main__":
+    test_scores_freshness_source_and_teams()
+    print("✅ Pontuação das notícias: OK")
+    test_top_k_matches_full_sort_and_is_reproducible()
+    print("✅ Top-k reproduzível: OK")
+    test_daily_news_does_not_touch_global_random()
+    print("✅ Sem random global: OK")
+    test_favorite_team_news_in_personal_block()
+    print("✅ Notícias dos times favoritos: OK")
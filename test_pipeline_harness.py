@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do pipeline completo contra os serviços locais (mock_services)
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+
+import main
+import source_health
+from concurrent_collector import HostPoliteness
+from delivery import DeliveryLedger
+from gmail_api_reporter import GmailAPISportsReportREAL
+from llm_cache import LLMCache
+from mock_services import FakeGeminiModel, MockServices
+from source_health import SourceHealth
+from sports_reporter import DailySportsReport
+
+
+def _run(services, monkeypatch, recipients):
+    workdir = tempfile.mkdtemp()
+    for name, value in services.env().items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv('RECIPIENTS', ','.join(recipients))
+    monkeypatch.setenv('HTTP_CACHE_DIR', os.path.join(workdir, 'http'))
+    monkeypatch.setenv('SNAPSHOT_DIR', os.path.join(workdir, 'snapshots'))
+    monkeypatch.setenv('AI_OPPORTUNITIES', '1')
+    # Falhas injetadas não podem pausar fontes de outros testes
+    monkeypatch.setattr(source_health, '_health', SourceHealth(os.path.join(workdir, 'health.json')))
+
+    reporter = GmailAPISportsReportREAL(gmail_client=services.gmail_client())
+    monkeypatch.setattr(main, '_reporter', reporter)
+    reporter.ledger = DeliveryLedger(os.path.join(workdir, 'ledger.json'))
+    reporter.ai.model = FakeGeminiModel(chunks=5)
+    reporter.ai.cache = LLMCache(backend=None)
+    # Todos os feeds locais estão no mesmo host: sem intervalo de cortesia
+    reporter.news_scraper.collector.politeness = HostPoliteness(max_per_host=6, min_interval=0.0)
+    return main.daily_sports_report(None)
+
+
+def test_daily_report_end_to_end(monkeypatch):
+    with MockServices() as services:
+        body, status = _run(services, monkeypatch, ['ana@example.com', 'bia@example.com'])
+
+        assert status == 200 and body['sent_to'] == ['ana@example.com', 'bia@example.com']
+        assert sorted(message['to'] for message in services.sent_messages) == body['sent_to']
+        assert services.requests['rss'] == 6
+        # Oportunidades do Gemini falso chegam ao HTML enviado
+        assert services.sent_messages[0]['size'] > 10_000
+
+        daily = DailySportsReport({})
+        games = daily.get_football_games(daily.today)
+        holidays = daily.get_holidays_events(daily.today)
+        assert games and games[0].home_team == 'Flamengo'
+        # Mesmo jogo no TheSportsDB e no football-data.org vira uma partida só
+        assert services.requests['footballdata'] >= 1
+        assert len({(game.home_team, game.away_team) for game in games}) == len(games)
+        assert any(event.name == 'Feriado 2' for event in holidays)
+
+        # Reenvio a partir do snapshot do dia: só o Gmail é chamado
+        services.reset_counters()
+        reporter = main.get_reporter()
+        result = reporter.replay_report(services.started_at.date(), ['carla@example.com'])
+        assert list(result['sent']) == ['carla@example.com']
+        assert services.requests['rss'] == services.requests['thesportsdb'] == 0
+
+        # Resumo semanal montado com o rollup do dia
+        tomorrow = services.started_at.date() + timedelta(days=1)
+        result = reporter.send_digest(['carla@example.com'], 'week', today=tomorrow)
+        assert list(result['sent']) == ['carla@example.com']
+        assert services.sent_messages[-1]['subject'].startswith('🗓️ Resumo Semanal')
+        assert main.weekly_sports_digest(SimpleNamespace(args={'period': 'ano'}))[1] == 400
+
+
+def test_injected_gmail_failures_surface_as_error(monkeypatch):
+    monkeypatch.setenv('HTTP_RETRIES', '0')
+    with MockServices() as services:
+        # 400 não é repetido pelo cliente Google (500 seria, com espera)
+        services.configure('gmail', failure_rate=1.0, status=400)
+        body, status = _run(services, monkeypatch, ['ana@example.com'])
+
+        assert status == 500 and 'ana@example.com' in body['failed']
+        assert services.failures['gmail'] == services.requests['gmail'] >= 1
+        assert not services.sent_messages
+
+
+def test_retry_after_partial_failure_resends_the_same_report(monkeypatch):
+    monkeypatch.setenv('HTTP_RETRIES', '0')
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setenv('NEWS_SEEN_STORE', os.path.join(workdir, 'seen.sqlite'))
+    with MockServices() as services:
+        _run(services, monkeypatch, [])
+        reporter = main.get_reporter()
+        assert reporter.seen_store is not None
+
+        attempts = {}
+        failing = {'bia@example.com'}
+
+        def send(recipient, html, subject):
+            attempts.setdefault(recipient.email, []).append(html)
+            if recipient.email in failing:
+                raise RuntimeError('quota')
+            return f"id-{recipient.email}"
+
+        monkeypatch.setattr(reporter, '_send_html', send)
+        recipients = ['ana@example.com', 'bia@example.com']
+        first = reporter.send_reports(recipients, run_id='retry-run')
+        assert list(first['sent']) == ['ana@example.com'] and list(first['failed']) == ['bia@example.com']
+
+        # Outra execução no mesmo dia não muda o que a nova tentativa de 'retry-run' envia
+        reporter.snapshots.save({'sports_data': {}, 'news_data': [], 'collection_time': 'outra execução'})
+
+        # A nova tentativa não coleta nem grava outro snapshot: bia recebe o mesmo HTML
+        services.reset_counters()
+        failing.clear()
+        runs = len(reporter.snapshots.runs(services.started_at.date()))
+        second = reporter.send_reports(recipients, run_id='retry-run')
+
+        assert list(second['sent']) == ['bia@example.com'] and second['skipped'] == ['ana@example.com']
+        assert attempts['bia@example.com'][1] == attempts['bia@example.com'][0]
+        assert services.requests['rss'] == services.requests['thesportsdb'] == 0
+        assert len(reporter.snapshots.runs(services.started_at.date())) == runs
+
+
+def test_send_report_returns_the_message_id_of_the_run_it_used(monkeypatch):
+    monkeypatch.setenv('HTTP_RETRIES', '0')
+    with MockServices() as services:
+        _run(services, monkeypatch, [])
+        reporter = main.get_reporter()
+        monkeypatch.setattr(reporter, '_send_html', lambda recipient, html, subject: 'id-ana')
+
+        assert reporter.send_report('Ana@Example.com') == 'id-ana'
+        # Já enviado hoje: o id vem do registro, mesmo com o email em outra caixa
+        assert reporter.send_report('ANA@example.com ') == 'id-ana'
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
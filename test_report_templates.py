@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos templates HTML pré-compilados
+"""
+
+from report_fixtures import synthetic_data
+from models import Article
+from report_templates import SPORTS_CSS, Template, render_sports_report
+
+
+def test_fields_escaping_defaults_and_raw():
+    template = Template('<p class="{css}">{{x}} {game.home_team} {game.venue|Estádio} {body:raw}</p>')
+
+    class Game:
+        home_team = 'Grêmio & <Inter>'
+        venue = ''
+
+    html = template.render(css='a"b', game=Game(), body='<b>ok</b>')
+    assert html == '<p class="a&quot;b">{x} Grêmio &amp; &lt;Inter&gt; Estádio <b>ok</b></p>'
+
+
+def test_partial_and_render_many_share_bound_fields():
+    template = Template('{header:raw}|{name}')
+    assert template.partial(header='<h1>{x}</h1>').render(name='Ana') == '<h1>{x}</h1>|Ana'
+    assert template.render_many([{'name': 'Ana'}, {'name': 'Bia'}], header='H') == ['H|Ana', 'H|Bia']
+
+
+def test_sports_report_renders_all_sections_and_variants():
+    data = synthetic_data(400)
+    html = render_sports_report(data)
+
+    assert html.count('class="game"') == 200
+    assert html.count('class="game result"') == 100
+    assert html.count('class="game esports"') == 100
+    # Notícias limitadas a 12 e títulos escapados
+    assert html.count('class="news-item"') == 12
+    assert '&lt;sobre&gt;' in html and '<sobre>' not in html
+
+    first, second = render_sports_report(data, recipients=[{'name': 'Ana'}, {}])
+    assert 'Olá, Ana!' in first and 'class="greeting"' not in second
+    assert first.replace('<p class="greeting">Olá, Ana!</p>', '') == second
+
+
+
+def test_only_http_links_become_clickable():
+    data = {'sports_data': {}, 'collection_time': '09/03/2025 08:00', 'news_data': [
+        Article('Seguro', 'https://ge.globo.com/1', 'GloboEsporte', 'Futebol'),
+        Article('Script', ' JavaScript:alert(1)', 'Lance!', 'Futebol'),
+        Article('Dados', 'data:text/html;base64,PHNjcmlwdD4=', 'UOL Esporte', 'Futebol'),
+    ]}
+    html = render_sports_report(data)
+    assert 'href="https://ge.globo.com/1"' in html
+    assert html.count('href="#"') == 2 and 'alert(1)' not in html and 'data:text' not in html
+    # O CSS entra inteiro, com as chaves literais
+    assert SPORTS_CSS in html
+
+
+if __name__ == "__main__":
+    test_fields_escaping_defaults_and_raw()
+    test_partial_and_render_many_share_bound_fields()
+    test_sports_report_renders_all_sections_and_variants()
+    test_only_http_links_become_clickable()
+    print("✅ Templates de relatório: OK")
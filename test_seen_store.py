@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do registro de notícias já entregues e do modo incremental da coleta
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from mock_services import MockServices
+from models import Article
+from real_news_scraper import FALLBACK_NEWS, RealNewsScraper
+from seen_store import SeenArticleStore, normalize_url
+from source_health import SourceHealth
+
+TIMEZONE = pytz.timezone('America/Sao_Paulo')
+
+
+def _article(link, title='Notícia'):
+    return Article(title, link, 'GloboEsporte', 'Futebol')
+
+
+def test_filter_unseen_normalizes_tracking_and_case():
+    store = SeenArticleStore(':memory:')
+    store.record_delivery([_article('https://ge.globo.com/futebol/a/?utm_source=x&id=1')])
+
+    assert normalize_url('HTTPS://GE.globo.com/futebol/a/?fbclid=z&id=1') == 'https://ge.globo.com/futebol/a?id=1'
+    variants = [_article('https://GE.GLOBO.COM/futebol/a?id=1&gclid=abc'),
+                _article('https://ge.globo.com/futebol/a?id=2'),
+                _article('https://ge.globo.com/futebol/b')]
+    assert [article.link for article in store.filter_unseen(variants)] == \
+        ['https://ge.globo.com/futebol/a?id=2', 'https://ge.globo.com/futebol/b']
+    assert store.is_seen('https://ge.globo.com/futebol/a/?id=1#comentarios') and store.filter_unseen([]) == []
+
+
+def test_last_report_time_is_the_latest_delivery():
+    store = SeenArticleStore(':memory:')
+    assert store.last_report_time() is None
+
+    now = time.time()
+    store.record_delivery([_article('https://x.com/1')], sent_at=now - 3600)
+    store.record_delivery([_article('https://x.com/2')], sent_at=now)
+    assert store.last_report_time() == datetime.fromtimestamp(int(now), TIMEZONE)
+
+    old = Article('Antiga', 'https://x.com/3', 'Lance!', 'Futebol', published=store.last_report_time() - timedelta(hours=1))
+    new = Article('Nova', 'https://x.com/4', 'Lance!', 'Futebol', published=store.last_report_time() + timedelta(hours=1))
+    assert store.new_since_last_report([old, new, _article('https://x.com/1')]) == [new]
+
+
+def test_compact_applies_retention_and_max_rows():
+    store = SeenArticleStore(os.path.join(tempfile.mkdtemp(), 'seen.db'), retention_days=30, max_rows=5)
+    now = time.time()
+    store.record_delivery([_article(f"https://x.com/velha/{i}") for i in range(3)], sent_at=now - 40 * 86400)
+    assert not store.is_seen('https://x.com/velha/0')
+
+    for batch in range(4):
+        store.record_delivery([_article(f"https://x.com/{batch}/{i}") for i in range(2)], sent_at=now - 10 + batch)
+    # 8 linhas com limite de 5: as mais antigas saem primeiro
+    assert not store.is_seen('https://x.com/0/0') and not store.is_seen('https://x.com/0/1')
+    assert all(store.is_seen(f"https://x.com/{batch}/{i}") for batch in (2, 3) for i in range(2))
+    count = store._conn.execute('SELECT COUNT(*) FROM delivered_articles').fetchone()[0]
+    assert count == 5
+
+
+def test_empty_incremental_feed_is_not_a_failure(monkeypatch):
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setenv('HTTP_CACHE_DIR', os.path.join(workdir, 'http'))
+    with MockServices() as services:
+        for name, value in services.env().items():
+            monkeypatch.setenv(name, value)
+        scraper = RealNewsScraper(health=SourceHealth(os.path.join(workdir, 'health.json')))
+        first = scraper._collect_feed('espn')
+        assert first and all(article.link.startswith('https://noticias.example.com/') for article in first)
+
+        # Nada publicado depois de `since`: lista vazia, sem os dados de referência
+        assert scraper._collect_feed('espn', since=services.started_at + timedelta(hours=1)) == []
+
+    def fail(key, since):
+        raise ConnectionError('feed fora do ar')
+
+    # A coleta vazia não apagou a última coleta boa, que cobre a falha
+    monkeypatch.setattr(scraper, '_fetch_feed', fail)
+    assert [article.link for article in scraper._collect_feed('espn')] == [article.link for article in first]
+
+    # Sem coleta boa guardada, a falha usa os dados de referência
+    scraper.health = SourceHealth(os.path.join(workdir, 'other.json'))
+    assert [article.link for article in scraper._collect_feed('espn')] == \
+        [item['link'] for item in FALLBACK_NEWS['espn']]
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
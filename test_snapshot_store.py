@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do histórico de snapshots (JSONL comprimido por dia)
+"""
+
+import gzip
+import os
+import tempfile
+from datetime import date, datetime
+
+from http_cache import LocalBucket
+from models import DEFAULT_TIMEZONE, Article, Match, Opportunity
+from report_templates import render_sports_report
+from snapshot_store import ObjectStoreSnapshotBackend, SnapshotStore
+
+
+def _data(day: date, league: str = 'Brasileirão Série A'):
+    kickoff = DEFAULT_TIMEZONE.localize(datetime(day.year, day.month, day.day, 16))
+    return {
+        'sports_data': {
+            'games_today': [Match('Flamengo', 'Vasco', league, kickoff, venue='Maracanã')],
+            'esports_today': [Match('LOUD', 'paiN Gaming', 'CBLOL', kickoff, sport='E-sports', game='LoL')],
+        },
+        'news_data': [Article('Flamengo vence', 'https://ge.globo.com/1', 'GloboEsporte', 'Futebol',
+                              published=kickoff, related_sources=('ESPN Brasil',))],
+        'collection_time': kickoff.strftime('%d/%m/%Y %H:%M'),
+        'ai_analysis': {'top_10_opportunities': [Opportunity(1, 'Clássico no Maracanã', 'Audiência alta')],
+                        'ai_powered': True},
+        'market_insights': '📊 INSIGHTS',
+    }
+
+
+def _saved_at(day: date, hour: int = 8):
+    return DEFAULT_TIMEZONE.localize(datetime(day.year, day.month, day.day, hour))
+
+
+def test_round_trip_renders_the_same_report():
+    store = SnapshotStore(tempfile.mkdtemp())
+    day = date(2025, 3, 9)
+    data = _data(day)
+    path = store.save(data, _saved_at(day))
+
+    assert path.endswith(os.path.join('2025', '03', '09.jsonl.gz'))
+    assert store.load(day) == data
+    assert render_sports_report(store.load(day)) == render_sports_report(data)
+    assert store.load(date(2025, 3, 10)) is None
+
+
+def test_reruns_append_and_truncated_member_keeps_earlier_runs():
+    store = SnapshotStore(tempfile.mkdtemp())
+    day = date(2025, 3, 9)
+    store.save(_data(day, 'Copa do Brasil'), _saved_at(day, 8))
+    store.save(_data(day, 'Copa Libertadores'), _saved_at(day, 9))
+
+    assert [run['sports_data']['games_today'][0]['league'] for run in store.runs(day)] == \
+        ['Copa do Brasil', 'Copa Libertadores']
+    assert store.load(day)['sports_data']['games_today'][0].league == 'Copa Libertadores'
+
+    # Execução interrompida no meio de um membro gzip: as anteriores continuam legíveis
+    path = store.path_for(day)
+    with open(path, 'ab') as file:
+        file.write(gzip.compress(b'{"sports_data": {}}\n')[:12])
+    assert len(store.runs(day)) == 2
+
+
+def test_save_appends_without_rewriting_earlier_runs():
+    store = SnapshotStore(tempfile.mkdtemp())
+    day = date(2025, 3, 9)
+    store.save(_data(day), _saved_at(day, 8))
+    with open(store.path_for(day), 'rb') as file:
+        first = file.read()
+    version = store.version(day)
+
+    store.save(_data(day), _saved_at(day, 9))
+    with open(store.path_for(day), 'rb') as file:
+        both = file.read()
+    assert both.startswith(first) and len(both) > len(first)
+    assert store.version(day) != version
+
+
+def test_object_store_backend_writes_one_object_per_run():
+    bucket = LocalBucket(tempfile.mkdtemp())
+    store = SnapshotStore(backend=ObjectStoreSnapshotBackend(bucket))
+    day = date(2025, 3, 9)
+    store.save(_data(day, 'Copa do Brasil'), _saved_at(day, 8))
+    version = store.version(day)
+    store.save(_data(day, 'Copa Libertadores'), _saved_at(day, 9))
+    store.save(_data(date(2025, 3, 11)), _saved_at(date(2025, 3, 11)))
+
+    names = [blob.name for blob in bucket.list_blobs(prefix='snapshots/2025/03/09/')]
+    assert len(names) == 2 and all(name.endswith('.jsonl.gz') for name in names)
+    assert [run['sports_data']['games_today'][0]['league'] for run in store.runs(day)] == \
+        ['Copa do Brasil', 'Copa Libertadores']
+    assert store.version(day) != version
+    assert list(store.days(date(2025, 3, 1), date(2025, 3, 31))) == [day, date(2025, 3, 11)]
+    assert store.load(date(2025, 3, 10)) is None and store.version(date(2025, 3, 10)) is None
+
+
+if __name__ == "__main__":
+    test_round_trip_renders_the_same_report()
+    test_save_appends_without_rewriting_earlier_runs()
+    test_object_store_backend_writes_one_object_per_run()
+    test_reruns_append_and_truncated_member_keeps_earlier_runs()
+    print("✅ Snapshots: OK")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do circuit breaker e da saúde persistida das fontes
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+import source_health
+from source_health import SourceHealth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _health(clock, **options):
+    path = os.path.join(tempfile.mkdtemp(), 'health.json')
+    return SourceHealth(path, clock=clock, cooldown=60, **options)
+
+
+def _fail():
+    raise ValueError("HTTP 503")
+
+
+def test_opens_after_consecutive_failures_and_serves_last_good():
+    clock = FakeClock()
+    health = _health(clock)
+    assert health.call('nager', lambda: ['feriado'], key='2025') == ['feriado']
+
+    for _ in range(3):
+        # Falha devolve o último resultado bom da mesma chave
+        assert health.call('nager', _fail, key='2025') == ['feriado']
+    assert health.is_open('nager')
+
+    calls = []
+    assert health.call('nager', lambda: calls.append(1), key='2025') == ['feriado']
+    assert calls == []
+    # Outra chave (ex.: outro ano) não reaproveita o payload guardado
+    assert health.call('nager', lambda: ['outro'], key='2026') is None
+
+
+def test_half_open_trial_closes_or_reopens_with_longer_cooldown():
+    clock = FakeClock()
+    health = _health(clock)
+    for _ in range(3):
+        health.call('espn', _fail)
+    assert health.state('espn')['trips'] == 1
+
+    clock.now += 61
+    assert not health.is_open('espn')
+    health.call('espn', _fail)
+    state = health.state('espn')
+    # Falhou no teste: pausa dobra
+    assert state['trips'] == 2 and state['open_until'] == clock.now + 120
+
+    clock.now += 121
+    assert health.call('espn', lambda: ['ok']) == ['ok']
+    assert not health.is_open('espn') and health.state('espn')['trips'] == 0
+
+
+def test_slow_source_trips_on_latency_ewma():
+    clock = FakeClock()
+    # Toda chamada conta como lenta, mesmo bem-sucedida
+    health = _health(clock, slow_seconds=0.0)
+    for _ in range(3):
+        health.call('lance', lambda: [])
+    assert health.is_open('lance')
+
+
+def test_state_and_payload_survive_new_instance():
+    clock = FakeClock()
+    health = _health(clock)
+    health.call('news.uol', lambda: [{'title': 'A'}])
+    for _ in range(3):
+        health.call('news.uol', _fail)
+
+    reloaded = SourceHealth(health.path, clock=clock, cooldown=60)
+    assert reloaded.is_open('news.uol')
+    assert reloaded.call('news.uol', _fail, decode=lambda data: [item['title'] for item in data]) == ['A']
+
+    # Resultado bom velho demais não é reaproveitado
+    clock.now += 25 * 3600
+    assert reloaded.call('news.uol', _fail) is None
+
+
+def test_counters_and_payloads_are_stored_apart(monkeypatch):
+    clock = FakeClock()
+    health = _health(clock)
+    writes = []
+    real_write = source_health._write_json
+    monkeypatch.setattr(source_health, '_write_json', lambda path, data: writes.append(path) or real_write(path, data))
+
+    season = [{'id': i} for i in range(100)]
+    health.call('thesportsdb.season', lambda: season, key='2025')
+    with open(health.path, encoding='utf-8') as file:
+        counters = json.load(file)
+    assert 'last_good' not in counters['thesportsdb.season']
+    assert counters['thesportsdb.season']['last_good_key'] == '2025'
+    payload_path = health.payload_path('thesportsdb.season')
+    assert writes == [payload_path, health.path]
+
+    # Mesmo resultado: só os contadores são regravados
+    writes.clear()
+    clock.now += 10
+    health.call('thesportsdb.season', lambda: list(season), key='2025')
+    assert writes == [health.path]
+    assert health.state('thesportsdb.season')['last_good_at'] == clock.now
+
+    # Resultado novo regrava o arquivo da fonte, e ele é lido por outra instância
+    writes.clear()
+    health.call('thesportsdb.season', lambda: season[:1], key='2025')
+    assert writes == [payload_path, health.path]
+    for _ in range(3):
+        health.call('thesportsdb.season', _fail, key='2025')
+    assert SourceHealth(health.path, clock=clock).call('thesportsdb.season', _fail, key='2025') == [{'id': 0}]
+
+
+def test_half_open_allows_a_single_probe():
+    clock = FakeClock()
+    health = _health(clock)
+    health.call('ge', lambda: ['guardado'])
+    for _ in range(3):
+        health.call('ge', _fail)
+    clock.now += 61
+
+    started, release = threading.Event(), threading.Event()
+    probes = []
+
+    def probe():
+        probes.append(1)
+        started.set()
+        release.wait(5)
+        return ['novo']
+
+    thread = threading.Thread(target=lambda: probes.append(health.call('ge', probe)))
+    thread.start()
+    assert started.wait(5)
+    # Com o teste em andamento, as outras chamadas usam o último resultado bom
+    calls = []
+    assert health.call('ge', lambda: calls.append(1) or ['outro']) == ['guardado']
+    assert calls == []
+    release.set()
+    thread.join()
+    assert probes == [1, ['novo']] and health.state('ge')['trips'] == 0
+    assert health.call('ge', lambda: ['depois']) == ['depois']
+
+
+def test_fast_probe_resets_latency_average():
+    clock = FakeClock()
+    health = _health(clock, slow_seconds=0.05)
+    for _ in range(3):
+        health.call('lance', lambda: time.sleep(0.08) or [])
+    assert health.is_open('lance')
+
+    clock.now += 61
+    for _ in range(3):
+        health.call('lance', lambda: [])
+    # A média lenta de antes não reabre a fonte nem dobra a espera
+    state = health.state('lance')
+    assert not health.is_open('lance') and state['trips'] == 0 and state['latency_ewma'] < 0.05
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos provedores de jogos e da mescla por partida
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime
+
+from mock_services import MockServices
+from models import DEFAULT_TIMEZONE, Match
+from source_health import SourceHealth
+from sports_providers import (FixtureFileProvider, FootballDataProvider, ProviderSet, SportsProvider,
+                              TheSportsDBProvider, merge_fixtures, team_key)
+
+DAY = date(2025, 3, 9)
+
+
+def _kickoff(hour: int, minute: int = 0) -> datetime:
+    return DEFAULT_TIMEZONE.localize(datetime(DAY.year, DAY.month, DAY.day, hour, minute))
+
+
+class StaticProvider(SportsProvider):
+    def __init__(self, name: str, matches, delay: float = 0.0):
+        self.name = name
+        self.matches = matches
+        self.delay = delay
+
+    def fetch(self, start, end):
+        time.sleep(self.delay)
+        return self.matches
+
+
+def test_merge_by_fixture_key_with_field_precedence():
+    sportsdb = [Match('Flamengo', 'Vasco', 'Brazilian Serie A', _kickoff(16), venue='Maracanã'),
+                Match('Bahia', 'Vitória', 'Copa do Nordeste', _kickoff(18))]
+    football_data = [Match('CR Flamengo', 'Vasco', 'Campeonato Brasileiro Série A', _kickoff(16, 30),
+                           status='Ao Vivo', score='1-0')]
+
+    merged = merge_fixtures([('thesportsdb', sportsdb), ('football-data', football_data)])
+    assert [match.label for match in merged] == ['Flamengo vs Vasco', 'Bahia vs Vitória']
+    flamengo = merged[0]
+    # Horário, status e placar do football-data.org; nomes, liga e estádio do TheSportsDB
+    assert flamengo.kickoff == _kickoff(16, 30) and flamengo.status == 'Ao Vivo' and flamengo.score == '1-0'
+    assert flamengo.venue == 'Maracanã' and flamengo.league == 'Brazilian Serie A'
+    assert team_key('São Paulo FC') == team_key('Sao Paulo') == 'sao paulo'
+
+
+def test_merge_keeps_required_fields_empty_in_every_provider():
+    merged = merge_fixtures([('a', [Match('Flamengo', 'Vasco', '', _kickoff(16))]),
+                             ('b', [Match('Flamengo', 'Vasco', '', _kickoff(16), venue='Maracanã')])])
+    assert len(merged) == 1 and merged[0].league == '' and merged[0].venue == 'Maracanã'
+
+
+def test_providers_are_queried_in_parallel():
+    providers = ProviderSet([
+        StaticProvider('a', [Match('Flamengo', 'Vasco', 'Brasileirão', _kickoff(16))], delay=0.3),
+        StaticProvider('b', [Match('Grêmio', 'Inter', 'Brasileirão', _kickoff(18))], delay=0.3),
+        StaticProvider('c', [], delay=0.3),
+    ])
+    started = time.perf_counter()
+    fixtures = providers.fixtures(DAY)
+    assert time.perf_counter() - started < 0.6
+    assert [match.home_team for match in fixtures] == ['Flamengo', 'Grêmio']
+
+
+def test_real_providers_against_local_services(monkeypatch):
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setenv('HTTP_CACHE_DIR', os.path.join(workdir, 'http'))
+    fixtures_file = os.path.join(workdir, 'fixtures.json')
+    with open(fixtures_file, 'w', encoding='utf-8') as file:
+        json.dump([Match('Flamengo', 'Vasco', 'Brazilian Serie A', _kickoff(9), tv='Globo').to_dict(),
+                   Match('Remo', 'Paysandu', 'Copa Verde', _kickoff(20)).to_dict()], file)
+
+    with MockServices(events_per_day=4) as services:
+        for name, value in services.env().items():
+            monkeypatch.setenv(name, value)
+        health = SourceHealth(os.path.join(workdir, 'health.json'))
+        football_data = FootballDataProvider(health=health)
+        assert [match.league for match in football_data.fetch(DAY, DAY)] == \
+            ['Campeonato Brasileiro Série A', 'Copa Libertadores']
+
+        providers = ProviderSet([TheSportsDBProvider(health=health), football_data,
+                                 FixtureFileProvider(fixtures_file)])
+        fixtures = providers.fixtures(DAY)
+
+    # 4 jogos do TheSportsDB (2 também no football-data.org e 1 no arquivo) + 1 só do arquivo
+    assert len(fixtures) == 5
+    flamengo = next(match for match in fixtures if match.home_team == 'Flamengo')
+    assert flamengo.tv == 'Globo' and flamengo.kickoff.hour == 9 and flamengo.venue == 'Estádio do Flamengo'
+    assert not FootballDataProvider(api_key='').enabled
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do rastreamento por etapa (spans, resumo e logs JSON)
+"""
+
+import json
+import time
+
+import tracing
+from concurrent_collector import CollectionTask, ConcurrentCollector
+from tracing import span, start_trace, traced
+
+
+@traced('fonte.lenta')
+def slow_source():
+    time.sleep(0.02)
+    return 'ok'
+
+
+def test_spans_follow_collector_threads_and_summarize():
+    tracing.set_enabled(True, export=False)
+    collector = ConcurrentCollector(max_workers=3, source_timeout=5, global_deadline=5)
+
+    def failing():
+        with span('fonte.falha'):
+            raise ValueError('fora do ar')
+
+    with start_trace('teste') as trace:
+        with span('coleta') as parent:
+            results = collector.collect([CollectionTask('a', slow_source), CollectionTask('b', slow_source),
+                                         CollectionTask('c', failing, default='fallback')])
+    assert results == {'a': 'ok', 'b': 'ok', 'c': 'fallback'}
+
+    by_name = {}
+    for item in trace.spans:
+        by_name.setdefault(item.name, []).append(item)
+    # Spans abertos nas threads do coletor ficam pendurados no span de quem coletou
+    assert all(item.parent_id == parent.span_id for item in by_name['fonte.lenta'] + by_name['fonte.falha'])
+
+    summary = trace.summary()
+    assert summary['stages']['fonte.lenta']['count'] == 2
+    assert summary['stages']['fonte.lenta']['max_ms'] >= 20
+    assert summary['stages']['fonte.falha']['errors'] == 1
+    # Ordenado pelo tempo somado: as duas fontes em paralelo somam mais que a coleta
+    assert list(summary['stages'])[0] == 'fonte.lenta'
+    assert summary['total_ms'] >= summary['stages']['coleta']['total_ms']
+
+
+def test_exports_cloud_logging_json(capsys, monkeypatch):
+    monkeypatch.setenv('GOOGLE_CLOUD_PROJECT', 'artplan')
+    tracing.set_enabled(True, export=True)
+    try:
+        with start_trace('teste', trace_id=tracing.parse_trace_header('abc123/1;o=1')):
+            with span('render', recipients=3):
+                pass
+    finally:
+        tracing.set_enabled(True, export=False)
+
+    entry = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert entry['severity'] == 'INFO' and entry['span'] == 'render'
+    assert entry['attributes'] == {'recipients': 3}
+    assert entry['logging.googleapis.com/trace'] == 'projects/artplan/traces/abc123'
+
+
+def test_disabled_is_noop():
+    tracing.set_enabled(False)
+    try:
+        with start_trace('teste') as trace:
+            assert span('qualquer') is span('outro')
+            assert slow_source() == 'ok'
+        assert trace.summary() == {}
+    finally:
+        tracing.set_enabled(True)
+    # Fora de um trace, spans também não custam nada
+    assert span('solto') is span('outro')
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do estado reaproveitado entre invocações (cliente Gmail, reporter e env.yaml)
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+from google.auth.exceptions import RefreshError
+
+import gmail_api_reporter
+import main
+import source_health
+from gmail_api_reporter import GmailAPISportsReportREAL, get_gmail_service, load_config
+from mock_services import MockServices
+from source_health import SourceHealth
+
+SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+
+
+class FakeCredentials:
+    """Credenciais expiradas cuja renovação funciona ou levanta RefreshError"""
+
+    def __init__(self, valid=False, fail=False):
+        self.valid = valid
+        self.expired = not valid
+        self.refresh_token = 'refresh'
+        self.fail = fail
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        if self.fail:
+            raise RefreshError('invalid_grant')
+        self.valid, self.expired = True, False
+
+
+def _count_builds(monkeypatch):
+    builds = []
+
+    def build(*args, **kwargs):
+        builds.append(kwargs.get('credentials'))
+        return object()
+
+    monkeypatch.setattr(gmail_api_reporter, 'discovery', SimpleNamespace(build=build))
+    return builds
+
+
+def test_warm_invocation_reuses_reporter_and_gmail_service(monkeypatch):
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setattr(gmail_api_reporter, '_gmail_services', {})
+    monkeypatch.setattr(main, '_reporter', None)
+    monkeypatch.setattr(source_health, '_health', SourceHealth(os.path.join(workdir, 'health.json')))
+    monkeypatch.setenv('SNAPSHOT_DIR', os.path.join(workdir, 'snapshots'))
+    builds = _count_builds(monkeypatch)
+    loads = []
+    monkeypatch.setattr(gmail_api_reporter, '_load_credentials',
+                        lambda credentials_file, token, scopes: loads.append(token) or FakeCredentials(valid=True))
+
+    reporter = main.get_reporter()
+    assert main.get_reporter() is reporter
+    assert get_gmail_service('credentials.json', 'token.pickle', SCOPES) == (reporter.creds, reporter.service)
+
+    # Reporter recriado (ex.: depois de um erro) ainda reaproveita o cliente Gmail
+    monkeypatch.setattr(main, '_reporter', None)
+    again = main.get_reporter()
+    assert again is not reporter and again.service is reporter.service
+    assert len(builds) == 1 and loads == ['token.pickle']
+
+
+def test_injected_gmail_client_skips_oauth(monkeypatch):
+    workdir = tempfile.mkdtemp()
+    monkeypatch.setattr(gmail_api_reporter, '_gmail_services', {})
+    monkeypatch.setattr(source_health, '_health', SourceHealth(os.path.join(workdir, 'health.json')))
+    monkeypatch.setenv('SNAPSHOT_DIR', os.path.join(workdir, 'snapshots'))
+    monkeypatch.setattr(gmail_api_reporter, 'get_gmail_service',
+                        lambda *args: (_ for _ in ()).throw(AssertionError('OAuth não deveria rodar')))
+
+    with MockServices() as services:
+        client = services.gmail_client()
+        reporter = GmailAPISportsReportREAL(gmail_client=client)
+        assert (reporter.creds, reporter.service) == client
+        reporter._connect_gmail()
+        assert reporter.service is client[1]
+
+        response = reporter.service.users().messages().send(userId='me', body={'raw': 'eA=='}).execute()
+        assert response['id'] and services.requests['gmail'] == 1
+
+
+def test_ai_opportunities_are_opt_in(monkeypatch):
+    monkeypatch.setenv('SNAPSHOT_DIR', tempfile.mkdtemp())
+    monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+    client = (None, None)
+
+    # Chave do Gemini sozinha não liga as chamadas pagas
+    monkeypatch.delenv('AI_OPPORTUNITIES', raising=False)
+    assert GmailAPISportsReportREAL(gmail_client=client).ai is None
+    monkeypatch.setenv('AI_OPPORTUNITIES', '1')
+    assert GmailAPISportsReportREAL(gmail_client=client).ai is not None
+
+
+def test_refresh_error_clears_cached_service(monkeypatch):
+    token_file = os.path.join(tempfile.mkdtemp(), 'token.pickle')
+    builds = _count_builds(monkeypatch)
+    fresh = FakeCredentials(valid=True)
+    loads = []
+    monkeypatch.setattr(gmail_api_reporter, '_load_credentials',
+                        lambda credentials_file, token, scopes: loads.append(token) or fresh)
+
+    # Válidas: nada é refeito
+    valid = FakeCredentials(valid=True)
+    monkeypatch.setattr(gmail_api_reporter, '_gmail_services', {token_file: (valid, 'cliente')})
+    assert get_gmail_service('credentials.json', token_file, SCOPES) == (valid, 'cliente')
+
+    # Expiradas: renovadas no próprio objeto e gravadas no token
+    expired = FakeCredentials()
+    monkeypatch.setattr(gmail_api_reporter, '_gmail_services', {token_file: (expired, 'cliente')})
+    assert get_gmail_service('credentials.json', token_file, SCOPES) == (expired, 'cliente')
+    assert expired.refreshes == 1 and os.path.exists(token_file)
+    assert not loads and not builds
+
+    # Renovação recusada: o cache é descartado e as credenciais são carregadas de novo
+    revoked = FakeCredentials(fail=True)
+    cache = {token_file: (revoked, 'cliente')}
+    monkeypatch.setattr(gmail_api_reporter, '_gmail_services', cache)
+    creds, service = get_gmail_service('credentials.json', token_file, SCOPES)
+    assert revoked.refreshes == 1 and loads == [token_file]
+    assert creds is fresh and service != 'cliente' and builds == [fresh]
+    assert cache[token_file] == (creds, service)
+
+
+def test_load_config_reloads_only_when_file_changes(monkeypatch):
+    monkeypatch.setattr(gmail_api_reporter, '_config_cache', {})
+    path = os.path.join(tempfile.mkdtemp(), 'env.yaml')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('SNAPSHOT_DIR: /tmp/a\n')
+
+    first = load_config(path)
+    assert first == {'SNAPSHOT_DIR': '/tmp/a'}
+    assert load_config(path) is first
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('SNAPSHOT_DIR: /tmp/b\n')
+    # Garante mtime diferente mesmo em sistemas de arquivos com resolução baixa
+    mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+    assert load_config(path) == {'SNAPSHOT_DIR': '/tmp/b'}
+    assert load_config(os.path.join(os.path.dirname(path), 'nao-existe.yaml')) == {}
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
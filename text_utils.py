@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalização de texto compartilhada (nomes de times, ligas, títulos de notícias)
+"""
+
+import unicodedata
+
+
+def fold_accents(text: str) -> str:
+    """'São Paulo' -> 'sao paulo'"""
+    text = text.lower()
+    if text.isascii():
+        return text
+    # NFKD separa letra e acento; o encode ascii descarta os acentos
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rastreamento leve por etapa (spans) do pipeline do relatório
+
+Cada invocação abre um trace (`start_trace`); coletores, chamadas de IA,
+renderização e envios abrem spans (`span` / `@traced`) dentro dele. Ao fim,
+`trace.summary()` agrega os tempos por etapa para a resposta da função, e
+cada span pode ser exportado como uma linha JSON no formato do Cloud Logging.
+
+Variáveis de ambiente:
+    TRACING=0     desliga tudo (span/traced viram no-op, custo de um if)
+    TRACE_LOG=1   exporta cada span como log JSON (padrão: ligado na nuvem)
+"""
+
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from lazy_imports import running_in_cloud
+
+_enabled = os.environ.get('TRACING', '1').lower() not in ('0', 'false', 'off')
+_export = os.environ.get('TRACE_LOG', '1' if running_in_cloud() else '0').lower() not in ('0', 'false', 'off')
+
+_current_trace: ContextVar[Optional['Trace']] = ContextVar('trace', default=None)
+_current_span: ContextVar[Optional['Span']] = ContextVar('span', default=None)
+
+
+def set_enabled(enabled: bool, export: Optional[bool] = None):
+    """Liga/desliga o rastreamento (e a exportação dos logs) em tempo de execução"""
+    global _enabled, _export
+    _enabled = enabled
+    if export is not None:
+        _export = export
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class Span:
+    """Etapa cronometrada; também é o context manager que a encerra"""
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'attributes', 'start', 'duration',
+                 'error', '_started', '_tokens')
+
+    def __init__(self, trace: 'Trace', name: str, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = None
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent else None
+        self._tokens = _current_span.set(self)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        _current_span.reset(self._tokens)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.trace._finish(self)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans de uma invocação; seguro para spans abertos em várias threads"""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None, project: Optional[str] = None):
+        self.name = name
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.project = project
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self._tokens = None
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+        if _export:
+            self._export(span)
+
+    def _export(self, span: Span):
+        """Uma linha JSON por span (stdout vira log estruturado no Cloud Logging)"""
+        entry = {
+            'severity': 'ERROR' if span.error else 'INFO',
+            'message': f"{span.name} {span.duration * 1000:.1f} ms",
+            'span': span.name,
+            'duration_ms': round(span.duration * 1000, 3),
+            'trace_id': self.trace_id,
+            'span_id': span.span_id,
+            'parent_span_id': span.parent_id,
+            'thread': threading.current_thread().name,
+        }
+        if span.attributes:
+            entry['attributes'] = span.attributes
+        if span.error:
+            entry['error'] = span.error
+        if self.project:
+            entry['logging.googleapis.com/trace'] = f"projects/{self.project}/traces/{self.trace_id}"
+        entry['logging.googleapis.com/spanId'] = span.span_id
+        sys.stdout.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def summary(self) -> Dict[str, Any]:
+        """Tempo total e, por etapa, nº de spans, soma, máximo e erros (mais lentas primeiro)"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = stages.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+            duration_ms = span.duration * 1000
+            stage['count'] += 1
+            stage['total_ms'] += duration_ms
+            stage['max_ms'] = max(stage['max_ms'], duration_ms)
+            if span.error:
+                stage['errors'] += 1
+        for stage in stages.values():
+            stage['total_ms'] = round(stage['total_ms'], 1)
+            stage['max_ms'] = round(stage['max_ms'], 1)
+
+        elapsed = self.duration if self.duration is not None else time.perf_counter() - self._started
+        ordered = dict(sorted(stages.items(), key=lambda item: -item[1]['total_ms']))
+        return {'trace_id': self.trace_id, 'total_ms': round(elapsed * 1000, 1), 'stages': ordered}
+
+    def __enter__(self) -> 'Trace':
+        self._tokens = (_current_trace.set(self), _current_span.set(None))
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        trace_token, span_token = self._tokens
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        return False
+
+
+class _NoopTrace:
+    trace_id = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def parse_trace_header(value: Optional[str]) -> Optional[str]:
+    """X-Cloud-Trace-Context: 'TRACE_ID/SPAN_ID;o=1' -> TRACE_ID"""
+    if not value:
+        return None
+    trace_id = value.split('/', 1)[0].strip()
+    return trace_id or None
+
+
+def start_trace(name: str, trace_id: Optional[str] = None):
+    """Abre o trace da invocação (no-op com TRACING=0)"""
+    if not _enabled:
+        return _NoopTrace()
+    project = os.environ.get('GOOGLE_CLOUD_PROJECT') or os.environ.get('GCP_PROJECT')
+    return Trace(name, trace_id, project)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def span(name: str, **attributes):
+    """`with span('news.espn', url=...):` — no-op se desligado ou fora de um trace"""
+    if not _enabled:
+        return _NOOP_SPAN
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return Span(trace, name, attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: a chamada inteira vira um span (nome padrão: Classe.método)"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with Span(trace, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator